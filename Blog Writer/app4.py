@@ -0,0 +1,4 @@
+from launcher import main
+
+# The Blog Writer routed across every backend with an API key set (see launcher.py)
+main("routed")
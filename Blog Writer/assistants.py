@@ -0,0 +1,250 @@
+"""Assistant factory for the Blog Writer apps.
+
+Building an ``Assistant`` also builds its LLM client and tool clients. Streamlit
+reruns the app script on every widget interaction, so the apps ask this module
+for their assistants instead of constructing them at the top of the script.
+
+phi, the provider SDKs and the search tools are imported by the functions that
+build assistants, not by this module, so an app draws its first page without
+them and a process only loads the providers it serves. The launcher passes
+``PRELOAD_MODULES`` to ``shared.backends.preload``, which imports them on a
+background thread while the first user is still typing.
+
+This module keeps the app's prompts; ``shared.app_assistants`` builds and
+routes the assistants the same way for every app.
+"""
+from textwrap import dedent
+
+from long_form import LONG_FORM_DESCRIPTION
+from shared import app_assistants
+
+APP = "blog-writer"
+
+# The router stages of the researcher and the writer, in the order the builders return them.
+STAGES = ("research", "write")
+
+# Imported in the background before the first request (see ``shared.backends.preload``).
+PRELOAD_MODULES = ("phi.assistant", "shared.search_tools", "shared.semantic_index")
+
+
+def _build_gpt4o(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.openai import OpenAIChat
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Conducts research for blog topics and gathers information",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+            You are an expert researcher. Given a blog topic, generate a list of search terms, research the topic, 
+            and return 10 high-quality references or insights for the blog.
+            """
+        ),
+        instructions=[
+            "Generate 3 search terms for the given blog topic.",
+            "Use `search_google` to gather data for these terms.",
+            "Analyze the results and return the 10 most relevant insights or references.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+    )
+
+    writer = Assistant(
+        name="Writer",
+        role="Drafts a blog post based on research",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+            You are a professional blog writer. Use the research data to draft a blog that is engaging, structured, 
+            and optimized for the target audience.
+            """
+        ),
+        instructions=[
+            "Draft a blog post using the research insights provided.",
+            "Ensure the blog has an introduction, structured body, and conclusion.",
+            "Include a CTA and naturally integrate relevant keywords for SEO.",
+        ],
+    )
+    return researcher, writer
+
+
+def _build_llama(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for blog topic-related information and generates relevant references",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class blog researcher. Given a blog topic and target audience, generate a list of search terms for finding relevant articles, research papers, and other resources.
+        Then search the web for each term, analyze the results, and return the 10 most relevant insights.
+        """
+        ),
+        instructions=[
+            "Given a blog topic and target audience, first generate a list of 3 search terms related to that topic and the audience.",
+            "For each search term, `search_google` and analyze the results.",
+            "From the results of all searches, return the 10 most relevant insights or references to inform the blog post.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+    writer = Assistant(
+        name="Writer",
+        role="Generates a draft blog post based on the research results",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are a professional blog writer. Given a topic, audience, and research results, generate a well-structured, engaging blog post.
+        Ensure the blog post includes an introduction, body, conclusion, and a call-to-action (CTA).
+        """
+        ),
+        instructions=[
+            "Given a blog topic, target audience, and a list of research insights, draft a blog post.",
+            "Ensure the blog post is well-structured, informative, and engaging.",
+            "Include a clear introduction, body, and conclusion, and end with a call-to-action (CTA).",
+            "Remember: the quality of the blog is paramount, with correct citations and integration of insights.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, writer
+
+
+def _build_gemini(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.google import Gemini
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for blog topic-related information and generates relevant references",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+            You are a world-class blog researcher. Given a blog topic and target audience, generate a list of search terms for finding relevant articles, research papers, and other resources.
+            Then search the web for each term, analyze the results, and return the 10 most relevant insights.
+            """
+        ),
+        instructions=[
+            "Generate a list of 3 search terms related to the topic and audience.",
+            "Search the web for each term using the SerpAPI tool.",
+            "Analyze the results and return the 10 most relevant insights or references.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        show_tool_calls=True,
+        add_datetime_to_instructions=True,
+        markdown=True,
+    )
+
+    writer = Assistant(
+        name="Writer",
+        role="Generates a draft blog post based on user preferences and research results",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are an expert blog writer. Given a blog topic, style preferences, and a list of content research results,
+        your goal is to generate a full and engaging blog post that aligns with the user's style and incorporates relevant research.
+        """
+        ),
+        instructions=[
+            "Given a blog topic, style preferences, and a list of content research results, generate a full blog post that includes relevant ideas, examples, and insights.",
+            "Ensure the blog post is well-structured, engaging, and informative from introduction to conclusion.",
+            "The tone should match the user's preferred writing style (e.g., casual, professional, informative).",
+            "Avoid asking the user for additional details; the blog post should be created with the information already provided.",
+            "Focus on creativity, clarity, and a compelling narrative.",
+            "Provide relevant facts, examples, and research without making up details.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        show_tool_calls=True,
+        num_history_messages=3,
+        markdown=True,
+    )
+    return researcher, writer
+
+
+def _build_mixtral(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for blog topics, ideas, and content inspiration based on user preferences",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class content researcher. Given a blog topic and style preferences, generate a list of search terms for finding relevant content ideas, trends, and research.
+        Then search the web for each term, analyze the results, and return the 10 most relevant content ideas.
+        """
+        ),
+        instructions=[ 
+            "Given a blog topic and style preferences, first generate a list of 3 search terms related to the topic and preferences.",
+            "For each search term, `search_google` and analyze the results.",
+            "From the results of all searches, return the 10 most relevant content ideas to the user's preferences.",
+            "Remember: the quality of the content ideas is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+    writer = Assistant(
+        name="Writer",
+        role="Generates a blog post based on user preferences and research results",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are an expert blog writer. Given a blog topic, style preferences, and a list of content research results,
+        your goal is to generate a full blog post that aligns with the user's style and incorporates relevant research.
+        """
+        ),
+        instructions=[
+            "Given a blog topic, style preferences, and a list of content research results, generate a full blog post that includes relevant ideas, examples, and insights.",
+            "Ensure the blog post is well-structured, engaging, and informative from introduction to conclusion.",
+            "The tone should match the user's preferred writing style (e.g., casual, professional, informative).",
+            "Avoid asking the user for additional details; the blog post should be created with the information already provided.",
+            "Focus on creativity, clarity, and a compelling narrative.",
+            "Provide relevant facts, examples, and research without making up details.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, writer
+
+
+# phi, the provider SDK and the tools are imported inside each builder so an app only loads its own.
+BUILDERS = {
+    ("openai", "gpt-4o"): _build_gpt4o,
+    ("groq", "llama-3.3-70b-versatile"): _build_llama,
+    ("google", "gemini-1.5-flash"): _build_gemini,
+    ("groq", "mixtral-8x7b-32768"): _build_mixtral,
+}
+
+
+def build_assistants(provider: str, model_id: str, api_key: str, serp_api_key: str):
+    """Build a new (researcher, writer) pair without caching.
+
+    For callers outside Streamlit that need assistants of their own, e.g. one
+    pair per batch item so concurrent items never share per-run state.
+    """
+    return app_assistants.build_assistants(BUILDERS, provider, model_id, api_key, serp_api_key)
+
+
+def section_writer_factory(provider: str, model_id: str, api_key: str):
+    """Return a function that builds a tool-free writer assistant for one part of a ``LongFormWriter`` run."""
+    return app_assistants.part_factory(BUILDERS, provider, model_id, api_key, role="Writes part of a long blog post", description=LONG_FORM_DESCRIPTION, markdown=True)
+
+
+def routed_section_writer_factory(hedge: bool = False):
+    """Return a ``section_writer_factory`` whose assistants route each call across all backends with an API key set."""
+    return app_assistants.routed_part_factory(APP, BUILDERS, "write", section_writer_factory, hedge=hedge)
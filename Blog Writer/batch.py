@@ -0,0 +1,97 @@
+"""Generate blog posts in bulk, without the Streamlit UI.
+
+Each input row needs ``topic`` and ``audience``; an optional ``id`` names the
+row in the output. Every row runs the same researcher -> writer pipeline as
+the apps, sharing their research and search caches, and its result is
+appended to the output JSONL as soon as it finishes. Rerun the same command
+to resume after a crash. With ``--long-form-words`` set, every post is
+outlined first and its sections are written in parallel.
+
+Usage:
+    python batch.py topics.jsonl blogs.jsonl [--model llama-3.3-70b-versatile] [--workers 4]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import BUILDERS, build_assistants, section_writer_factory  # noqa: E402
+from long_form import MIN_WORDS, LongFormWriter  # noqa: E402
+from shared.app_assistants import build_fanout_researcher  # noqa: E402
+from shared.batch_runner import argument_parser, configure_logging, provider_and_key, read_inputs, required_env, run_batch  # noqa: E402
+from shared.context_budget import ContextBudget, default_budget, system_prompt  # noqa: E402
+from shared.research_cache import get_research_cache, instructions_fingerprint  # noqa: E402
+
+FIELDS = ("topic", "audience")
+
+
+def make_pipeline(provider: str, model_id: str, api_key: str, serp_api_key: str, parallel_search: bool = True,
+                  use_research_cache: bool = True, similarity: Optional[float] = None, prompt_budget: Optional[int] = None,
+                  long_form_words: Optional[int] = None, max_parallel_sections: int = 8):
+    """Return a function that turns one input row into a blog post."""
+    research_cache = get_research_cache()
+    prompt_budget = prompt_budget or default_budget(model_id)
+
+    def generate(item: dict) -> dict:
+        # phi assistants keep per-run state, so every concurrent item gets its own.
+        researcher, writer = build_assistants(provider, model_id, api_key, serp_api_key)
+        if parallel_search:
+            researcher = build_fanout_researcher(researcher, provider, model_id, api_key, serp_api_key)
+        topic, audience = item["topic"], item["audience"]
+        started = time.perf_counter()
+        research_results, research_cached = research_cache.get_or_run(
+            model_id,
+            instructions_fingerprint(researcher),
+            (topic, audience),
+            lambda: researcher.run(f"Research blog topic: {topic} for the audience: {audience}", stream=False),
+            refresh=not use_research_cache,
+            similarity=similarity,
+        )
+        researched = time.perf_counter()
+        prompt = f"Write a blog on the topic '{topic}' for the audience '{audience}' using the following research:\n\n"
+        fitted = ContextBudget(model_id, prompt_budget).fit(research_results, request=f"{topic} {audience}", prompt_overhead=system_prompt(writer) + prompt)
+        if long_form_words and long_form_words >= MIN_WORDS:
+            long_form_writer = LongFormWriter(section_writer_factory(provider, model_id, api_key), fitted.text, words=long_form_words, max_workers=max_parallel_sections)
+            blog = long_form_writer.run(f"Write a blog on the topic '{topic}' for the audience '{audience}'.", stream=False)
+        else:
+            blog = writer.run(prompt + fitted.text, stream=False)
+        timings = {"research": round(researched - started, 3), "write": round(time.perf_counter() - researched, 3)}
+        return {"research_cached": research_cached, "prompt_tokens": fitted.prompt_tokens, "timings": timings, "research": research_results, "blog": blog}
+
+    return generate
+
+
+def main() -> None:
+    parser = argument_parser(__doc__, BUILDERS)
+    parser.add_argument("--sequential-search", action="store_true", help="let the researcher call the search tool itself")
+    parser.add_argument("--refresh-research", action="store_true", help="research again instead of reusing cached research")
+    parser.add_argument("--similarity", type=float, help="similarity needed to reuse research of a similar row, 1 for exact repeats only (default RESEARCH_CACHE_SIMILARITY)")
+    parser.add_argument("--prompt-budget", type=int, help="writer prompt budget in tokens (default depends on the model)")
+    parser.add_argument("--long-form-words", type=int, help=f"outline every post of this many words (at least {MIN_WORDS}) and write its sections in parallel")
+    parser.add_argument("--max-parallel-sections", type=int, default=8, help="sections written at once per post in long-form mode")
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    provider, api_key = provider_and_key(args.model, BUILDERS)
+    generate = make_pipeline(
+        provider,
+        args.model,
+        api_key,
+        required_env("SERPER_API_KEY"),
+        parallel_search=not args.sequential_search,
+        use_research_cache=not args.refresh_research,
+        similarity=args.similarity,
+        prompt_budget=args.prompt_budget,
+        long_form_words=args.long_form_words,
+        max_parallel_sections=args.max_parallel_sections,
+    )
+    print(run_batch(read_inputs(args.inputs, FIELDS), generate, args.output, workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""The Blog Writer app for every backend, picked when the app runs.
+
+``app.py`` to ``app4.py`` were one script five times over, one per backend and
+one routed across all of them, and each imported phi and its tools before
+drawing anything. ``main`` is that script once, serving one ``"provider/model"``
+backend or ``"routed"``: the backend it is given (the old scripts each pin
+theirs), else ``APP_BACKEND``, else the user's pick in the sidebar among the
+backends with an API key set. Its first page needs only Streamlit and this
+repo's own modules. phi, the chosen backend's SDK and the search tools are
+preloaded on a background thread and every request builds its own assistants
+(see ``assistants``). The parts of the page every research app
+shares are drawn by ``shared.research_page``.
+
+    streamlit run launcher.py
+"""
+import sys
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import APP, BUILDERS, PRELOAD_MODULES, STAGES, routed_section_writer_factory, section_writer_factory  # noqa: E402
+from long_form import MIN_WORDS, LongFormWriter  # noqa: E402
+from shared.context_budget import ContextBudget, system_prompt  # noqa: E402
+from shared.conversation import get_conversation  # noqa: E402
+from shared.jobs import get_job_queue, start_job  # noqa: E402
+from shared.prompts import wants_history  # noqa: E402
+from shared.research_page import render_research_page  # noqa: E402
+from shared.session_memo import input_key  # noqa: E402
+
+
+def main(backend: Optional[str] = None) -> None:
+    page = render_research_page(
+        APP,
+        BUILDERS,
+        PRELOAD_MODULES,
+        title="AI Blog Writer ✍️",
+        caption="Create research-backed and engaging blogs using AI ({backend}).",
+        routed_caption="Create research-backed and engaging blogs, with each step sent to the fastest available model.",
+        backend=backend,
+    )
+    if page is None:
+        return
+
+    # Long posts are outlined first and their sections written at the same time
+    long_form = st.sidebar.toggle("Long-form mode", value=False, help=f"For posts of {MIN_WORDS:,} words or more, outline the post first, then write the introduction, every section and the conclusion in parallel, each from the research relevant to it.")
+    target_words = st.sidebar.number_input("Target length (words)", min_value=300, max_value=10000, value=3000, step=100, disabled=not long_form)
+    max_parallel_sections = st.sidebar.slider("Parallel sections", min_value=1, max_value=12, value=8, disabled=not long_form)
+
+    # Input fields for the blog topic and target audience
+    topic = st.text_input("What is the blog topic?")
+    audience = st.text_input("Who is the target audience?")
+
+    # A repeat request shows this session's earlier result instead of generating it again
+    reuse_results = st.sidebar.toggle("Reuse earlier results", value=True, help="Show this session's earlier result for the same inputs and model at once; turn off to generate again.")
+
+    # Generations run on a worker pool shared by every session, so reruns do not interrupt them
+    jobs = get_job_queue()
+
+    if st.button("Generate Blog"):
+        # Built for this request alone, so concurrent requests never share per-run state
+        researcher, writer = page.assistants(BUILDERS, STAGES)
+        # Built here, on the script thread; the job only calls it
+        if page.routed:
+            make_section_writer = routed_section_writer_factory(hedge=page.hedge)
+        else:
+            make_section_writer = section_writer_factory(*page.backends[page.backend])
+
+        # This session's earlier generations, summarized and capped, in place of phi's chat history
+        conversation = get_conversation(page.model) if wants_history(writer) else None
+
+        def generate_blog(job):
+            research_results = page.research(job, researcher, (topic, audience), f"Research blog topic: {topic} for the audience: {audience}")
+
+            # Generate the blog post
+            job.section("### Generated Blog:")
+            prompt = f"Write a blog on the topic '{topic}' for the audience '{audience}' using the following research:\n\n"
+            long_post = long_form and target_words >= MIN_WORDS
+            # Earlier posts on the same topic; section writers work from the outline instead
+            history = conversation.context(topic) if conversation is not None and not long_post else ""
+            fitted = ContextBudget(page.model, page.prompt_budget).fit(research_results, request=f"{topic} {audience}", prompt_overhead=system_prompt(writer) + history + prompt)
+            if long_post:
+                long_form_writer = LongFormWriter(make_section_writer, fitted.text, words=target_words, max_workers=max_parallel_sections)
+                blog = job.run(long_form_writer, f"Write a blog on the topic '{topic}' for the audience '{audience}'.", stream=page.stream_output)
+            else:
+                blog = job.run(writer, history + prompt + fitted.text, stream=page.stream_output)
+            if conversation is not None:
+                conversation.add(topic, f"Blog on '{topic}' for '{audience}'", blog)
+            job.caption(fitted.summary(page.prompt_budget))
+            return blog
+
+        start_job(jobs, "Generate Blog", generate_blog, key=input_key(page.model, topic, audience, target_words if long_form else ""), reuse=reuse_results)
+
+    page.render_footer(jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Long blog posts written a section at a time and in parallel.
+
+The writer produces a whole post in one generation, so a 3,000-word post is
+one long sequential completion whose time grows with every section.
+``LongFormWriter`` first asks for an outline (a title and one line per
+section), then writes the introduction, every body section and the conclusion
+at the same time with bounded concurrency, each from the outline and the
+research items most relevant to it, and joins them in outline order. The
+post then takes about as long as the outline plus its slowest section.
+
+Joining is a light consistency pass without a model call: heading levels are
+made uniform, titles and headings a section repeated are dropped, and
+paragraphs that repeat an earlier section are removed. Every section prompt
+carries the whole outline and names its neighbours, so sections lead into
+each other instead of each introducing the topic again.
+
+Every call gets a new assistant from ``make_assistant``: phi assistants keep
+per-run state, so one instance must not serve several threads at once.
+"""
+import contextvars
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from shared.context_budget import dedupe, rank, split_items
+from shared.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Posts shorter than this are written in one call, as an outline would only add latency.
+MIN_WORDS = 1200
+# Words per body section; the introduction and the conclusion get a tenth of the post each.
+SECTION_WORDS = 400
+# Research items given to each section.
+ITEMS_PER_SECTION = 4
+
+LONG_FORM_DESCRIPTION = (
+    "You are a professional blog writer. Long posts are planned as an outline first, "
+    "then written a section at a time following that outline."
+)
+OUTLINE_INSTRUCTIONS = [
+    "Given a blog topic, its audience and research results, plan the structure of the post before writing it.",
+    "Write the title of the post on the first line as `# <title>`.",
+    "Then write exactly one line per section, in order, as `Section N: <heading> - <what the section covers>`, "
+    "starting with the introduction and ending with a conclusion that carries the call to action.",
+    "Give every body section its own angle so no two sections repeat each other.",
+]
+SECTION_INSTRUCTIONS = [
+    "Write the requested section of the blog post only, following its line in the outline.",
+    "Start a body section or the conclusion with a `## <heading>` heading; the introduction has no heading.",
+    "Do not write the title, other sections or a summary of the post, and lead naturally from the previous section.",
+    "Use the research results, quoting facts where possible. Never make up facts or plagiarize.",
+    "Naturally integrate relevant keywords for SEO; only the conclusion has a CTA.",
+]
+
+_TITLE = re.compile(r"^\s*#\s+(.+)$")
+_SECTION_LINE = re.compile(r"^\W*section\s+(\d+)\W*\s*(.*)$", re.IGNORECASE)
+_HEADING = re.compile(r"^\s*(?:#{1,6}\s+|\*\*(?=.*\*\*\s*$))(.*?)(?:\*\*)?\s*$")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+class Section(NamedTuple):
+    heading: str
+    summary: str
+    words: int
+
+    def line(self, number: int) -> str:
+        return f"Section {number}: {self.heading} - {self.summary}" if self.summary else f"Section {number}: {self.heading}"
+
+
+class Outline(NamedTuple):
+    title: str
+    sections: List[Section]
+
+    def text(self) -> str:
+        return "\n".join([f"# {self.title}", *(section.line(number) for number, section in enumerate(self.sections, 1))])
+
+
+def section_words(words: int) -> List[int]:
+    """Split a target length into words for the introduction, the body sections and the conclusion."""
+    edge = max(100, words // 10)
+    body = max(2, round((words - 2 * edge) / SECTION_WORDS))
+    return [edge, *[max(100, (words - 2 * edge) // body)] * body, edge]
+
+
+def parse_outline(text: str, words: int) -> Outline:
+    """Read the title and section lines of an outline reply; sections it left out are filled in."""
+    lengths = section_words(words)
+    title, found = "", {}
+    for line in str(text).splitlines():
+        heading = _TITLE.match(line)
+        section = _SECTION_LINE.match(line.strip())
+        if heading and not title and not found:
+            title = heading.group(1).strip()
+        elif section and 1 <= int(section.group(1)) <= len(lengths):
+            heading, _, summary = section.group(2).strip().strip("*").partition(" - ")
+            found.setdefault(int(section.group(1)), (heading.strip() or f"Part {section.group(1)}", summary.strip()))
+    defaults = {1: "Introduction", len(lengths): "Conclusion"}
+    sections = [
+        Section(*found.get(number, (defaults.get(number, f"Part {number}"), "plan it from the research")), words=length)
+        for number, length in enumerate(lengths, 1)
+    ]
+    return Outline(title, sections)
+
+
+def _clean(text: str, heading: Optional[str], title: str, seen: List[set]) -> str:
+    """Give a section one ``## heading`` (none for the introduction) and drop paragraphs said before."""
+    paragraphs = [paragraph.strip() for paragraph in _PARAGRAPH.split(str(text)) if paragraph.strip()]
+    # A heading the model wrote itself replaces the outline's, unless it is the post's title.
+    while paragraphs and _HEADING.match(paragraphs[0].splitlines()[0]):
+        first, _, rest = paragraphs[0].partition("\n")
+        written = _HEADING.match(first).group(1).strip()
+        if heading is not None and written.casefold() not in (title.casefold(), ""):
+            heading = written
+        paragraphs[0:1] = [rest.strip()] if rest.strip() else []
+    # Headings inside a section sit one level below the section's.
+    paragraphs = [re.sub(r"^#{1,2}\s+", "### ", paragraph, flags=re.MULTILINE) for paragraph in paragraphs]
+    body = dedupe(paragraphs, seen=seen)
+    if len(body) < len(paragraphs):
+        logger.info("long-form: dropped %d repeated paragraphs from %r", len(paragraphs) - len(body), heading or "introduction")
+    return "\n\n".join(([f"## {heading}"] if heading is not None else []) + body)
+
+
+class LongFormWriter:
+    """Drop-in for the writer's ``run`` on one post: outline first, then all sections in parallel.
+
+    ``run`` takes the request without research; ``research`` is given to the
+    outline in full and to each section as its most relevant items.
+    """
+
+    name = "LongFormWriter"
+
+    def __init__(self, make_assistant: Callable[[str, List[str]], object], research: str, words: int = 3000, max_workers: int = 8):
+        self.make_assistant = make_assistant
+        self.research = str(research)
+        self.items = dedupe(split_items(self.research))
+        self.words = words
+        self.max_workers = max_workers
+        self.outline: Optional[Outline] = None
+        self.timings: Dict[str, float] = {}
+
+    def plan(self, message: str) -> Outline:
+        count = len(section_words(self.words))
+        reply = self.make_assistant("OutlineWriter", OUTLINE_INSTRUCTIONS).run(
+            f"{message}\n\nResearch:\n{self.research}\n\n"
+            f"Write the outline of the post with {count} sections for about {self.words} words in total, not the post itself.",
+            stream=False,
+        )
+        return parse_outline(reply, self.words)
+
+    def research_for(self, outline: Outline, number: int) -> str:
+        """The research items most relevant to section ``number``, in their original order."""
+        section = outline.sections[number - 1]
+        request = f"{outline.title} {section.heading} {section.summary}"
+        return "\n\n".join(self.items[i] for i in sorted(rank(self.items, request)[:ITEMS_PER_SECTION]))
+
+    def _write_section(self, message: str, outline: Outline, number: int) -> str:
+        section = outline.sections[number - 1]
+        neighbours = []
+        if number > 1:
+            neighbours.append(f"It follows section {number - 1}, {outline.sections[number - 2].heading}.")
+        if number < len(outline.sections):
+            neighbours.append(f"Section {number + 1}, {outline.sections[number].heading}, comes next.")
+        return self.make_assistant("SectionWriter", SECTION_INSTRUCTIONS).run(
+            f"{message}\n\nOutline of the post:\n{outline.text()}\n\n"
+            f"Research for this section:\n{self.research_for(outline, number)}\n\n"
+            f"Write section {number} of {len(outline.sections)} only, in about {section.words} words:\n"
+            f"{section.line(number)}\n{' '.join(neighbours)}",
+            stream=False,
+        )
+
+    def _chunks(self, message: str) -> Iterator[str]:
+        with span("long_form", words=self.words):
+            started = time.perf_counter()
+            outline = self.outline = self.plan(message)
+            self.timings["outline"] = time.perf_counter() - started
+            if outline.title:
+                yield f"# {outline.title}\n\n"
+            last = len(outline.sections)
+            seen: List[set] = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # Each section runs in a copy of this context, so its span joins the run's trace.
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._write_section, message, outline, number)
+                    for number in range(1, last + 1)
+                ]
+                # Sections are yielded in order as soon as every earlier one is written.
+                for number, future in enumerate(futures, 1):
+                    heading = None if number == 1 else outline.sections[number - 1].heading
+                    text = _clean(future.result(), heading, outline.title, seen)
+                    if text:
+                        yield text + "\n\n"
+            self.timings["sections"] = time.perf_counter() - started - self.timings["outline"]
+            logger.info(
+                "long-form post: %d sections, outline=%.2fs sections=%.2fs", last, self.timings["outline"], self.timings["sections"]
+            )
+
+    def run(self, message: str, stream: bool = False) -> Union[str, Iterator[str]]:
+        chunks = self._chunks(message)
+        return chunks if stream else "".join(chunks).strip()
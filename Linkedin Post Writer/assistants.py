@@ -0,0 +1,277 @@
+"""Assistant factory for the LinkedIn Post Writer apps.
+
+Building an ``Assistant`` also builds its LLM client and tool clients. Streamlit
+reruns the app script on every widget interaction, so the apps ask this module
+for their assistants instead of constructing them at the top of the script.
+
+phi, the provider SDKs and the search tools are imported by the functions that
+build assistants, not by this module, so an app draws its first page without
+them and a process only loads the providers it serves. The launcher passes
+``PRELOAD_MODULES`` to ``shared.backends.preload``, which imports them on a
+background thread while the first user is still typing.
+
+This module keeps the app's prompts; ``shared.app_assistants`` builds and
+routes the assistants the same way for every app.
+"""
+from textwrap import dedent
+
+from shared import app_assistants
+from shared.prompts import wants_date
+from shared.router import RoutedAssistant
+
+APP = "linkedin-post-writer"
+
+# The router stages of the researcher and the writer, in the order the builders return them.
+STAGES = ("research", "write")
+
+# Imported in the background before the first request (see ``shared.backends.preload``).
+PRELOAD_MODULES = ("phi.assistant", "shared.search_tools", "shared.semantic_index")
+
+
+def _build_gpt4o(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.openai import OpenAIChat
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for relevant content, trends, and ideas for LinkedIn posts based on user preferences",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class content researcher. Given a LinkedIn post topic and style preferences, generate a list of relevant content ideas, industry trends, and best practices for creating effective LinkedIn posts.
+        Then search the web for each content idea, analyze the results, and return the 10 most relevant insights for creating engaging LinkedIn posts.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic and style preferences, first generate a list of 3 search terms related to that topic.",
+            "For each search term, `search_google` and analyze the results.",
+            "From the results of all searches, return the 10 most relevant insights, trends, and best practices for creating LinkedIn posts.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+    
+    writer = Assistant(
+        name="Writer",
+        role="Generates a compelling LinkedIn post based on user preferences, research insights, and best practices",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+        You are an expert LinkedIn content writer. Given a LinkedIn post topic, style preferences, and a list of research insights,
+        your goal is to create a professional, engaging, and impactful LinkedIn post that resonates with the target audience.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic, style preferences, and a list of relevant content research insights, generate a compelling LinkedIn post.",
+            "Ensure the LinkedIn post is well-structured, professional, and attention-grabbing.",
+            "The tone should match the user's preferred writing style (e.g., casual, professional, inspiring).",
+            "Incorporate relevant industry trends, facts, and insights into the post.",
+            "Focus on clarity, engagement, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, writer
+
+
+def _build_llama(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for relevant content, trends, and ideas for LinkedIn posts based on user preferences",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class content researcher. Given a LinkedIn post topic and style preferences, generate a list of relevant content ideas, industry trends, and best practices for creating effective LinkedIn posts.
+        Then search the web for each content idea, analyze the results, and return the 10 most relevant insights for creating engaging LinkedIn posts.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic and style preferences, first generate a list of 3 search terms related to that topic.",
+            "For each search term, `search_google` and analyze the results.",
+            "From the results of all searches, return the 10 most relevant insights, trends, and best practices for creating LinkedIn posts.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+    
+    writer = Assistant(
+        name="Writer",
+        role="Generates a compelling LinkedIn post based on user preferences, research insights, and best practices",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are an expert LinkedIn content writer. Given a LinkedIn post topic, style preferences, and a list of research insights,
+        your goal is to create a professional, engaging, and impactful LinkedIn post that resonates with the target audience.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic, style preferences, and a list of relevant content research insights, generate a compelling LinkedIn post.",
+            "Ensure the LinkedIn post is well-structured, professional, and attention-grabbing.",
+            "The tone should match the user's preferred writing style (e.g., casual, professional, inspiring).",
+            "Incorporate relevant industry trends, facts, and insights into the post.",
+            "Focus on clarity, engagement, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, writer
+
+
+def _build_gemini(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.google import Gemini
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for relevant content ideas, trends, and best practices for LinkedIn posts based on user preferences",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class content researcher. Given a LinkedIn post topic and style preferences, generate a list of relevant content ideas, industry trends, and best practices for creating effective LinkedIn posts.
+        Then search the web for each content idea, analyze the results, and return the 10 most relevant insights for creating engaging LinkedIn posts.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic and style preferences, first generate a list of 3 search terms related to that topic.",
+            "For each search term, `search_google` and analyze the results.",
+            "From the results of all searches, return the 10 most relevant insights, trends, and best practices for creating LinkedIn posts.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+        markdown=True,
+    )
+
+    writer = Assistant(
+        name="Writer",
+        role="Generates a compelling LinkedIn post based on user preferences, research insights, and best practices",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are an expert LinkedIn content writer. Given a LinkedIn post topic, style preferences, and a list of research insights,
+        your goal is to create a professional, engaging, and impactful LinkedIn post that resonates with the target audience.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic, style preferences, and a list of relevant content research insights, generate a compelling LinkedIn post.",
+            "Ensure the LinkedIn post is well-structured, professional, and attention-grabbing.",
+            "The tone should match the user's preferred writing style (e.g., casual, professional, inspiring).",
+            "Incorporate relevant industry trends, facts, and insights into the post.",
+            "Focus on clarity, engagement, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+        markdown=True,
+    )
+    return researcher, writer
+
+
+def _build_mixtral(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for relevant content ideas, trends, and best practices for LinkedIn posts based on user preferences",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class content researcher. Given a LinkedIn post topic and style preferences, generate a list of relevant content ideas, industry trends, and best practices for creating effective LinkedIn posts.
+        Then search the web for each content idea, analyze the results, and return the 10 most relevant insights for creating engaging LinkedIn posts.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic and style preferences, first generate a list of 3 search terms related to that topic.",
+            "For each search term, `search_google` and analyze the results.",
+            "From the results of all searches, return the 10 most relevant insights, trends, and best practices for creating LinkedIn posts.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+
+    writer = Assistant(
+        name="Writer",
+        role="Generates a compelling LinkedIn post based on user preferences, research insights, and best practices",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are an expert LinkedIn content writer. Given a LinkedIn post topic, style preferences, and a list of research insights,
+        your goal is to create a professional, engaging, and impactful LinkedIn post that resonates with the target audience.
+        """
+        ),
+        instructions=[
+            "Given a LinkedIn post topic, style preferences, and a list of relevant content research insights, generate a compelling LinkedIn post.",
+            "Ensure the LinkedIn post is well-structured, professional, and attention-grabbing.",
+            "The tone should match the user's preferred writing style (e.g., casual, professional, inspiring).",
+            "Incorporate relevant industry trends, facts, and insights into the post.",
+            "Focus on clarity, engagement, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, writer
+
+
+# phi, the provider SDK and the tools are imported inside each builder so an app only loads its own.
+BUILDERS = {
+    ("openai", "gpt-4o"): _build_gpt4o,
+    ("groq", "llama-3.3-70b-versatile"): _build_llama,
+    ("google", "gemini-1.5-flash"): _build_gemini,
+    ("groq", "mixtral-8x7b-32768"): _build_mixtral,
+}
+
+
+def build_assistants(provider: str, model_id: str, api_key: str, serp_api_key: str):
+    """Build a new (researcher, writer) pair without caching.
+
+    For callers outside Streamlit that need assistants of their own, e.g. one
+    pair per batch item so concurrent items never share per-run state.
+    """
+    return app_assistants.build_assistants(BUILDERS, provider, model_id, api_key, serp_api_key)
+
+
+def writer_factory(writer, provider: str, model_id: str, api_key: str):
+    """Return a function that builds a new writer with the prompts of ``writer``, one per style variant."""
+    return app_assistants.part_factory(
+        BUILDERS,
+        provider,
+        model_id,
+        api_key,
+        name=writer.name,
+        role=writer.role,
+        description=writer.description,
+        instructions=writer.instructions,
+        markdown=writer.markdown,
+        add_datetime_to_instructions=wants_date(writer),
+    )
+
+
+def routed_writer_factory(writer: RoutedAssistant, hedge: bool = False):
+    """Return a ``writer_factory`` whose writers route each run across the backends of ``writer``."""
+
+    def factory(provider: str, model_id: str, api_key: str):
+        return writer_factory(writer.assistants[f"{provider}/{model_id}"], provider, model_id, api_key)
+
+    return app_assistants.routed_part_factory(APP, BUILDERS, "write", factory, hedge=hedge)
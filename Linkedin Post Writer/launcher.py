@@ -0,0 +1,102 @@
+"""The LinkedIn Post Writer app for every backend, picked when the app runs.
+
+``app.py`` to ``app4.py`` were one script five times over, one per backend and
+one routed across all of them, and each imported phi and its tools before
+drawing anything. ``main`` is that script once, serving one ``"provider/model"``
+backend or ``"routed"``: the backend it is given (the old scripts each pin
+theirs), else ``APP_BACKEND``, else the user's pick in the sidebar among the
+backends with an API key set. Its first page needs only Streamlit and this
+repo's own modules. phi, the chosen backend's SDK and the search tools are
+preloaded on a background thread and every request builds its own assistants
+(see ``assistants``). The parts of the page every research app
+shares are drawn by ``shared.research_page``.
+
+    streamlit run launcher.py
+"""
+import sys
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import APP, BUILDERS, PRELOAD_MODULES, STAGES, routed_writer_factory, writer_factory  # noqa: E402
+from shared.context_budget import ContextBudget, system_prompt  # noqa: E402
+from shared.conversation import get_conversation  # noqa: E402
+from shared.jobs import get_job_queue, start_job  # noqa: E402
+from shared.prompts import wants_history  # noqa: E402
+from shared.research_page import render_research_page  # noqa: E402
+from shared.session_memo import input_key  # noqa: E402
+from variants import MAX_VARIANTS, parse_styles, show_variants  # noqa: E402
+
+
+def main(backend: Optional[str] = None) -> None:
+    page = render_research_page(
+        APP,
+        BUILDERS,
+        PRELOAD_MODULES,
+        title="AI LinkedIn Post Content Writer ✍️",
+        caption="Create professional and engaging LinkedIn posts with ease using AI LinkedIn Post Content Writer powered by {backend}",
+        routed_caption="Create professional and engaging LinkedIn posts with ease, with each step sent to the fastest available model.",
+        backend=backend,
+    )
+    if page is None:
+        return
+
+    # Several styles, separated by commas, are written at once from one research pass
+    compare_styles = st.sidebar.toggle("Compare styles", value=False, help=f"Research the topic once, then write one post for each of up to {MAX_VARIANTS} comma-separated styles at the same time and show them side by side.")
+
+    # Input fields for the user's LinkedIn post topic and style preferences
+    post_topic = st.text_input("What is the topic of your LinkedIn post?")
+    style_preference = st.text_input("What style would you like the LinkedIn post to be written in? (e.g., casual, professional, inspiring)")
+
+    # A repeat request shows this session's earlier result instead of generating it again
+    reuse_results = st.sidebar.toggle("Reuse earlier results", value=True, help="Show this session's earlier result for the same inputs and model at once; turn off to generate again.")
+
+    # Generations run on a worker pool shared by every session, so reruns do not interrupt them
+    jobs = get_job_queue()
+
+    if st.button("Generate LinkedIn Post"):
+        # Built for this request alone, so concurrent requests never share per-run state
+        researcher, writer = page.assistants(BUILDERS, STAGES)
+        # Built here, on the script thread; the job only calls it
+        if page.routed:
+            make_writer = routed_writer_factory(writer, hedge=page.hedge)
+        else:
+            make_writer = writer_factory(writer, *page.backends[page.backend])
+
+        # This session's earlier generations, summarized and capped, in place of phi's chat history
+        conversation = get_conversation(page.model) if wants_history(writer) else None
+
+        def generate_post(job):
+            research_results = page.research(job, researcher, (post_topic, style_preference), f"Linkedin Post topic: {post_topic} for the style preference: {style_preference}")
+
+            # Generate the Linkedin Post Content
+            prompt = f"LinkedIn post on '{post_topic}' with style '{style_preference}' using the following research:\n\n"
+            styles = parse_styles(style_preference) if compare_styles else []
+            # Earlier posts on the same topic; variant writers start afresh
+            history = conversation.context(post_topic) if conversation is not None and len(styles) <= 1 else ""
+            fitted = ContextBudget(page.model, page.prompt_budget).fit(research_results, request=post_topic, prompt_overhead=system_prompt(writer) + history + prompt)
+            if len(styles) > 1:
+                job.section("Linkedin Post Variants")
+                response = show_variants(job, make_writer, styles, lambda style: f"LinkedIn post on '{post_topic}' using the following research:\n\n{fitted.text}\n\nWrite it with style '{style}'.")
+            else:
+                job.section("Linkedin Post Content")
+                response = job.run(writer, history + prompt + fitted.text, stream=page.stream_output)
+            if conversation is not None:
+                posts = "\n\n".join(f"## {style}\n{post}" for style, post in response.items()) if isinstance(response, dict) else response
+                conversation.add(post_topic, f"LinkedIn post on '{post_topic}' with style '{style_preference}'", posts)
+            job.caption(fitted.summary(page.prompt_budget))
+            return response
+
+        start_job(jobs, "Generate LinkedIn Post", generate_post, key=input_key(page.model, post_topic, style_preference, "compare styles" if compare_styles else ""), reuse=reuse_results)
+
+    page.render_footer(jobs)
+
+
+if __name__ == "__main__":
+    main()
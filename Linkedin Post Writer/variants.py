@@ -0,0 +1,69 @@
+"""Several style variants of one post, written at once from a single research pass.
+
+Users often try a few styles for the same topic, and every try used to run the
+researcher and the writer again. ``write_variants`` takes the research once
+and runs one writer call per style on a thread pool, yielding each post as soon
+as it is done, so all variants together take about as long as the slowest
+writer call. ``show_variants`` puts them side by side in an app's job.
+
+Every call gets a new writer from ``make_writer``: phi assistants keep per-run
+state, so one instance must not serve several threads at once.
+"""
+import contextvars
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+from shared.telemetry import span
+
+# Variants shown side by side; more columns get too narrow to read.
+MAX_VARIANTS = 4
+
+_SEPARATOR = re.compile(r"[,;\n]|\bor\b")
+
+
+class Variant(NamedTuple):
+    style: str
+    post: str
+    seconds: float
+
+
+def parse_styles(text: str, limit: int = MAX_VARIANTS) -> List[str]:
+    """Split "casual, professional or inspiring" into up to ``limit`` distinct styles."""
+    styles, seen = [], set()
+    for style in _SEPARATOR.split(str(text)):
+        style = style.strip().strip(".")
+        if style and style.casefold() not in seen:
+            seen.add(style.casefold())
+            styles.append(style)
+    return styles[:limit]
+
+
+def write_variants(
+    make_writer: Callable[[], object], styles: List[str], prompt: Callable[[str], str], max_workers: int = MAX_VARIANTS
+) -> Iterator[Tuple[int, Variant]]:
+    """Yield ``(index in styles, Variant)`` for every style, in the order the posts finish."""
+
+    def write(style: str) -> Variant:
+        started = time.perf_counter()
+        post = make_writer().run(prompt(style), stream=False)
+        return Variant(style, post, time.perf_counter() - started)
+
+    with span("variants", count=len(styles)):
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # Each variant runs in a copy of this context, so its span joins the run's trace.
+            futures = {pool.submit(contextvars.copy_context().run, write, style): index for index, style in enumerate(styles)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+
+def show_variants(job, make_writer: Callable[[], object], styles: List[str], prompt: Callable[[str], str]) -> Dict[str, str]:
+    """Write one post per style at once, each in its own column of ``job`` as soon as it is done."""
+    job.set_stage(f"Writing {len(styles)} variants...")
+    job.columns(styles)
+    posts = {}
+    for _, variant in write_variants(make_writer, styles, prompt):
+        job.write_column(variant.style, variant.post, f"Written in {variant.seconds:.2f}s")
+        posts[variant.style] = variant.post
+    return posts
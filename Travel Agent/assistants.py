@@ -0,0 +1,263 @@
+"""Assistant factory for the Travel Agent apps.
+
+Building an ``Assistant`` also builds its LLM client and tool clients. Streamlit
+reruns the app script on every widget interaction, so the apps ask this module
+for their assistants instead of constructing them at the top of the script.
+
+phi, the provider SDKs and the search tools are imported by the functions that
+build assistants, not by this module, so an app draws its first page without
+them and a process only loads the providers it serves. The launcher passes
+``PRELOAD_MODULES`` to ``shared.backends.preload``, which imports them on a
+background thread while the first user is still typing.
+
+This module keeps the app's prompts; ``shared.app_assistants`` builds and
+routes the assistants the same way for every app.
+"""
+from textwrap import dedent
+
+from day_planner import DAY_DESCRIPTION
+from shared import app_assistants
+
+APP = "travel-agent"
+
+# The router stages of the researcher and the planner, in the order the builders return them.
+STAGES = ("research", "plan")
+
+# Imported in the background before the first request (see ``shared.backends.preload``).
+PRELOAD_MODULES = ("phi.assistant", "shared.search_tools", "shared.semantic_index")
+
+
+def _build_gpt4o(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.openai import OpenAIChat
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for travel destinations, activities, and accommodations based on user preferences",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class travel researcher. Given a travel destination and the number of days the user wants to travel for,
+        generate a list of search terms for finding relevant travel activities and accommodations.
+        Then search the web for each term, analyze the results, and return the 10 most relevant results.
+        """
+        ),
+        instructions=[
+            "Given a travel destination and the number of days the user wants to travel for, first generate a list of 3 search terms related to that destination and the number of days.",
+            "For each search term, `search_google` and analyze the results."
+            "From the results of all searches, return the 10 most relevant results to the user's preferences.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+        markdown=True,
+    )
+    planner = Assistant(
+        name="Planner",
+        role="Generates a draft itinerary based on user preferences and research results",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+        You are a senior travel planner. Given a travel destination, the number of days the user wants to travel for, and a list of research results,
+        your goal is to generate a draft itinerary that meets the user's needs and preferences.
+        """
+        ),
+        instructions=[
+            "Given a travel destination, the number of days the user wants to travel for, and a list of research results, generate a draft itinerary that includes suggested activities and accommodations.",
+            "Ensure the itinerary is well-structured, informative, and engaging.",
+            "Ensure you provide a nuanced and balanced itinerary, quoting facts where possible.",
+            "Remember: the quality of the itinerary is important.",
+            "Focus on clarity, coherence, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+        markdown=True,
+    )
+    return researcher, planner
+
+
+def _build_llama(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for travel destinations, activities, and accommodations based on user preferences",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class travel researcher. Given a travel destination and the number of days the user wants to travel for,
+        generate a list of search terms for finding relevant travel activities and accommodations.
+        Then search the web for each term, analyze the results, and return the 10 most relevant results.
+        """
+        ),
+        instructions=[
+            "Given a travel destination and the number of days the user wants to travel for, first generate a list of 3 search terms related to that destination and the number of days.",
+            "For each search term, `search_google` and analyze the results."
+            "From the results of all searches, return the 10 most relevant results to the user's preferences.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+    planner = Assistant(
+        name="Planner",
+        role="Generates a draft itinerary based on user preferences and research results",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are a senior travel planner. Given a travel destination, the number of days the user wants to travel for, and a list of research results,
+        your goal is to generate a draft itinerary that meets the user's needs and preferences.
+        """
+        ),
+        instructions=[
+            "Given a travel destination, the number of days the user wants to travel for, and a list of research results, generate a draft itinerary that includes suggested activities and accommodations.",
+            "Ensure the itinerary is well-structured, informative, and engaging.",
+            "Ensure you provide a nuanced and balanced itinerary, quoting facts where possible.",
+            "Remember: the quality of the itinerary is important.",
+            "Focus on clarity, coherence, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, planner
+
+
+def _build_gemini(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.google import Gemini
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for travel destinations, activities, and accommodations based on user preferences",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class travel researcher. Given a travel destination and the number of days the user wants to travel for,
+        generate a list of search terms for finding relevant travel activities and accommodations.
+        Then search the web for each term, analyze the results, and return the 10 most relevant results.
+        """
+        ),
+        instructions=[
+            "Given a travel destination and the number of days the user wants to travel for, first generate a list of 3 search terms related to that destination and the number of days.",
+            "For each search term, `search_google` and analyze the results."
+            "From the results of all searches, return the 10 most relevant results to the user's preferences.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+        markdown=True,
+    )
+    planner = Assistant(
+        name="Planner",
+        role="Generates a draft itinerary based on user preferences and research results",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are a senior travel planner. Given a travel destination, the number of days the user wants to travel for, and a list of research results,
+        your goal is to generate a draft itinerary that meets the user's needs and preferences.
+        """
+        ),
+        instructions=[
+            "Given a travel destination, the number of days the user wants to travel for, and a list of research results, generate a draft itinerary that includes suggested activities and accommodations.",
+            "Ensure the itinerary is well-structured, informative, and engaging.",
+            "Ensure you provide a nuanced and balanced itinerary, quoting facts where possible.",
+            "Remember: the quality of the itinerary is important.",
+            "Focus on clarity, coherence, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+        markdown=True,
+    )
+    return researcher, planner
+
+
+def _build_mixtral(api_key, serp_api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+
+    from shared.search_tools import CachedSerpApiTools
+
+    researcher = Assistant(
+        name="Researcher",
+        role="Searches for travel destinations, activities, and accommodations based on user preferences",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are a world-class travel researcher. Given a travel destination and the number of days the user wants to travel for,
+        generate a list of search terms for finding relevant travel activities and accommodations.
+        Then search the web for each term, analyze the results, and return the 10 most relevant results.
+        """
+        ),
+        instructions=[
+            "Given a travel destination and the number of days the user wants to travel for, first generate a list of 3 search terms related to that destination and the number of days.",
+            "For each search term, `search_google` and analyze the results."
+            "From the results of all searches, return the 10 most relevant results to the user's preferences.",
+            "Remember: the quality of the results is important.",
+        ],
+        tools=[CachedSerpApiTools(api_key=serp_api_key)],
+        add_datetime_to_instructions=True,
+    )
+    planner = Assistant(
+        name="Planner",
+        role="Generates a draft itinerary based on user preferences and research results",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are a senior travel planner. Given a travel destination, the number of days the user wants to travel for, and a list of research results,
+        your goal is to generate a draft itinerary that meets the user's needs and preferences.
+        """
+        ),
+        instructions=[
+            "Given a travel destination, the number of days the user wants to travel for, and a list of research results, generate a draft itinerary that includes suggested activities and accommodations.",
+            "Ensure the itinerary is well-structured, informative, and engaging.",
+            "Ensure you provide a nuanced and balanced itinerary, quoting facts where possible.",
+            "Remember: the quality of the itinerary is important.",
+            "Focus on clarity, coherence, and overall quality.",
+            "Never make up facts or plagiarize. Always provide proper attribution.",
+        ],
+        add_datetime_to_instructions=True,
+        add_chat_history_to_prompt=True,
+        num_history_messages=3,
+    )
+    return researcher, planner
+
+
+# phi, the provider SDK and the tools are imported inside each builder so an app only loads its own.
+BUILDERS = {
+    ("openai", "gpt-4o"): _build_gpt4o,
+    ("groq", "llama-3.3-70b-versatile"): _build_llama,
+    ("google", "gemini-1.5-flash"): _build_gemini,
+    ("groq", "mixtral-8x7b-32768"): _build_mixtral,
+}
+
+
+def build_assistants(provider: str, model_id: str, api_key: str, serp_api_key: str):
+    """Build a new (researcher, planner) pair without caching.
+
+    For callers outside Streamlit that need assistants of their own, e.g. one
+    pair per batch item so concurrent items never share per-run state.
+    """
+    return app_assistants.build_assistants(BUILDERS, provider, model_id, api_key, serp_api_key)
+
+
+def day_planner_factory(provider: str, model_id: str, api_key: str):
+    """Return a function that builds a tool-free planner assistant for one part of a ``ParallelDayPlanner`` run."""
+    return app_assistants.part_factory(BUILDERS, provider, model_id, api_key, role="Plans part of a long trip", description=DAY_DESCRIPTION, markdown=True)
+
+
+def routed_day_planner_factory(hedge: bool = False):
+    """Return a ``day_planner_factory`` whose assistants route each call across all backends with an API key set."""
+    return app_assistants.routed_part_factory(APP, BUILDERS, "plan", day_planner_factory, hedge=hedge)
@@ -0,0 +1,96 @@
+"""Plan trips in bulk, without the Streamlit UI.
+
+Each input row needs ``destination`` and ``num_days``; an optional ``id``
+names the row in the output. Every row runs the same researcher -> planner
+pipeline as the apps, sharing their research and search caches, and its result is
+appended to the output JSONL as soon as it finishes. Rerun the same command
+to resume after a crash. Trips longer than a few days are outlined first and
+then written a few days at a time in parallel, unless ``--sequential-days``
+is given.
+
+Usage:
+    python batch.py trips.jsonl itineraries.jsonl [--model llama-3.3-70b-versatile] [--workers 4]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import BUILDERS, build_assistants, day_planner_factory  # noqa: E402
+from day_planner import DAYS_PER_BLOCK, ParallelDayPlanner  # noqa: E402
+from shared.app_assistants import build_fanout_researcher  # noqa: E402
+from shared.batch_runner import argument_parser, configure_logging, provider_and_key, read_inputs, required_env, run_batch  # noqa: E402
+from shared.context_budget import ContextBudget, default_budget, system_prompt  # noqa: E402
+from shared.research_cache import get_research_cache, instructions_fingerprint  # noqa: E402
+
+FIELDS = ("destination", "num_days")
+
+
+def make_pipeline(provider: str, model_id: str, api_key: str, serp_api_key: str, parallel_search: bool = True,
+                  use_research_cache: bool = True, similarity: Optional[float] = None, prompt_budget: Optional[int] = None,
+                  parallel_days: bool = True, max_parallel_days: int = 4):
+    """Return a function that turns one input row into an itinerary."""
+    research_cache = get_research_cache()
+    prompt_budget = prompt_budget or default_budget(model_id)
+
+    def generate(item: dict) -> dict:
+        # phi assistants keep per-run state, so every concurrent item gets its own.
+        researcher, planner = build_assistants(provider, model_id, api_key, serp_api_key)
+        if parallel_search:
+            researcher = build_fanout_researcher(researcher, provider, model_id, api_key, serp_api_key)
+        destination, num_days = item["destination"], int(item["num_days"])
+        started = time.perf_counter()
+        research_results, research_cached = research_cache.get_or_run(
+            model_id,
+            instructions_fingerprint(researcher),
+            (destination, num_days),
+            lambda: researcher.run(f"Searche for travel destinations, activities, and accommodations in '{destination}' for '{num_days}' days", stream=False),
+            refresh=not use_research_cache,
+            similarity=similarity,
+        )
+        researched = time.perf_counter()
+        prompt = f"Plan a trip for {destination} for {num_days} days, using the following research:\n\n"
+        fitted = ContextBudget(model_id, prompt_budget).fit(research_results, request=destination, prompt_overhead=system_prompt(planner) + prompt)
+        if parallel_days and num_days > DAYS_PER_BLOCK:
+            planner = ParallelDayPlanner(day_planner_factory(provider, model_id, api_key), num_days, max_workers=max_parallel_days)
+        itinerary = planner.run(prompt + fitted.text, stream=False)
+        timings = {"research": round(researched - started, 3), "plan": round(time.perf_counter() - researched, 3)}
+        return {"research_cached": research_cached, "prompt_tokens": fitted.prompt_tokens, "timings": timings, "research": research_results, "itinerary": itinerary}
+
+    return generate
+
+
+def main() -> None:
+    parser = argument_parser(__doc__, BUILDERS)
+    parser.add_argument("--sequential-search", action="store_true", help="let the researcher call the search tool itself")
+    parser.add_argument("--refresh-research", action="store_true", help="research again instead of reusing cached research")
+    parser.add_argument("--similarity", type=float, help="similarity needed to reuse research of a similar row, 1 for exact repeats only (default RESEARCH_CACHE_SIMILARITY)")
+    parser.add_argument("--prompt-budget", type=int, help="planner prompt budget in tokens (default depends on the model)")
+    parser.add_argument("--sequential-days", action="store_true", help="plan every trip in one call instead of outlining it and writing its days in parallel")
+    parser.add_argument("--max-parallel-days", type=int, default=4, help="day blocks written at once per trip")
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    provider, api_key = provider_and_key(args.model, BUILDERS)
+    generate = make_pipeline(
+        provider,
+        args.model,
+        api_key,
+        required_env("SERPER_API_KEY"),
+        parallel_search=not args.sequential_search,
+        use_research_cache=not args.refresh_research,
+        similarity=args.similarity,
+        prompt_budget=args.prompt_budget,
+        parallel_days=not args.sequential_days,
+        max_parallel_days=args.max_parallel_days,
+    )
+    print(run_batch(read_inputs(args.inputs, FIELDS), generate, args.output, workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
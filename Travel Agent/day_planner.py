@@ -0,0 +1,202 @@
+"""Itinerary planning for long trips, a few days at a time and in parallel.
+
+The planner writes a whole trip in one generation, so a 30-day itinerary is one
+long sequential completion: slow, and often cut off at the model's output
+limit. ``ParallelDayPlanner`` first asks for a skeleton of the trip (a short
+overview and one line per day with its area and theme), then writes blocks of
+``days_per_block`` consecutive days in parallel with bounded concurrency, each
+from the research and the skeleton, and merges the blocks in day order. No
+call writes more than a few days, so none of them runs into the output limit,
+and the skeleton keeps the blocks from repeating each other.
+
+The result is kept as a ``TripPlan`` with one entry per day. Given the
+previous plan for the same destination, the planner only writes what changed:
+extending a trip writes skeleton lines and days for the new days only,
+shortening it drops the last days without a model call, and ``edits`` rewrite
+single days with the traveller's notes. Every other day is reused as is.
+
+Every call gets a new assistant from ``make_assistant``: phi assistants keep
+per-run state, so one instance must not serve several threads at once.
+"""
+import contextvars
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from shared.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# Days written per call. Trips up to this long are planned in one call, as a
+# skeleton would only add latency.
+DAYS_PER_BLOCK = 3
+
+DAY_DESCRIPTION = (
+    "You are a senior travel planner. Long trips are planned as a skeleton of the whole trip first, "
+    "then a few days at a time following that skeleton."
+)
+SKELETON_INSTRUCTIONS = [
+    "Given a travel destination, the number of days and research results, plan the shape of the trip before its details.",
+    "Start with a short overview of the trip and where to stay, in at most one paragraph.",
+    "Then write exactly one line per day, in order, as `Day N: <area or base> - <theme of the day>`.",
+    "Spread the areas and themes so no two days repeat each other, and keep travel between areas sensible.",
+]
+DAY_INSTRUCTIONS = [
+    "Write the detailed itinerary for the requested days only, following their lines in the trip skeleton.",
+    "Start every day with a `### Day N: <title>` heading, then morning, afternoon and evening activities, with places to eat.",
+    "Do not write an introduction, a summary or the other days of the trip.",
+    "Use the research results, quoting facts where possible. Never make up facts or plagiarize.",
+]
+
+_DAY_LINE = re.compile(r"^\W*day\s+(\d+)\W*\s*(.*)$", re.IGNORECASE)
+_DAY_HEADING = re.compile(r"^(?:#+\s*|\*\*)day\s+(\d+)\b", re.IGNORECASE | re.MULTILINE)
+
+
+class Skeleton(NamedTuple):
+    overview: str
+    days: List[str]
+
+    def text(self) -> str:
+        return "\n".join(f"Day {day}: {line}" for day, line in enumerate(self.days, 1))
+
+
+def parse_skeleton(text: str, num_days: int) -> Skeleton:
+    """Split a skeleton reply into its overview and one line per day; days it left out stay open."""
+    overview, days = [], {}
+    for line in str(text).splitlines():
+        found = _DAY_LINE.match(line.strip())
+        if found and 1 <= int(found.group(1)) <= num_days:
+            days.setdefault(int(found.group(1)), found.group(2).strip() or "open day")
+        elif line.strip() and not days:
+            overview.append(line.strip())
+    return Skeleton("\n".join(overview), [days.get(day, "open day, plan it from the research") for day in range(1, num_days + 1)])
+
+
+class TripPlan(NamedTuple):
+    overview: str
+    skeleton: List[str]
+    days: List[str]
+
+    def text(self) -> str:
+        return "\n\n".join(part for part in [self.overview, *self.days] if part).strip()
+
+
+def split_days(text: str, days: range) -> Optional[Dict[int, str]]:
+    """Split an itinerary on its ``Day N`` headings; None unless every day in ``days`` has one, in order."""
+    found = [(int(match.group(1)), match.start()) for match in _DAY_HEADING.finditer(str(text))]
+    found = [(day, start) for day, start in found if day in days]
+    if [day for day, _ in found] != list(days):
+        return None
+    ends = [start for _, start in found[1:]] + [len(text)]
+    return {day: text[start:end].strip() for (day, start), end in zip(found, ends)}
+
+
+def plan_from_itinerary(text: str, num_days: int) -> Optional[TripPlan]:
+    """Return a ``TripPlan`` of an itinerary written in one call, or None if its days cannot be told apart."""
+    days = split_days(text, range(1, num_days + 1))
+    if days is None:
+        return None
+    first = _DAY_HEADING.search(text)
+    skeleton = [days[day].splitlines()[0].strip("#* \t") for day in range(1, num_days + 1)]
+    return TripPlan(text[: first.start()].strip(), skeleton, [days[day] for day in range(1, num_days + 1)])
+
+
+def day_blocks(days: List[int], days_per_block: int) -> List[range]:
+    """Group ``days`` (ascending) into runs of at most ``days_per_block`` consecutive days."""
+    blocks: List[range] = []
+    for day in days:
+        if blocks and blocks[-1][-1] == day - 1 and len(blocks[-1]) < days_per_block:
+            blocks[-1] = range(blocks[-1][0], day + 1)
+        else:
+            blocks.append(range(day, day + 1))
+    return blocks
+
+
+class ParallelDayPlanner:
+    """Drop-in for the planner's ``run`` on one trip: skeleton first, then day blocks in parallel.
+
+    With ``previous`` set, only new days and the days in ``edits`` (day -> note)
+    are written; ``plan`` holds the resulting ``TripPlan`` after a run.
+    """
+
+    name = "ParallelDayPlanner"
+
+    def __init__(
+        self,
+        make_assistant: Callable[[str, List[str]], object],
+        num_days: int,
+        days_per_block: int = DAYS_PER_BLOCK,
+        max_workers: int = 4,
+        previous: Optional[TripPlan] = None,
+        edits: Optional[Dict[int, str]] = None,
+    ):
+        self.make_assistant = make_assistant
+        self.num_days = num_days
+        self.days_per_block = days_per_block
+        self.max_workers = max_workers
+        self.previous = previous
+        self.edits = {day: note for day, note in (edits or {}).items() if 1 <= day <= num_days}
+        self.plan: Optional[TripPlan] = None
+        self.timings: Dict[str, float] = {}
+
+    def skeleton(self, message: str) -> Skeleton:
+        if self.previous is None:
+            reply = self.make_assistant("SkeletonPlanner", SKELETON_INSTRUCTIONS).run(
+                f"{message}\n\nWrite the skeleton of the {self.num_days}-day trip, not the detailed itinerary.", stream=False
+            )
+            return parse_skeleton(reply, self.num_days)
+        kept = self.previous.skeleton[: self.num_days]
+        if len(kept) == self.num_days:
+            return Skeleton(self.previous.overview, kept)
+        so_far = Skeleton("", kept).text()
+        reply = self.make_assistant("SkeletonPlanner", SKELETON_INSTRUCTIONS).run(
+            f"{message}\n\nThe skeleton of the first {len(kept)} days is set:\n{so_far}\n\n"
+            f"Write the skeleton lines of days {len(kept) + 1}-{self.num_days} only, continuing the trip.",
+            stream=False,
+        )
+        return Skeleton(self.previous.overview, kept + parse_skeleton(reply, self.num_days).days[len(kept):])
+
+    def _write_block(self, message: str, skeleton: Skeleton, days: range) -> Dict[int, str]:
+        lines = "\n".join(f"Day {day}: {skeleton.days[day - 1]}" for day in days)
+        notes = "".join(f"\nTraveller's change for day {day}: {self.edits[day]}" for day in days if day in self.edits)
+        reply = self.make_assistant("DayPlanner", DAY_INSTRUCTIONS).run(
+            f"{message}\n\nTrip skeleton:\n{skeleton.text()}\n\n"
+            f"Write the detailed itinerary for days {days[0]}-{days[-1]} of {self.num_days} only:\n{lines}{notes}",
+            stream=False,
+        ).strip()
+        # A block whose days cannot be told apart is kept whole under its first day.
+        return split_days(reply, days) or {day: reply if day == days[0] else "" for day in days}
+
+    def _chunks(self, message: str) -> Iterator[str]:
+        with span("plan", days=self.num_days, incremental=self.previous is not None):
+            started = time.perf_counter()
+            skeleton = self.skeleton(message)
+            self.timings["skeleton"] = time.perf_counter() - started
+            if skeleton.overview:
+                yield skeleton.overview + "\n\n"
+            kept = {}
+            if self.previous is not None:
+                kept = {day: text for day, text in enumerate(self.previous.days[: self.num_days], 1) if day not in self.edits}
+            blocks = day_blocks([day for day in range(1, self.num_days + 1) if day not in kept], self.days_per_block)
+            days = dict(kept)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # Each block runs in a copy of this context, so its span joins the run's trace.
+                futures = {block[0]: pool.submit(contextvars.copy_context().run, self._write_block, message, skeleton, block) for block in blocks}
+                # Days are yielded in order as soon as every earlier one is written.
+                for day in range(1, self.num_days + 1):
+                    if day in futures:
+                        days.update(futures[day].result())
+                    if days[day]:
+                        yield days[day] + "\n\n"
+            self.plan = TripPlan(skeleton.overview, skeleton.days, [days[day] for day in range(1, self.num_days + 1)])
+            self.timings["days"] = time.perf_counter() - started - self.timings["skeleton"]
+            logger.info(
+                "parallel itinerary: %d days, %d rewritten in %d blocks, skeleton=%.2fs days=%.2fs",
+                self.num_days, self.num_days - len(kept), len(blocks), self.timings["skeleton"], self.timings["days"],
+            )
+
+    def run(self, message: str, stream: bool = False) -> Union[str, Iterator[str]]:
+        chunks = self._chunks(message)
+        return chunks if stream else "".join(chunks).strip()
@@ -0,0 +1,127 @@
+"""The Travel Agent app for every backend, picked when the app runs.
+
+``app.py`` to ``app4.py`` were one script five times over, one per backend and
+one routed across all of them, and each imported phi and its tools before
+drawing anything. ``main`` is that script once, serving one ``"provider/model"``
+backend or ``"routed"``: the backend it is given (the old scripts each pin
+theirs), else ``APP_BACKEND``, else the user's pick in the sidebar among the
+backends with an API key set. Its first page needs only Streamlit and this
+repo's own modules. phi, the chosen backend's SDK and the search tools are
+preloaded on a background thread and every request builds its own assistants
+(see ``assistants``). The parts of the page every research app
+shares are drawn by ``shared.research_page``.
+
+    streamlit run launcher.py
+"""
+import sys
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import APP, BUILDERS, PRELOAD_MODULES, STAGES, day_planner_factory, routed_day_planner_factory  # noqa: E402
+from day_planner import DAYS_PER_BLOCK, ParallelDayPlanner, plan_from_itinerary  # noqa: E402
+from shared.context_budget import ContextBudget, system_prompt  # noqa: E402
+from shared.conversation import get_conversation  # noqa: E402
+from shared.jobs import get_job_queue, start_job  # noqa: E402
+from shared.prompts import wants_history  # noqa: E402
+from shared.research_cache import normalize  # noqa: E402
+from shared.research_page import render_research_page  # noqa: E402
+from shared.session_memo import get_session_memo, input_key  # noqa: E402
+
+
+def main(backend: Optional[str] = None) -> None:
+    page = render_research_page(
+        APP,
+        BUILDERS,
+        PRELOAD_MODULES,
+        title="AI Travel Planner ✈️",
+        caption="Plan your next adventure with AI Travel Planner by researching and planning a personalized itinerary on autopilot using {backend}",
+        routed_caption="Plan your next adventure with AI Travel Planner, with each step sent to the fastest available model.",
+        writer="planner",
+        action="planning",
+        backend=backend,
+    )
+    if page is None:
+        return
+
+    # Long trips are outlined first, then written a few days at a time in parallel
+    parallel_days = st.sidebar.toggle("Plan days in parallel", value=True, help=f"For trips longer than {DAYS_PER_BLOCK} days, outline the whole trip first, then write its days {DAYS_PER_BLOCK} at a time in parallel.")
+    max_parallel_days = st.sidebar.slider("Parallel day blocks", min_value=1, max_value=16, value=4)
+
+    # Input fields for the user's destination and the number of days they want to travel for
+    destination = st.text_input("Where do you want to go?")
+    num_days = st.number_input("How many days do you want to travel for?", min_value=1, max_value=30, value=7)
+
+    # This session's research and day plans per destination, so a change only rewrites the days it affects;
+    # bounded like the session's results
+    trips = get_session_memo("trips")
+    trip_key = (page.model, normalize(destination))
+    trip = trips.get(trip_key) if parallel_days else None
+
+    # Change one day of the last itinerary for this destination and keep the others
+    edits = {}
+    if trip is not None and trip[1] is not None:
+        with st.expander("Change one day"):
+            edit_day = st.number_input("Day to change", min_value=1, max_value=len(trip[1].days), value=1)
+            edit_note = st.text_input("What should change on that day?")
+            if st.button("Update day", disabled=not edit_note):
+                edits = {edit_day: edit_note}
+
+    # A repeat request shows this session's earlier result instead of generating it again
+    reuse_results = st.sidebar.toggle("Reuse earlier results", value=True, help="Show this session's earlier result for the same inputs and model at once; turn off to generate again.")
+
+    # Generations run on a worker pool shared by every session, so reruns do not interrupt them
+    jobs = get_job_queue()
+
+    if st.button("Generate Itinerary") or edits:
+        # Built for this request alone, so concurrent requests never share per-run state
+        researcher, planner = page.assistants(BUILDERS, STAGES)
+        # Built here, on the script thread; the job only calls it
+        if page.routed:
+            make_day_planner = routed_day_planner_factory(hedge=page.hedge)
+        else:
+            make_day_planner = day_planner_factory(*page.backends[page.backend])
+
+        # This session's earlier generations, summarized and capped, in place of phi's chat history
+        conversation = get_conversation(page.model) if wants_history(planner) else None
+
+        def plan_trip(job):
+            if trip is not None and page.use_research_cache:
+                # Same destination as earlier in this session: its research still applies
+                research_results = trip[0]
+                job.caption("Research loaded from cache.")
+            else:
+                research_results = page.research(job, researcher, (destination, num_days), f"Searche for travel destinations, activities, and accommodations in '{destination}' for '{num_days}' days")
+
+            # Get the response from the assistant, rewriting only the days that changed since the last itinerary
+            prompt = f"Plan a trip for {destination} for {num_days} days, using the following research:\n\n"
+            # With reuse off every day is planned again, unless one day is being changed
+            previous = trip[1] if trip is not None and (reuse_results or edits) else None
+            trip_planner = planner
+            if parallel_days and (num_days > DAYS_PER_BLOCK or previous is not None):
+                trip_planner = ParallelDayPlanner(make_day_planner, num_days, max_workers=max_parallel_days, previous=previous, edits=edits)
+            # Earlier itineraries for the same destination; day planners work from the skeleton instead
+            history = conversation.context(destination) if conversation is not None and trip_planner is planner else ""
+            fitted = ContextBudget(page.model, page.prompt_budget).fit(research_results, request=destination, prompt_overhead=system_prompt(planner) + history + prompt)
+            response = job.run(trip_planner, history + prompt + fitted.text, stream=page.stream_output)
+            if conversation is not None:
+                conversation.add(destination, f"{num_days}-day trip to {destination}", response)
+            if parallel_days:
+                trips.put(trip_key, (research_results, trip_planner.plan if trip_planner is not planner else plan_from_itinerary(response, num_days)))
+            job.caption(fitted.summary(page.prompt_budget))
+            return response
+
+        # An updated day is a new itinerary, never an earlier one
+        start_job(jobs, "Update day" if edits else "Generate Itinerary", plan_trip, key=None if edits else input_key(page.model, destination, num_days), reuse=reuse_results)
+
+    page.render_footer(jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Assistant factory for the YouTube Video apps.
+
+Building an ``Assistant`` also builds its LLM client and tool clients. Streamlit
+reruns the app script on every widget interaction, so the apps ask this module
+for their assistants instead of constructing them at the top of the script.
+
+phi, the provider SDKs and the YouTube and DuckDuckGo tools are imported by the
+functions that build assistants, not by this module, so an app draws its first
+page without them and a process only loads the providers it serves. The
+launcher passes ``PRELOAD_MODULES`` to ``shared.backends.preload``, which
+imports them on a background thread while the first user is still typing.
+
+This module keeps the app's prompts; ``shared.app_assistants`` builds and
+routes the assistants the same way for every app.
+"""
+from textwrap import dedent
+
+from long_summary import CHUNK_DESCRIPTION, CHUNK_INSTRUCTIONS
+from shared import app_assistants
+from tool_memo import memoize_toolkit
+
+APP = "youtube-video"
+
+# Imported in the background before the first request (see ``shared.backends.preload``).
+PRELOAD_MODULES = ("phi.assistant", "phi.tools.duckduckgo", "phi.tools.youtube_tools", "youtube_transcript_api")
+
+
+def _build_gpt4o(api_key):
+    from phi.assistant import Assistant
+    from phi.llm.openai import OpenAIChat
+    from phi.tools.duckduckgo import DuckDuckGo
+    from phi.tools.youtube_tools import YouTubeTools
+
+    # First agent to fetch video captions
+    caption_fetcher = Assistant(
+        name="CaptionFetcher",
+        role="Fetches captions from YouTube videos",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+        You are a Youtube Agent that fetches captions from YouTube videos. Given a YouTube video URL, fetch its captions for further analysis. 
+        The captions can be in any language. Don't ask for any confirmation, just give me the captions.
+        """
+        ),
+        instructions=[
+            "No matter what is the captions langauge, Fetch the captions from the given YouTube video URL.",
+        ],
+        tools=[memoize_toolkit(YouTubeTools()), memoize_toolkit(DuckDuckGo())],
+        add_datetime_to_instructions=True,
+        show_tool_calls=True,
+        get_video_captions = True,
+    )
+
+    # Second agent to summarize the captions with a focus on quality and details
+    summarizer = Assistant(
+        name="Summarizer",
+        role="Summarizes YouTube video captions in detail",
+        llm=OpenAIChat(model="gpt-4o", api_key=api_key),
+        description=dedent(
+            """\
+        You are an AI that summarizes YouTube video captions in a detailed and insightful way. Given the captions from a YouTube video, 
+        provide a detailed summary that includes the main ideas, key points, and insights from the video. Structure the summary to make it 
+        informative, covering all key elements and giving a clear overview of the video's content. Focus on making the summary easy to understand 
+        while providing enough depth to convey the value of the video.
+        """
+        ),
+        instructions=[
+            "Analyze the captions from the YouTube video and summarize the main ideas and key points in a detailed manner.",
+            "Ensure that the summary includes any important insights, examples, or lessons from the video.",
+            "Provide a structured summary that highlights the main themes and conclusions.",
+            "Focus on clarity, coherence, and detail in your summary.",
+        ],
+        add_datetime_to_instructions=True,
+    )
+    return caption_fetcher, summarizer
+
+
+def _build_llama(api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+    from phi.tools.duckduckgo import DuckDuckGo
+    from phi.tools.youtube_tools import YouTubeTools
+
+    # First agent to fetch video captions
+    caption_fetcher = Assistant(
+        name="CaptionFetcher",
+        role="Fetches captions from YouTube videos",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are a Youtube Agent that fetches captions from YouTube videos. Given a YouTube video URL, fetch its captions for further analysis. 
+        The captions can be in any language. Don't ask for any confirmation, just give me the captions.
+        """
+        ),
+        instructions=[
+            "No matter what is the captions langauge, Fetch the captions from the given YouTube video URL.",
+        ],
+        tools=[memoize_toolkit(YouTubeTools()), memoize_toolkit(DuckDuckGo())],
+        add_datetime_to_instructions=True,
+        show_tool_calls=True,
+        get_video_captions = True,
+    )
+
+    # Second agent to summarize the captions with a focus on quality and details
+    summarizer = Assistant(
+        name="Summarizer",
+        role="Summarizes YouTube video captions in detail",
+        llm=Groq(model="llama-3.3-70b-versatile", api_key=api_key),
+        description=dedent(
+            """\
+        You are an AI that summarizes YouTube video captions in a detailed and insightful way. Given the captions from a YouTube video, 
+        provide a detailed summary that includes the main ideas, key points, and insights from the video. Structure the summary to make it 
+        informative, covering all key elements and giving a clear overview of the video's content. Focus on making the summary easy to understand 
+        while providing enough depth to convey the value of the video.
+        """
+        ),
+        instructions=[
+            "Analyze the captions from the YouTube video and summarize the main ideas and key points in a detailed manner.",
+            "Ensure that the summary includes any important insights, examples, or lessons from the video.",
+            "Provide a structured summary that highlights the main themes and conclusions.",
+            "Focus on clarity, coherence, and detail in your summary.",
+        ],
+        add_datetime_to_instructions=True,
+    )
+    return caption_fetcher, summarizer
+
+
+def _build_gemini(api_key):
+    from phi.assistant import Assistant
+    from phi.llm.google import Gemini
+    from phi.tools.duckduckgo import DuckDuckGo
+    from phi.tools.youtube_tools import YouTubeTools
+
+    # First agent to fetch video captions
+    caption_fetcher = Assistant(
+        name="CaptionFetcher",
+        role="Fetches captions from YouTube videos",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are a Youtube Agent that fetches captions from YouTube videos. Given a YouTube video URL, fetch its captions for further analysis. 
+        The captions can be in any language. Don't ask for any confirmation, just give me the captions.
+        """
+        ),
+        instructions=[
+            "No matter what is the captions langauge, Fetch the captions from the given YouTube video URL.",
+        ],
+        tools=[memoize_toolkit(YouTubeTools()), memoize_toolkit(DuckDuckGo())],
+        add_datetime_to_instructions=True,
+        show_tool_calls=True,
+        get_video_captions = True,
+    )
+
+    # Second agent to summarize the captions with a focus on quality and details
+    summarizer = Assistant(
+        name="Summarizer",
+        role="Summarizes YouTube video captions in detail",
+        llm=Gemini(model="gemini-1.5-flash", api_key=api_key),
+        description=dedent(
+            """\
+        You are an AI that summarizes YouTube video captions in a detailed and insightful way. Given the captions from a YouTube video, 
+        provide a detailed summary that includes the main ideas, key points, and insights from the video. Structure the summary to make it 
+        informative, covering all key elements and giving a clear overview of the video's content. Focus on making the summary easy to understand 
+        while providing enough depth to convey the value of the video.
+        """
+        ),
+        instructions=[
+            "Analyze the captions from the YouTube video and summarize the main ideas and key points in a detailed manner.",
+            "Ensure that the summary includes any important insights, examples, or lessons from the video.",
+            "Provide a structured summary that highlights the main themes and conclusions.",
+            "Focus on clarity, coherence, and detail in your summary.",
+        ],
+        add_datetime_to_instructions=True,
+    )
+    return caption_fetcher, summarizer
+
+
+def _build_mixtral(api_key):
+    from phi.assistant import Assistant
+    from phi.llm.groq import Groq
+    from phi.tools.duckduckgo import DuckDuckGo
+    from phi.tools.youtube_tools import YouTubeTools
+
+    # First agent to fetch video captions
+    caption_fetcher = Assistant(
+        name="CaptionFetcher",
+        role="Fetches captions from YouTube videos",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are an AI that fetches captions from YouTube videos. Given a YouTube video URL, fetch its captions for further analysis.
+        The captions can be in any language. Don't ask for any confirmation, just give me the captions.
+        """
+        ),
+        instructions=[
+            "Fetch the captions from the given YouTube video URL.",
+        ],
+        tools=[memoize_toolkit(YouTubeTools()), memoize_toolkit(DuckDuckGo())],
+        add_datetime_to_instructions=True,
+        get_video_captions = True,
+    )
+
+    # Second agent to summarize the captions with a focus on quality and details
+    summarizer = Assistant(
+        name="Summarizer",
+        role="Summarizes YouTube video captions in detail",
+        llm=Groq(model="mixtral-8x7b-32768", api_key=api_key),
+        description=dedent(
+            """\
+        You are an AI that summarizes YouTube video captions in a detailed and insightful way. Given the captions from a YouTube video, 
+        provide a detailed summary that includes the main ideas, key points, and insights from the video. Structure the summary to make it 
+        informative, covering all key elements and giving a clear overview of the video's content. Focus on making the summary easy to understand 
+        while providing enough depth to convey the value of the video.
+        """
+        ),
+        instructions=[
+            "Analyze the captions from the YouTube video and summarize the main ideas and key points in a detailed manner.",
+            "Ensure that the summary includes any important insights, examples, or lessons from the video.",
+            "Provide a structured summary that highlights the main themes and conclusions.",
+            "Focus on clarity, coherence, and detail in your summary.",
+        ],
+        add_datetime_to_instructions=True,
+    )
+    return caption_fetcher, summarizer
+
+
+# phi, the provider SDK and the tools are imported inside each builder so an app only loads its own.
+BUILDERS = {
+    ("openai", "gpt-4o"): _build_gpt4o,
+    ("groq", "llama-3.3-70b-versatile"): _build_llama,
+    ("google", "gemini-1.5-flash"): _build_gemini,
+    ("groq", "mixtral-8x7b-32768"): _build_mixtral,
+}
+
+
+def build_assistants(provider: str, model_id: str, api_key: str):
+    """Build a new (caption_fetcher, summarizer) pair without caching.
+
+    For callers outside Streamlit that need assistants of their own, e.g. one
+    pair per batch item so concurrent items never share per-run state.
+    """
+    return app_assistants.build_assistants(BUILDERS, provider, model_id, api_key)
+
+
+def chunk_summarizer_factory(provider: str, model_id: str, api_key: str):
+    """Return a function that builds a tool-free assistant for one transcript chunk."""
+    return app_assistants.part_factory(
+        BUILDERS,
+        provider,
+        model_id,
+        api_key,
+        name="ChunkSummarizer",
+        role="Summarizes one part of a long YouTube video transcript",
+        description=CHUNK_DESCRIPTION,
+        instructions=CHUNK_INSTRUCTIONS,
+    )
+
+
+def build_routed_assistants(hedge: bool = False):
+    """Build (caption_fetcher, summarizer) that route every run across all backends with an API key set."""
+    return app_assistants.build_routed_assistants(APP, BUILDERS, ("captions", "summarize"), hedge=hedge)
+
+
+def routed_chunk_summarizer_factory(hedge: bool = False):
+    """Like ``chunk_summarizer_factory``, but every chunk is routed across all backends."""
+    return app_assistants.routed_part_factory(APP, BUILDERS, "chunk", chunk_summarizer_factory, hedge=hedge)
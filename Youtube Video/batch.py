@@ -0,0 +1,90 @@
+"""Summarize YouTube videos in bulk, without the Streamlit UI.
+
+Each input row needs ``video_url``; an optional ``id`` names the row in the
+output. Every row runs the same pipeline as the apps (direct captions with the
+CaptionFetcher as fallback, map-reduce for long transcripts, then the
+summarizer), sharing their transcript store, and its result is appended to the
+output JSONL as soon as it finishes. Rerun the same command to resume after a
+crash.
+
+Usage:
+    python batch.py videos.jsonl summaries.jsonl [--model llama-3.3-70b-versatile] [--workers 4]
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import BUILDERS, build_assistants, chunk_summarizer_factory  # noqa: E402
+from captions import fetch_captions  # noqa: E402
+from long_summary import MapReduceSummarizer, default_chunk_tokens  # noqa: E402
+from shared.batch_runner import argument_parser, configure_logging, provider_and_key, read_inputs, run_batch  # noqa: E402
+from tool_memo import ToolCallMemo  # noqa: E402
+
+FIELDS = ("video_url",)
+
+
+def make_pipeline(provider: str, model_id: str, api_key: str, direct_captions: bool = True,
+                  chunk_tokens: Optional[int] = None, max_parallel: int = 4):
+    """Return a function that turns one input row into a video summary."""
+    chunk_tokens = chunk_tokens or default_chunk_tokens(model_id)
+    make_chunk_summarizer = chunk_summarizer_factory(provider, model_id, api_key)
+
+    def summarize(item: dict) -> dict:
+        video_url = item["video_url"]
+        # phi assistants keep per-run state, so every concurrent item gets its own.
+        caption_fetcher, summarizer = build_assistants(provider, model_id, api_key)
+        timings = {}
+        started = time.perf_counter()
+        with ToolCallMemo(f"batch {item['id']}"):
+            captions = fetch_captions(video_url) if direct_captions else None
+            if captions is not None:
+                caption_results = captions.text
+            else:
+                caption_results = caption_fetcher.run(f"Youtube Video Link : {video_url}", stream=False)
+            timings["captions"] = round(time.perf_counter() - started, 3)
+
+            summary_prompt = f"Summarize the youtube video : {video_url} using the following caption data of the video : \n\n{caption_results}"
+            long_summarizer = MapReduceSummarizer(make_chunk_summarizer, chunk_tokens=chunk_tokens, max_workers=max_parallel)
+            chunks = 0
+            if long_summarizer.needs_condensing(caption_results):
+                condensed = long_summarizer.condense(caption_results, video_url)
+                chunks = condensed.chunks
+                timings["condense"] = round(condensed.seconds, 3)
+                summary_prompt = f"Summarize the youtube video : {video_url} using the following section summaries of its captions, in order : \n\n{condensed.text}"
+
+            summarizing = time.perf_counter()
+            summary = summarizer.run(summary_prompt, stream=False)
+            timings["summarize"] = round(time.perf_counter() - summarizing, 3)
+        return {"direct_captions": captions is not None, "chunks": chunks, "timings": timings, "summary": summary}
+
+    return summarize
+
+
+def main() -> None:
+    parser = argument_parser(__doc__, BUILDERS)
+    parser.add_argument("--no-direct-captions", action="store_true", help="always fetch captions through the CaptionFetcher")
+    parser.add_argument("--chunk-tokens", type=int, help="transcript chunk size in tokens (default depends on the model)")
+    parser.add_argument("--max-parallel", type=int, default=4, help="parallel chunk summaries per video")
+    args = parser.parse_args()
+    configure_logging(args.verbose)
+
+    provider, api_key = provider_and_key(args.model, BUILDERS)
+    summarize = make_pipeline(
+        provider,
+        args.model,
+        api_key,
+        direct_captions=not args.no_direct_captions,
+        chunk_tokens=args.chunk_tokens,
+        max_parallel=args.max_parallel,
+    )
+    print(run_batch(read_inputs(args.inputs, FIELDS), summarize, args.output, workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Fetch YouTube captions directly instead of through the CaptionFetcher assistant.
+
+The CaptionFetcher assistant calls ``YouTubeTools`` and then writes the whole
+transcript back out as generated text, which costs a full model round trip and
+one output token per transcript token, and can truncate long transcripts.
+``fetch_captions`` downloads the caption lines with the same library the tool
+uses and returns the transcript as-is. Transcripts are kept in the local
+transcript store, so a video that was summarized before is not fetched again.
+"""
+import logging
+import time
+from typing import NamedTuple, Optional
+
+from shared.telemetry import record_cache, span
+from shared.tokens import estimate_tokens
+from transcript_store import canonical_video_id, download_segments, get_transcript_store
+
+logger = logging.getLogger(__name__)
+
+
+class Captions(NamedTuple):
+    video_id: str
+    text: str
+    seconds: float
+    stored: bool
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def fetch_captions(url: str) -> Optional[Captions]:
+    """Return the video's transcript, or None when it has no usable captions."""
+    with span("captions"):
+        started = time.perf_counter()
+        video_id = canonical_video_id(url)
+        if not video_id:
+            return None
+        store = get_transcript_store()
+        transcript = store.get(video_id)
+        stored = transcript is not None
+        record_cache("transcript", "hit" if stored else "miss")
+        if not stored:
+            try:
+                lines = download_segments(video_id)
+            except Exception as e:
+                # The CaptionFetcher round trip takes over, so say why it was needed.
+                logger.warning("direct captions unavailable for %s: %s: %s", video_id, type(e).__name__, e)
+                return None
+            if not lines:
+                return None
+            transcript = store.put(video_id, lines)
+        captions = Captions(video_id, transcript.text, time.perf_counter() - started, stored)
+        logger.info(
+            "direct captions for %s: %.2fs, ~%d tokens, %s",
+            video_id, captions.seconds, captions.tokens, "from store" if stored else "downloaded",
+        )
+        return captions
+
+
+def savings_note(captions: Captions) -> str:
+    source = "loaded from the transcript store" if captions.stored else "fetched directly"
+    # The assistant would have read the transcript as a tool result and then written it out again.
+    return (
+        f"Captions {source} in {captions.seconds:.2f}s, skipping the CaptionFetcher round trip "
+        f"(~{captions.tokens:,} output and ~{captions.tokens:,} input tokens saved)."
+    )
@@ -0,0 +1,156 @@
+"""The YouTube Video Summarizer app for every backend, picked when the app runs.
+
+``app.py`` to ``app4.py`` were one script five times over, one per backend and
+one routed across all of them, and each imported phi and its tools before
+drawing anything. ``main`` is that script once, serving one ``"provider/model"``
+backend or ``"routed"``: the backend it is given (the old scripts each pin
+theirs), else ``APP_BACKEND``, else the user's pick in the sidebar among the
+backends with an API key set. Its first page needs only Streamlit and this
+repo's own modules. phi, the chosen backend's SDK and the YouTube tools are
+preloaded on a background thread and every request builds its own assistants
+(see ``assistants``).
+
+    streamlit run launcher.py
+"""
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+
+# The modules every app shares are in ../shared
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assistants import (  # noqa: E402
+    APP,
+    BUILDERS,
+    PRELOAD_MODULES,
+    build_assistants,
+    build_routed_assistants,
+    chunk_summarizer_factory,
+    routed_chunk_summarizer_factory,
+)
+from captions import fetch_captions, savings_note  # noqa: E402
+from long_summary import MapReduceSummarizer, default_chunk_tokens  # noqa: E402
+from shared.backends import preload  # noqa: E402
+from shared.jobs import current_job, get_job_queue, render_history, render_job, start_job  # noqa: E402
+from shared.rate_limit import get_limiter  # noqa: E402
+from shared.router import API_KEY_ENV, ROUTED, get_router, pick_backend, serving_backends  # noqa: E402
+from shared.session_memo import input_key  # noqa: E402
+from shared.telemetry import render_trace, start_metrics_server  # noqa: E402
+from tool_memo import ToolCallMemo  # noqa: E402
+
+
+def main(backend: Optional[str] = None) -> None:
+    # Serve Prometheus metrics on METRICS_PORT, if set (once per process)
+    start_metrics_server()
+
+    # Set up the Streamlit app
+    st.title("YouTube Video Summarizer 🎥")
+
+    backend = pick_backend(BUILDERS, backend)
+    routed = backend == ROUTED
+    backends = serving_backends(BUILDERS, backend)
+    models = [model_id for _, model_id, _ in backends.values()]
+    # Routed results are kept under the router, whichever backend produced them
+    model = ROUTED if routed else backend.split("/", 1)[1]
+    if routed:
+        st.caption("Summarize YouTube videos in a more insightful and detailed manner, with each step sent to the fastest available model!")
+    else:
+        st.caption(f"Summarize YouTube videos in a more insightful and detailed manner with {backend}!")
+
+    if not backends:
+        needed = "an API key of any backend" if routed else API_KEY_ENV[backend.split("/", 1)[0]]
+        st.info(f"Set {needed} to start summarizing.")
+        return
+
+    # phi and this backend's SDK load in the background while the page is in use
+    preload(PRELOAD_MODULES, tuple(sorted({provider for provider, _, _ in backends.values()})))
+
+    # Stream the second stage so output shows up while it is being generated
+    stream_output = st.sidebar.toggle("Stream output", value=True, help="Show tokens as they arrive instead of waiting for the full response.")
+
+    # Read the transcript with the YouTube tool code instead of having a model repeat it
+    direct_captions = st.sidebar.toggle("Direct caption extraction", value=True, help="Fetch the transcript without the CaptionFetcher model round trip.")
+
+    # Race a second backend when the first one is slower than usual
+    hedge = routed and st.sidebar.toggle("Hedge slow requests", value=False, help="When a step takes longer than its backend's p95 latency, send it to the next backend too and use the first answer. Streamed output is never hedged.")
+
+    # Long transcripts are summarized in parallel chunks, then merged; chunks must fit every backend
+    chunk_tokens = st.sidebar.number_input("Chunk size (tokens)", min_value=1000, max_value=200000, value=min(default_chunk_tokens(model_id) for model_id in models), step=1000, help="Transcripts longer than this are summarized in parts first.")
+    max_parallel = st.sidebar.slider("Parallel chunk summaries", min_value=1, max_value=16, value=4)
+
+    # Input field for YouTube video URL
+    video_url = st.text_input("Enter YouTube video URL:")
+
+    # A repeat request shows this session's earlier result instead of generating it again
+    reuse_results = st.sidebar.toggle("Reuse earlier results", value=True, help="Show this session's earlier result for the same inputs and model at once; turn off to generate again.")
+
+    # Generations run on a worker pool shared by every session, so reruns do not interrupt them
+    jobs = get_job_queue()
+
+    if st.button("Summarize Video"):
+        # Built for this request alone, so concurrent requests never share per-run state
+        if routed:
+            caption_fetcher, summarizer = build_routed_assistants(hedge=hedge)
+            # Built here, on the script thread; the job only calls it
+            make_chunk_summarizer = routed_chunk_summarizer_factory(hedge=hedge)
+        else:
+            provider, model_id, api_key = backends[backend]
+            caption_fetcher, summarizer = build_assistants(provider, model_id, api_key)
+            make_chunk_summarizer = chunk_summarizer_factory(provider, model_id, api_key)
+
+        def summarize_video(job):
+            # Assistants in this run share one memo, so identical tool calls only hit the network once
+            with ToolCallMemo("youtube summary") as tool_memo:
+                captions = None
+                if direct_captions:
+                    job.set_stage("Fetching captions...")
+                    captions = fetch_captions(video_url)
+                if captions is not None:
+                    caption_results = captions.text
+                    job.caption(savings_note(captions))
+                else:
+                    # No direct captions (or direct mode is off): let the CaptionFetcher assistant try
+                    job.set_stage("Fetching captions...")
+                    started = time.perf_counter()
+                    caption_results = caption_fetcher.run(f"Youtube Video Link : {video_url}", stream=False)
+                    on = f" on {caption_fetcher.last_backend}" if routed else ""
+                    job.caption(f"Captions fetched by CaptionFetcher{on} in {time.perf_counter() - started:.2f}s.")
+
+                summary_prompt = f"Summarize the youtube video : {video_url} using the following caption data of the video : \n\n{caption_results}"
+                long_summarizer = MapReduceSummarizer(make_chunk_summarizer, chunk_tokens=chunk_tokens, max_workers=max_parallel)
+                if long_summarizer.needs_condensing(caption_results):
+                    job.set_stage("Summarizing the transcript in parts...")
+                    condensed = long_summarizer.condense(caption_results, video_url)
+                    job.caption(f"Long transcript: {condensed.chunks} chunks summarized in parallel, {condensed.levels} merge levels, {condensed.calls} calls in {condensed.seconds:.1f}s.")
+                    summary_prompt = f"Summarize the youtube video : {video_url} using the following section summaries of its captions, in order : \n\n{condensed.text}"
+
+                # Pass the captions to the second agent (Summarizer) for summarization
+                summary = job.run(summarizer, summary_prompt, stream=stream_output, stage="Summarizing...")
+            if tool_memo.calls or tool_memo.avoided:
+                job.caption(tool_memo.summary())
+            return summary
+
+        start_job(jobs, "Summarize Video", summarize_video, key=input_key(model, video_url), reuse=reuse_results)
+
+    # This session's current job, shown on every rerun until it expires
+    render_job(current_job(jobs))
+    render_history()
+
+    st.sidebar.caption(jobs.summary())
+    if routed:
+        for line in get_router(APP).summary():
+            st.sidebar.caption(line)
+    for provider, model_id, _ in backends.values():
+        st.sidebar.caption(get_limiter(provider, model_id).summary())
+
+    # Where the time and tokens of this session's last run went
+    render_trace(st.session_state.get("last_trace"))
+
+
+if __name__ == "__main__":
+    main()
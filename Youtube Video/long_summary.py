@@ -0,0 +1,155 @@
+"""Map-reduce summarization for transcripts too long for one summarizer prompt.
+
+A multi-hour video does not fit the context window of the 32k Groq models, and
+even where it fits, one pass over it is slow. ``MapReduceSummarizer`` splits
+the transcript on token budgets with some overlap, summarizes the chunks in
+parallel with bounded concurrency, then merges the partial summaries in
+parallel groups, level by level, until they fit one prompt. The summarizer
+assistant writes the final summary from those notes.
+
+Every chunk call gets a new assistant from ``make_assistant``: phi assistants
+keep per-run state, so one instance must not serve several threads at once.
+"""
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple
+
+from shared.telemetry import span
+from shared.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Largest transcript chunk sent in one call, per model. Kept well below each
+# context window so the prompt and the partial summary fit next to it.
+DEFAULT_CHUNK_TOKENS = {
+    "gpt-4o": 16000,
+    "llama-3.3-70b-versatile": 8000,
+    "mixtral-8x7b-32768": 8000,
+    "gemini-1.5-flash": 32000,
+}
+
+CHUNK_DESCRIPTION = (
+    "You summarize one part of a long YouTube video transcript. "
+    "The partial summaries are combined into a summary of the whole video later."
+)
+CHUNK_INSTRUCTIONS = [
+    "Capture the main ideas, key points, examples and lessons of this part in detail and in order.",
+    "Do not add an introduction or a conclusion, and do not mention that this is a partial summary.",
+    "Never make up facts that are not in the text.",
+]
+
+
+class Condensed(NamedTuple):
+    text: str
+    chunks: int
+    levels: int
+    calls: int
+    seconds: float
+
+
+def default_chunk_tokens(model_id: str) -> int:
+    return DEFAULT_CHUNK_TOKENS.get(model_id, 8000)
+
+
+def split_transcript(text: str, chunk_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """Split ``text`` on word boundaries into chunks of at most ``chunk_tokens`` tokens.
+
+    Consecutive chunks share about ``overlap_tokens`` tokens so ideas that cross
+    a boundary are seen whole by at least one chunk.
+    """
+    max_chars = int(chunk_tokens * CHARS_PER_TOKEN)
+    overlap_chars = int(overlap_tokens * CHARS_PER_TOKEN)
+    words = text.split()
+    chunks, start = [], 0
+    while start < len(words):
+        end, size = start, 0
+        while end < len(words) and (end == start or size + len(words[end]) + 1 <= max_chars):
+            size += len(words[end]) + 1
+            end += 1
+        chunks.append(" ".join(words[start:end]))
+        if end >= len(words):
+            break
+        back, overlap = end, 0
+        while back > start + 1 and overlap < overlap_chars:
+            back -= 1
+            overlap += len(words[back]) + 1
+        start = back
+    return chunks
+
+
+def pack(parts: List[str], budget: int) -> List[List[str]]:
+    """Group consecutive ``parts`` so each group stays within ``budget`` tokens."""
+    groups, current, size = [], [], 0
+    for part in parts:
+        tokens = estimate_tokens(part)
+        if current and size + tokens > budget:
+            groups.append(current)
+            current, size = [], 0
+        current.append(part)
+        size += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+class MapReduceSummarizer:
+    def __init__(
+        self,
+        make_assistant: Callable[[], object],
+        chunk_tokens: int = 8000,
+        overlap_tokens: int = 200,
+        max_workers: int = 4,
+        max_levels: int = 4,
+    ):
+        self.make_assistant = make_assistant
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.max_workers = max_workers
+        self.max_levels = max_levels
+
+    def needs_condensing(self, transcript: str) -> bool:
+        return estimate_tokens(transcript) > self.chunk_tokens
+
+    def _run(self, prompt: str) -> str:
+        return self.make_assistant().run(prompt, stream=False)
+
+    def _map(self, prompts: List[str]) -> List[str]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Each chunk runs in a copy of this context, so its span joins the run's trace.
+            futures = [pool.submit(contextvars.copy_context().run, self._run, prompt) for prompt in prompts]
+            return [future.result() for future in futures]
+
+    def condense(self, transcript: str, video_url: str = "") -> Condensed:
+        """Reduce ``transcript`` to ordered section notes that fit in one chunk."""
+        with span("condense") as current:
+            started = time.perf_counter()
+            chunks = split_transcript(transcript, self.chunk_tokens, self.overlap_tokens)
+            partials = self._map(
+                [
+                    f"Summarize part {i} of {len(chunks)} of the captions of the YouTube video {video_url}:\n\n{chunk}"
+                    for i, chunk in enumerate(chunks, 1)
+                ]
+            )
+            calls, levels = len(chunks), 0
+            while len(partials) > 1 and estimate_tokens("\n\n".join(partials)) > self.chunk_tokens and levels < self.max_levels:
+                groups = pack(partials, self.chunk_tokens)
+                partials = self._map(
+                    [
+                        "Combine these consecutive partial summaries of the YouTube video "
+                        f"{video_url} into one detailed summary that keeps every key point in order:\n\n" + "\n\n".join(group)
+                        for group in groups
+                    ]
+                )
+                calls += len(groups)
+                levels += 1
+
+            notes = "\n\n".join(f"Section {i}:\n{partial}" for i, partial in enumerate(partials, 1))
+            condensed = Condensed(notes, len(chunks), levels, calls, time.perf_counter() - started)
+            logger.info(
+                "map-reduce: %d chunks, %d reduce levels, %d calls, %.2fs",
+                condensed.chunks, condensed.levels, condensed.calls, condensed.seconds,
+            )
+            current.attrs.update(chunks=condensed.chunks, levels=condensed.levels)
+            return condensed
@@ -0,0 +1,72 @@
+"""Run-scoped memoization of tool calls.
+
+Within one pipeline execution the assistants can ask for the same tool call
+more than once, e.g. fetching the captions of the same video again. Toolkits
+wrapped with ``memoize_toolkit`` look up the active ``ToolCallMemo``: inside a
+``with ToolCallMemo():`` block, an identical call (same function, same
+arguments) returns the result of the first one instead of hitting the network
+again. Outside such a block the tools behave as before, so results are never
+shared between runs or sessions.
+"""
+import contextvars
+import functools
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_active_memo: contextvars.ContextVar = contextvars.ContextVar("active_tool_call_memo", default=None)
+
+
+class ToolCallMemo:
+    def __init__(self, name: str = "run"):
+        self.name = name
+        self.calls = 0
+        self.avoided = 0
+        self._results: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> "ToolCallMemo":
+        self._token = _active_memo.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _active_memo.reset(self._token)
+        logger.info("%s: %d tool calls made, %d duplicate calls avoided", self.name, self.calls, self.avoided)
+
+    def call(self, name: str, entrypoint: Callable, args: tuple, kwargs: dict) -> Any:
+        key = (name, json.dumps([args, kwargs], sort_keys=True, default=str))
+        with self._lock:
+            if key in self._results:
+                self.avoided += 1
+                logger.debug("%s: reusing result of %s%s", self.name, name, kwargs or args)
+                return self._results[key]
+        result = entrypoint(*args, **kwargs)
+        with self._lock:
+            self._results[key] = result
+            self.calls += 1
+        return result
+
+    def summary(self) -> str:
+        return f"Tool calls: {self.calls} made, {self.avoided} duplicates avoided"
+
+
+def _memoized(name: str, entrypoint: Callable) -> Callable:
+    @functools.wraps(entrypoint)
+    def wrapper(*args, **kwargs):
+        memo = _active_memo.get()
+        if memo is None:
+            return entrypoint(*args, **kwargs)
+        return memo.call(name, entrypoint, args, kwargs)
+
+    return wrapper
+
+
+def memoize_toolkit(toolkit):
+    """Route every function of a phi ``Toolkit`` through the active ``ToolCallMemo``."""
+    for name, function in toolkit.functions.items():
+        function.entrypoint = _memoized(name, function.entrypoint)
+    return toolkit
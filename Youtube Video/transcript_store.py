@@ -0,0 +1,195 @@
+"""Local store of YouTube transcripts keyed by canonical video ID.
+
+Popular videos are summarized again and again, and every run used to download
+their captions again. Transcripts are kept in SQLite: the joined text is stored
+zlib-compressed in one row per video, and a segment table indexes every caption
+line by start time with its offset into that text. Only the requested video is
+read and decompressed, so the store scales to thousands of videos without
+loading them into memory, and a time range can be looked up from the index.
+
+Settings come from the environment:
+    TRANSCRIPT_STORE_PATH        SQLite file (default ~/.cache/agentic-ai/transcripts.sqlite3)
+    TRANSCRIPT_STORE_MAX_VIDEOS  videos kept before LRU eviction (default 10000)
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+from typing import Iterable, List, NamedTuple, Optional
+
+import streamlit as st
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "agentic-ai", "transcripts.sqlite3")
+
+_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PATH_PREFIXES = ("shorts", "embed", "live", "v", "e")
+
+
+def canonical_video_id(url: str) -> Optional[str]:
+    """Return the 11-character video ID from any common YouTube URL form, or None.
+
+    Handles watch?v=, youtu.be/, /shorts/, /embed/, /live/ and /v/ links on the
+    www, m., music. and nocookie hosts, with or without a scheme and with extra
+    parameters such as t=, si= or list=. A bare video ID is returned as-is.
+    """
+    url = (url or "").strip()
+    if _VIDEO_ID.match(url):
+        return url
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urllib.parse.urlparse(url)
+    host = (parsed.hostname or "").lower()
+    parts = [part for part in parsed.path.split("/") if part]
+    candidate = None
+    if host == "youtu.be":
+        candidate = parts[0] if parts else None
+    elif host.endswith("youtube.com") or host.endswith("youtube-nocookie.com"):
+        if parts[:1] == ["watch"] or not parts:
+            candidate = urllib.parse.parse_qs(parsed.query).get("v", [None])[0]
+        elif len(parts) >= 2 and parts[0] in _PATH_PREFIXES:
+            candidate = parts[1]
+    if candidate and _VIDEO_ID.match(candidate):
+        return candidate
+    return None
+
+
+class Segment(NamedTuple):
+    start: float
+    duration: float
+    text: str
+
+
+class StoredTranscript(NamedTuple):
+    video_id: str
+    text: str
+    segment_count: int
+
+
+def download_segments(video_id: str) -> List[dict]:
+    """Download caption lines (``text``, ``start``, ``duration``) the way ``YouTubeTools`` does."""
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    return YouTubeTranscriptApi().fetch(video_id).to_raw_data()
+
+
+class TranscriptStore:
+    def __init__(self, path: str = DEFAULT_PATH, max_videos: int = 10000):
+        self.path = path
+        self.max_videos = max_videos
+        self._lock = threading.Lock()
+        # A bare file name is in the working directory, which exists
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT PRIMARY KEY,
+                    text BLOB NOT NULL,
+                    chars INTEGER NOT NULL,
+                    segment_count INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS segments (
+                    video_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    start REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (video_id, seq)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS segments_start ON segments (video_id, start)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS transcripts_accessed_at ON transcripts (accessed_at)")
+
+    def put(self, video_id: str, lines: Iterable[dict]) -> StoredTranscript:
+        """Store caption lines for ``video_id`` and return the joined transcript."""
+        texts, rows, offset = [], [], 0
+        for seq, line in enumerate(lines):
+            text = " ".join(str(line.get("text", "")).split())
+            rows.append((video_id, seq, float(line.get("start", 0)), float(line.get("duration", 0)), offset, len(text)))
+            texts.append(text)
+            offset += len(text) + 1
+        joined = " ".join(texts)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?)",
+                    (video_id, zlib.compress(joined.encode(), 6), len(joined), len(rows), now, now),
+                )
+                self._conn.executemany("INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return StoredTranscript(video_id, joined, len(rows))
+
+    def _evict(self) -> None:
+        stale = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT video_id FROM transcripts ORDER BY accessed_at DESC LIMIT -1 OFFSET ?", (self.max_videos,)
+            )
+        ]
+        for video_id in stale:
+            self._conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+            self._conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+
+    def get(self, video_id: str) -> Optional[StoredTranscript]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, segment_count FROM transcripts WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE transcripts SET accessed_at = ? WHERE video_id = ?", (time.time(), video_id))
+        return StoredTranscript(video_id, zlib.decompress(row[0]).decode(), row[1])
+
+    def segments(self, video_id: str, start: Optional[float] = None, end: Optional[float] = None) -> List[Segment]:
+        """Return the caption lines that overlap ``[start, end)`` seconds, in order."""
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        with self._lock:
+            blob = self._conn.execute("SELECT text FROM transcripts WHERE video_id = ?", (video_id,)).fetchone()
+            rows = self._conn.execute(
+                "SELECT start, duration, offset, length FROM segments "
+                "WHERE video_id = ? AND start < ? AND start + duration > ? ORDER BY seq",
+                (video_id, end, start),
+            ).fetchall()
+        if blob is None:
+            return []
+        text = zlib.decompress(blob[0]).decode()
+        return [Segment(seg_start, duration, text[offset:offset + length]) for seg_start, duration, offset, length in rows]
+
+    def __contains__(self, video_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM transcripts WHERE video_id = ?", (video_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+
+@st.cache_resource(show_spinner=False)
+def get_transcript_store() -> TranscriptStore:
+    """Return the process-wide transcript store shared by every session."""
+    return TranscriptStore(
+        path=os.environ.get("TRANSCRIPT_STORE_PATH", DEFAULT_PATH),
+        max_videos=int(os.environ.get("TRANSCRIPT_STORE_MAX_VIDEOS", 10000)),
+    )
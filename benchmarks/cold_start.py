@@ -0,0 +1,148 @@
+"""Cold start of an app replica: its first page, its first request and its memory.
+
+Starts a fresh Python process per run, as a new replica does, and drives a
+use case's ``launcher.py`` with ``streamlit.testing.v1.AppTest`` against the
+local fake LLM and SerpApi servers. Two ways:
+
+* ``eager``: before the first page, the process imports phi, the search tools,
+  the research index and the backend's SDK and builds the assistants, as every
+  ``app*.py`` script did at the top of its first run;
+* ``lazy``: the launcher as it is: the first page needs none of them, they are
+  preloaded in the background and the assistants are built on the first
+  request.
+
+After the first page the user takes ``--think`` seconds to fill in the form
+(0 measures a request sent the moment the page is up, with the preload still
+running), then one request runs to the end. Reports the median seconds to the
+first page and to the end of the first request, and the process's peak
+memory after each.
+
+Usage:
+    python benchmarks/cold_start.py [--app "Blog Writer"] [--backend groq/llama-3.3-70b-versatile] [--think 0 2] [--runs 3]
+"""
+import argparse
+import importlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The button and the inputs of one request, per use case.
+REQUESTS = {
+    "Blog Writer": ("Generate Blog", ["Remote onboarding", "engineering managers"]),
+    "Linkedin Post Writer": ("Generate LinkedIn Post", ["Remote onboarding", "casual"]),
+    "Travel Agent": ("Generate Itinerary", ["Lisbon"]),
+}
+
+
+def peak_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(app: str, mode: str, think: float) -> dict:
+    """One replica: the first page and the first request, in this process."""
+    started = time.perf_counter()
+    sys.path[:0] = [str(ROOT / app), str(ROOT)]
+    from streamlit.testing.v1 import AppTest
+
+    backend = os.environ["APP_BACKEND"]
+    if mode == "eager":
+        from assistants import PRELOAD_MODULES, build_assistants
+        from shared.backends import PROVIDER_MODULES
+
+        provider, model_id = backend.split("/", 1)
+        for module in [*PRELOAD_MODULES, PROVIDER_MODULES[provider]]:
+            importlib.import_module(module)
+        build_assistants(provider, model_id, "fake-key", "fake-key")
+    at = AppTest.from_file(str(ROOT / app / "launcher.py"), default_timeout=120).run()
+    page = time.perf_counter() - started
+    page_mb = peak_mb()
+
+    time.sleep(think)
+    button, inputs = REQUESTS[app]
+    for widget, value in zip(at.text_input, inputs):
+        widget.input(value)
+    clicked = time.perf_counter()
+    next(b for b in at.button if b.label == button).click().run()
+    from shared.jobs import get_job_queue
+
+    job = get_job_queue().get(at.session_state["job_id"])
+    while not job.done:
+        time.sleep(0.01)
+    if job.error or at.exception:
+        raise RuntimeError(job.error or at.exception)
+    return {
+        "page": page,
+        "request": time.perf_counter() - clicked,
+        "page_mb": page_mb,
+        "request_mb": peak_mb(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="Blog Writer", choices=sorted(REQUESTS), help="use case folder")
+    parser.add_argument("--backend", default="groq/llama-3.3-70b-versatile", help="provider/model the replica serves")
+    parser.add_argument("--think", type=float, nargs="+", default=[0.0, 2.0], help="seconds between the first page and the request")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per mode and think time")
+    parser.add_argument("--child", nargs=3, metavar=("APP", "MODE", "THINK"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        app, mode, think = args.child
+        print(json.dumps(child(app, mode, float(think))))
+        return
+
+    from fake_llm import FakeLLM
+    from fake_serpapi import FakeSerpApi
+
+    with FakeLLM(0.05, 5000, 200) as llm, FakeSerpApi(0.01) as serp, tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            APP_BACKEND=args.backend,
+            OPENAI_BASE_URL=f"{llm.base_url}/v1",
+            GROQ_BASE_URL=llm.base_url,
+            SERPAPI_BASE_URL=serp.base_url,
+            OPENAI_API_KEY="fake-key",
+            GROQ_API_KEY="fake-key",
+            SERPER_API_KEY="fake-key",
+            # The fake backend has no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+
+        def replica(mode: str, think: float, number: int) -> dict:
+            # A research cache of its own, so every replica researches.
+            env["RESEARCH_CACHE_PATH"] = os.path.join(tmp, f"{mode}-{think}-{number}.sqlite3")
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", args.app, mode, str(think)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout
+            return json.loads(output.strip().splitlines()[-1])
+
+        # Warm the OS file cache, so the first measured replica is not slower for it.
+        replica("eager", 0.0, -1)
+        print(f"{args.app}, {args.backend}: median of {args.runs} fresh processes")
+        print(f"{'mode':<6} {'think s':>7} {'page s':>7} {'request s':>9} {'total s':>8} {'page MB':>8} {'peak MB':>8}")
+        for think in args.think:
+            for mode in ("eager", "lazy"):
+                rows = [replica(mode, think, number) for number in range(args.runs)]
+
+                def median(field: str) -> float:
+                    return statistics.median(row[field] for row in rows)
+
+                print(
+                    f"{mode:<6} {think:>7.1f} {median('page'):>7.2f} {median('request'):>9.2f} {median('page') + median('request'):>8.2f} "
+                    f"{median('page_mb'):>8.0f} {median('request_mb'):>8.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Writer prompt size over many generations, with phi's chat history and with ``ConversationMemory``.
+
+Generates ``--generations`` blog posts one after the other with the Blog
+Writer's llama writer against the local fake LLM, cycling through
+``--topics``, two ways:
+
+* ``history``: one writer shared by every generation, as the apps' per-process
+  writer is, replaying its last three messages with phi's
+  ``add_chat_history_to_prompt``;
+* ``memory``: the writer wrapped in ``without_chat_history``, with the
+  session's earlier turns from a ``ConversationMemory`` added only for a
+  topic written about before, summarized and within ``--max-tokens``.
+
+Prints the writer's prompt tokens for every generation and their mean and
+maximum, next to the prompt without any history.
+
+Usage:
+    python benchmarks/conversation.py [--generations 8] [--output-tokens 1500] [--max-tokens 1500]
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from fake_llm import WORDS, FakeLLM
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Blog Writer"))
+sys.path.insert(0, str(ROOT))
+
+PROVIDER, MODEL_ID = "groq", "llama-3.3-70b-versatile"
+RESEARCH = "\n".join(f"{i}. " + " ".join(WORDS[(i + j) % len(WORDS)] for j in range(25)) + "." for i in range(1, 31))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--generations", type=int, default=8, help="posts written one after the other")
+    parser.add_argument("--topics", nargs="+", default=["Remote onboarding", "Kubernetes cost control", "Remote onboarding at scale"], help="topics, cycled through")
+    parser.add_argument("--output-tokens", type=int, default=1500, help="tokens per fake LLM post")
+    parser.add_argument("--max-tokens", type=int, default=1500, help="ConversationMemory cap")
+    args = parser.parse_args()
+
+    with FakeLLM(0.01, 100_000, args.output_tokens) as llm:
+        os.environ.update(
+            GROQ_BASE_URL=llm.base_url,
+            GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "fake-key"),
+            # The fake backend has no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+        from assistants import BUILDERS, build_assistants
+        from shared.conversation import ConversationMemory
+        from shared.telemetry import instrumented
+
+        history_writer = instrumented(BUILDERS[(PROVIDER, MODEL_ID)]("fake-key", "fake-key")[1], PROVIDER, MODEL_ID)
+        memory_writer = build_assistants(PROVIDER, MODEL_ID, "fake-key", "fake-key")[1]
+        memory = ConversationMemory(MODEL_ID, max_tokens=args.max_tokens)
+
+        def prompt(topic: str) -> str:
+            return f"Write a blog on the topic '{topic}' for the audience 'engineering managers' using the following research:\n\n{RESEARCH}"
+
+        llm.reset()
+        memory_writer.run(prompt("A topic never written about"), stream=False)
+        baseline = llm.log[-1].tokens_in
+
+        rows = {"history": [], "memory": []}
+        for number in range(args.generations):
+            topic = args.topics[number % len(args.topics)]
+            history_writer.run(prompt(topic), stream=False)
+            rows["history"].append(llm.log[-1].tokens_in)
+            history = memory.context(topic)
+            post = memory_writer.run(history + prompt(topic), stream=False)
+            memory.add(topic, f"Blog on '{topic}' for 'engineering managers'", post)
+            rows["memory"].append(llm.log[-1].tokens_in)
+
+        print(f"writer prompt tokens per generation (no history: {baseline:,})")
+        print(f"{'mode':<8} " + " ".join(f"{number + 1:>6}" for number in range(args.generations)) + f" {'mean':>7} {'max':>7}")
+        for mode, tokens in rows.items():
+            print(f"{mode:<8} " + " ".join(f"{count:>6,}" for count in tokens) + f" {sum(tokens) / len(tokens):>7,.0f} {max(tokens):>7,}")
+        print(memory.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Local stand-in for the OpenAI and Groq chat completions endpoints.
+
+Speaks the OpenAI wire format, streamed (SSE) or not, which both SDKs use:
+point them at it with ``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1`` and
+``GROQ_BASE_URL=http://127.0.0.1:<port>``. Replies are scripted from the
+request so the apps' pipelines run end to end:
+
+* a request offering ``search_google`` that has no tool results yet gets
+  ``--search-calls`` tool calls back, like a researcher's first turn;
+* a request asking for search terms gets that many lines of terms;
+* a request for a trip skeleton, or more of its days, gets one line per day;
+* with ``--day-tokens`` set, a request to plan a trip, or some of its days,
+  gets ``--day-tokens`` tokens per day;
+* a request for a blog outline gets a title and one line per section;
+* a request for "about N words" gets N words, with words of its own for
+  each numbered section so sections never read as repeats of each other;
+* anything else gets ``--output-tokens`` tokens of text.
+
+Text replies longer than ``--max-output-tokens`` are cut there and finish with
+``length``, like a provider's output limit.
+
+Each reply waits ``--latency`` seconds before the first token and then emits
+``--tokens-per-second``. Every request is logged with its arrival time, tokens
+in and out and tool calls, so a benchmark can attribute them to stages.
+
+Prompts are cached like OpenAI's prompt caching: the tool definitions and
+messages of a request, in order, are matched against the prompts seen before,
+and a shared prefix of at least 1,024 tokens, counted in steps of 128, is
+reported as ``prompt_tokens_details.cached_tokens`` (in the last chunk of a
+stream when the request asks for usage). With ``--prefill-tokens-per-second``
+set, the prompt tokens that were not cached add to the time to first token.
+
+Usage:
+    python benchmarks/fake_llm.py [--port 8766] [--latency 0.3] [--tokens-per-second 400]
+"""
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, NamedTuple, Set
+
+# Close to the average characters per token of the providers' tokenizers.
+CHARS_PER_TOKEN = 4
+# OpenAI caches prompt prefixes of at least 1,024 tokens, in steps of 128 tokens.
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+WORDS = (
+    "research shows teams that adopt the approach early report faster delivery better quality and lower cost "
+    "while experts recommend starting small measuring results and sharing lessons across the organization"
+).split()
+
+
+class LoggedRequest(NamedTuple):
+    at: float
+    model: str
+    stream: bool
+    tokens_in: int
+    tokens_out: int
+    tool_calls: int
+    tokens_cached: int = 0
+
+
+def count_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _content(message: dict) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        content = " ".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def prompt_text(request: dict) -> str:
+    """The request as the provider reads it: tool definitions first, then the messages in order."""
+    tools = json.dumps(request.get("tools") or [], sort_keys=True)
+    return tools + "".join(f"\n<{m.get('role')}>{_content(m)}{json.dumps(m.get('tool_calls') or '')}" for m in request.get("messages") or [])
+
+
+def prefix_hashes(prompt: str) -> List[str]:
+    """Hashes of the prompt's cacheable prefixes, shortest first."""
+    digest, hashes, step = hashlib.sha1(), [], CACHE_STEP_TOKENS * CHARS_PER_TOKEN
+    for start in range(0, len(prompt) - step + 1, step):
+        digest.update(prompt[start:start + step].encode())
+        if start + step >= CACHE_MIN_TOKENS * CHARS_PER_TOKEN:
+            hashes.append(digest.copy().hexdigest())
+    return hashes
+
+
+class FakeLLM:
+    """Threaded fake chat completions server; use as a context manager or call ``start``/``stop``."""
+
+    def __init__(self, latency: float = 0.3, tokens_per_second: float = 400, output_tokens: int = 300,
+                 search_calls: int = 3, port: int = 0, day_tokens: int = 0, max_output_tokens: int = 16384,
+                 prefill_tokens_per_second: float = 0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.search_calls = search_calls
+        self.day_tokens = day_tokens
+        self.max_output_tokens = max_output_tokens
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+        self.log: List[LoggedRequest] = []
+        self._prefixes: Set[str] = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def reset(self, prompt_cache: bool = False) -> None:
+        """Clear the request log, and with ``prompt_cache`` the prompts seen so far."""
+        with self._lock:
+            self.log = []
+            if prompt_cache:
+                self._prefixes.clear()
+
+    def cached_tokens(self, hashes: List[str]) -> int:
+        """Tokens of the longest prefix, of those ``hashes`` stand for, that an earlier prompt shared."""
+        with self._lock:
+            shared = next((i for i, digest in enumerate(hashes) if digest not in self._prefixes), len(hashes))
+        return CACHE_MIN_TOKENS + (shared - 1) * CACHE_STEP_TOKENS if shared else 0
+
+    def remember(self, hashes: List[str]) -> None:
+        with self._lock:
+            self._prefixes.update(hashes)
+
+    def reply(self, request: dict) -> dict:
+        """Return the scripted assistant message (``content`` or ``tool_calls``) for a request."""
+        messages = request.get("messages") or []
+        tools = {tool.get("function", {}).get("name") for tool in request.get("tools") or []}
+        last_user = next((_content(m) for m in reversed(messages) if m.get("role") == "user"), "")
+        topic = " ".join(last_user.split("\n", 1)[0].split()[:6])
+        if "search_google" in tools and not any(m.get("role") == "tool" for m in messages):
+            return {"tool_calls": [
+                {
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {"name": "search_google", "arguments": json.dumps({"query": f"{topic} {i + 1}"})},
+                }
+                for i in range(self.search_calls)
+            ]}
+        terms = re.search(r"Write (\d+) search terms", last_user)
+        if terms:
+            return {"content": "\n".join(f"{topic} angle {i + 1}" for i in range(int(terms.group(1))))}
+        skeleton = re.search(r"skeleton lines of days (\d+)-(\d+)", last_user) or re.search(r"skeleton of the (\d+)-day trip", last_user)
+        if skeleton:
+            first, last = (int(skeleton.group(1)), int(skeleton.group(2))) if skeleton.lastindex == 2 else (1, int(skeleton.group(1)))
+            days = "\n".join(f"Day {day}: area {day % 5 + 1} - {WORDS[day % len(WORDS)]}" for day in range(first, last + 1))
+            return self._limit(days if first > 1 else f"{topic}: a trip across five areas.\n\n{days}")
+        days = re.search(r"itinerary for days (\d+)-(\d+)", last_user) or re.search(r"for (\d+) days", last_user)
+        if days and self.day_tokens:
+            first, last = (int(days.group(1)), int(days.group(2))) if days.lastindex == 2 else (1, int(days.group(1)))
+            return self._limit("\n\n".join(f"### Day {day}\n{self._words(self.day_tokens)}" for day in range(first, last + 1)))
+        outline = re.search(r"outline of the post with (\d+) sections", last_user)
+        if outline:
+            sections = "\n".join(f"Section {i}: Heading {i} - {WORDS[i % len(WORDS)]} and {WORDS[-i % len(WORDS)]}" for i in range(1, int(outline.group(1)) + 1))
+            return self._limit(f"# {topic}\n\n{sections}")
+        words = re.search(r"about (\d+) words", last_user)
+        if words:
+            section = re.search(r"Write section (\d+) of", last_user)
+            suffix = section.group(1) if section else ""
+            heading = f"## Heading {suffix}\n\n" if section and suffix != "1" else ""
+            return self._limit(heading + self._words(int(words.group(1)) / 0.75, suffix))
+        return self._limit(self._words(self.output_tokens))
+
+    @staticmethod
+    def _words(tokens: float, suffix: str = "") -> str:
+        return " ".join(WORDS[i % len(WORDS)] + suffix for i in range(int(tokens * 0.75)))
+
+    def _limit(self, text: str) -> dict:
+        if count_tokens(text) <= self.max_output_tokens:
+            return {"content": text}
+        return {"content": text[: self.max_output_tokens * CHARS_PER_TOKEN], "finish_reason": "length"}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                arrived = time.perf_counter()
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    return self._json({"error": {"message": f"Unknown path {self.path}"}}, 404)
+                message = fake.reply(body)
+                tokens_in = sum(count_tokens(_content(m)) for m in body.get("messages") or [])
+                tokens_in += count_tokens(json.dumps(body.get("tools") or []))
+                text = message.get("content") or ""
+                tokens_out = count_tokens(text) + count_tokens(json.dumps(message.get("tool_calls") or []))
+                hashes = prefix_hashes(prompt_text(body))
+                tokens_cached = min(fake.cached_tokens(hashes), tokens_in)
+                with fake._lock:
+                    fake.log.append(LoggedRequest(
+                        arrived, body.get("model", ""), bool(body.get("stream")), tokens_in, tokens_out,
+                        len(message.get("tool_calls") or []), tokens_cached,
+                    ))
+                prefill = (tokens_in - tokens_cached) / fake.prefill_tokens_per_second if fake.prefill_tokens_per_second else 0
+                time.sleep(fake.latency + prefill)
+                # Like a provider, the prompt is cached once it has been read, not when it arrives.
+                fake.remember(hashes)
+                usage = {
+                    "prompt_tokens": tokens_in, "completion_tokens": tokens_out, "total_tokens": tokens_in + tokens_out,
+                    "prompt_tokens_details": {"cached_tokens": tokens_cached},
+                }
+                base = {"id": "chatcmpl-fake", "created": int(time.time()), "model": body.get("model", "")}
+                finish = message.get("finish_reason") or ("tool_calls" if message.get("tool_calls") else "stop")
+                if not body.get("stream"):
+                    time.sleep(tokens_out / fake.tokens_per_second)
+                    reply = {"role": "assistant", "content": text or None}
+                    if message.get("tool_calls"):
+                        reply["tool_calls"] = message["tool_calls"]
+                    return self._json({
+                        **base,
+                        "object": "chat.completion",
+                        "choices": [{"index": 0, "message": reply, "finish_reason": finish, "logprobs": None}],
+                        "usage": usage,
+                    })
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                if message.get("tool_calls"):
+                    deltas = [{"role": "assistant", "tool_calls": [{"index": i, **call}]} for i, call in enumerate(message["tool_calls"])]
+                else:
+                    deltas = [{"role": "assistant", "content": word + " "} for word in text.split(" ")]
+                for delta in deltas:
+                    time.sleep(count_tokens(json.dumps(delta)) / fake.tokens_per_second)
+                    self._event({**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                self._event({**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": finish}]})
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    self._event({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+            def _event(self, payload: dict) -> None:
+                self.wfile.write(b"data: " + json.dumps(payload).encode() + b"\n\n")
+                self.wfile.flush()
+
+            def _json(self, payload: dict, status: int = 200) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeLLM":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLM":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=400, help="output token rate")
+    parser.add_argument("--output-tokens", type=int, default=300, help="tokens per text reply")
+    parser.add_argument("--day-tokens", type=int, default=0, help="tokens per itinerary day (0: plain text replies)")
+    parser.add_argument("--max-output-tokens", type=int, default=16384, help="longest text reply before it is cut")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0, help="prompt tokens read per second, cached ones free (0: prompts take no time)")
+    args = parser.parse_args()
+    server = FakeLLM(
+        args.latency, args.tokens_per_second, args.output_tokens, port=args.port,
+        day_tokens=args.day_tokens, max_output_tokens=args.max_output_tokens,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+    ).start()
+    print(f"Fake LLM on {server.base_url} (OPENAI_BASE_URL={server.base_url}/v1, GROQ_BASE_URL={server.base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
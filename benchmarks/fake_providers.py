@@ -0,0 +1,56 @@
+"""Local stand-ins for model providers with configurable latency and errors.
+
+``FakeAssistant`` has the ``run(message, stream=False)`` interface of a phi
+``Assistant``. Each call sleeps for a latency drawn from a log-normal
+distribution around ``latency`` (so there is a realistic tail) and fails with
+probability ``error_rate``. Both can be changed while a benchmark runs to
+simulate a provider slowing down or going down.
+"""
+import math
+import random
+import threading
+import time
+from typing import Iterator
+
+
+class ProviderError(Exception):
+    pass
+
+
+class FakeAssistant:
+    def __init__(self, name: str, latency: float, spread: float = 0.3, error_rate: float = 0.0,
+                 scale: float = 1.0, seed: int = 0):
+        self.name = name
+        self.description = f"Fake provider {name}"
+        self.instructions = []
+        self.latency = latency
+        self.spread = spread
+        self.error_rate = error_rate
+        self.scale = scale
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            seconds = self.latency * math.exp(self._random.gauss(0, self.spread))
+            failed = self._random.random() < self.error_rate
+        return seconds, failed
+
+    def run(self, message: str, stream: bool = False):
+        seconds, failed = self._draw()
+        if stream:
+            return self._stream(seconds, failed)
+        time.sleep((seconds / 2 if failed else seconds) * self.scale)
+        if failed:
+            raise ProviderError(f"{self.name}: simulated 500")
+        return f"{self.name}: {message[:40]}"
+
+    def _stream(self, seconds: float, failed: bool) -> Iterator[str]:
+        time.sleep(seconds / 2 * self.scale)
+        if failed:
+            raise ProviderError(f"{self.name}: simulated 500")
+        for word in f"{self.name} answered".split():
+            time.sleep(seconds / 4 * self.scale)
+            yield word + " "
@@ -0,0 +1,102 @@
+"""Local stand-in for the SerpApi ``/search.json`` endpoint.
+
+Returns canned organic results derived from the query after a configurable
+delay and counts the requests it serves. Point the apps or the benchmarks at it
+with ``SERPAPI_BASE_URL=http://127.0.0.1:<port>``.
+
+Usage:
+    python benchmarks/fake_serpapi.py [--port 8765] [--latency 0.8]
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_results(query: str, num: int) -> dict:
+    return {
+        "search_metadata": {"status": "Success"},
+        "organic_results": [
+            {
+                "position": i + 1,
+                "title": f"{query.title()} — result {i + 1}",
+                "link": f"https://example.com/{urllib.parse.quote(query)}/{i + 1}",
+                "snippet": f"Insight {i + 1} about {query}: a short, factual snippet used for offline runs.",
+            }
+            for i in range(num)
+        ],
+        "related_questions": [{"question": f"What is important about {query}?"}],
+    }
+
+
+class FakeSerpApi:
+    """Threaded fake SerpApi server; use as a context manager or call ``start``/``stop``."""
+
+    def __init__(self, latency: float = 0.5, port: int = 0):
+        self.latency = latency
+        self.requests = 0
+        self.queries = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                with fake._lock:
+                    fake.requests += 1
+                    fake.queries.append(params.get("q", ""))
+                time.sleep(fake.latency)
+                if url.path != "/search.json" or not params.get("api_key"):
+                    body, status = {"error": "Invalid request"}, 400
+                else:
+                    body, status = fake_results(params.get("q", ""), int(params.get("num", 10))), 200
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeSerpApi":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeSerpApi":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.8, help="seconds before each response")
+    args = parser.parse_args()
+    server = FakeSerpApi(latency=args.latency, port=args.port)
+    print(f"Fake SerpApi listening on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server._server.server_close()
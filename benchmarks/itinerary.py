@@ -0,0 +1,93 @@
+"""Itinerary planning time for long trips, in one call and with ``ParallelDayPlanner``.
+
+Plans 7, 14 and 30-day trips with the Travel Agent's planner against the local
+fake LLM, from the same canned research, in two modes:
+
+* ``single``: the planner writes the whole trip in one call (the old behaviour);
+* ``parallel``: a skeleton call, then blocks of days written concurrently.
+
+The fake model writes ``--day-tokens`` tokens per day at ``--tokens-per-second``
+and cuts replies at ``--max-output-tokens``, so long single-call trips come
+back incomplete, as they do with real providers. Reports wall-clock seconds,
+LLM calls, output tokens and how many of the days made it into the itinerary.
+
+Then it changes a parallel-planned trip of the first length the way a
+traveller would (one day longer, one day shorter, one day rewritten) and
+reports the same figures for each incremental update next to the full plan.
+
+Usage:
+    python benchmarks/itinerary.py [--days 7 14 30] [--tokens-per-second 200] [--max-parallel 4]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from fake_llm import FakeLLM
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Travel Agent"))
+sys.path.insert(0, str(ROOT))
+
+RESEARCH = "\n".join(f"{i}. Museum, market or viewpoint number {i}, open daily, see https://example.com/{i}" for i in range(1, 11))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 14, 30], help="trip lengths")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="fake LLM output rate per request")
+    parser.add_argument("--day-tokens", type=int, default=250, help="tokens the fake LLM writes per day")
+    parser.add_argument("--max-output-tokens", type=int, default=4096, help="fake LLM output limit per reply")
+    parser.add_argument("--max-parallel", type=int, default=4, help="day blocks written at once")
+    args = parser.parse_args()
+
+    with FakeLLM(args.latency, args.tokens_per_second, day_tokens=args.day_tokens, max_output_tokens=args.max_output_tokens) as llm:
+        os.environ.update(
+            OPENAI_BASE_URL=f"{llm.base_url}/v1",
+            # The fake backend has no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+        from assistants import build_assistants, day_planner_factory
+        from day_planner import ParallelDayPlanner
+
+        print(f"{'days':>4} {'mode':<9} {'wall s':>7} {'calls':>6} {'tokens out':>11} {'days written':>13}")
+        for days in args.days:
+            prompt = f"Plan a trip for Lisbon for {days} days, using the following research:\n\n{RESEARCH}"
+            for mode in ("single", "parallel"):
+                _, planner = build_assistants("openai", "gpt-4o", "fake-key", "fake-key")
+                if mode == "parallel":
+                    planner = ParallelDayPlanner(day_planner_factory("openai", "gpt-4o", "fake-key"), days, max_workers=args.max_parallel)
+                llm.reset()
+                started = time.perf_counter()
+                itinerary = planner.run(prompt, stream=False)
+                elapsed = time.perf_counter() - started
+                written = {int(day) for day in re.findall(r"^### Day (\d+)", itinerary, re.MULTILINE)}
+                tokens_out = sum(request.tokens_out for request in llm.log)
+                print(f"{days:>4} {mode:<9} {elapsed:>7.2f} {len(llm.log):>6} {tokens_out:>11} {len(written):>6} of {days:<3}")
+
+        days = args.days[0]
+        factory = day_planner_factory("openai", "gpt-4o", "fake-key")
+        print(f"\n{'change to a ' + str(days) + '-day plan':<24} {'wall s':>7} {'calls':>6} {'tokens out':>11}")
+        previous = None
+        for change, num_days, edits in [
+            ("full plan", days, None),
+            ("one day longer", days + 1, None),
+            ("one day shorter", days, None),
+            ("rewrite day 2", days, {2: "Swap the museums for a day at the beach."}),
+        ]:
+            prompt = f"Plan a trip for Lisbon for {num_days} days, using the following research:\n\n{RESEARCH}"
+            planner = ParallelDayPlanner(factory, num_days, max_workers=args.max_parallel, previous=previous, edits=edits)
+            llm.reset()
+            started = time.perf_counter()
+            planner.run(prompt, stream=False)
+            elapsed = time.perf_counter() - started
+            previous = planner.plan
+            print(f"{change:<24} {elapsed:>7.2f} {len(llm.log):>6} {sum(request.tokens_out for request in llm.log):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Blog writing time for long posts, in one call and with ``LongFormWriter``.
+
+Writes posts of ``--words`` words with the Blog Writer's writer against the
+local fake LLM, from the same canned research, in two modes:
+
+* ``single``: the writer writes the whole post in one call (the old behaviour);
+* ``sections``: an outline call, then every section written concurrently.
+
+The fake model writes as many words as a prompt asks for at
+``--tokens-per-second``. Reports wall-clock seconds, LLM calls, output tokens
+and words of the post, and for the sectioned post the outline time next to
+the time of its slowest section call.
+
+Usage:
+    python benchmarks/long_form.py [--words 1500 3000 5000] [--tokens-per-second 100] [--max-parallel 8]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from fake_llm import FakeLLM
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Blog Writer"))
+sys.path.insert(0, str(ROOT))
+
+RESEARCH = "\n".join(
+    f"{i}. Finding {i} on remote onboarding: teams that pair new hires with a buddy ramp up faster, see https://example.com/{i}"
+    for i in range(1, 21)
+)
+REQUEST = "Write a blog on the topic 'Onboarding remote engineers' for the audience 'engineering managers'."
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[1500, 3000, 5000], help="post lengths")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=100, help="fake LLM output rate per request")
+    parser.add_argument("--max-parallel", type=int, default=8, help="sections written at once")
+    args = parser.parse_args()
+
+    with FakeLLM(args.latency, args.tokens_per_second) as llm:
+        os.environ.update(
+            OPENAI_BASE_URL=f"{llm.base_url}/v1",
+            # The fake backend has no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+        from assistants import build_assistants, section_writer_factory
+        from long_form import LongFormWriter
+
+        print(f"{'words':>5} {'mode':<9} {'wall s':>7} {'calls':>6} {'tokens out':>11} {'post words':>11}")
+        for words in args.words:
+            for mode in ("single", "sections"):
+                _, writer = build_assistants("openai", "gpt-4o", "fake-key", "fake-key")
+                if mode == "sections":
+                    writer = LongFormWriter(section_writer_factory("openai", "gpt-4o", "fake-key"), RESEARCH, words=words, max_workers=args.max_parallel)
+                    message = REQUEST
+                else:
+                    message = f"{REQUEST} Write about {words} words, using the following research:\n\n{RESEARCH}"
+                llm.reset()
+                started = time.perf_counter()
+                post = writer.run(message, stream=False)
+                elapsed = time.perf_counter() - started
+                tokens_out = sum(request.tokens_out for request in llm.log)
+                print(f"{words:>5} {mode:<9} {elapsed:>7.2f} {len(llm.log):>6} {tokens_out:>11} {len(post.split()):>11}")
+                if mode == "sections":
+                    # Every section call but the outline ran at once; the slowest one bounds the post.
+                    slowest = max(request.tokens_out for request in llm.log[1:]) / args.tokens_per_second + args.latency
+                    print(f"  outline {writer.timings['outline']:.2f}s + sections {writer.timings['sections']:.2f}s (slowest section ~{slowest:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
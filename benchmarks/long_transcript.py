@@ -0,0 +1,90 @@
+"""Single-pass vs map-reduce summarization on synthetic 1h/3h/6h transcripts.
+
+The LLM is simulated: each call takes ``base + input/prefill_tps +
+output/decode_tps`` seconds (scaled down by ``--scale`` so the benchmark runs
+quickly; reported times are scaled back up). A single pass whose prompt does
+not fit the model's context window is reported as failing, as it does on
+``mixtral-8x7b-32768``.
+
+Usage:
+    python benchmarks/long_transcript.py [--model mixtral-8x7b-32768] [--workers 4] [--scale 0.01]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Youtube Video"))
+sys.path.insert(0, str(ROOT))
+
+from long_summary import MapReduceSummarizer, default_chunk_tokens  # noqa: E402
+from shared.tokens import CONTEXT_WINDOWS, estimate_tokens  # noqa: E402
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = "the model data video team result people system time value example idea point market user work".split()
+
+
+def synthetic_transcript(hours: float, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(int(hours * 60 * WORDS_PER_MINUTE)))
+
+
+class SimulatedAssistant:
+    def __init__(self, args, output_tokens: int):
+        self.args = args
+        self.output_tokens = output_tokens
+
+    def run(self, prompt: str, stream: bool = False) -> str:
+        args = self.args
+        seconds = args.base + estimate_tokens(prompt) / args.prefill_tps + self.output_tokens / args.decode_tps
+        time.sleep(seconds * args.scale)
+        return " ".join(["summary"] * int(self.output_tokens * 0.75))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="mixtral-8x7b-32768", choices=sorted(CONTEXT_WINDOWS))
+    parser.add_argument("--workers", type=int, default=4, help="parallel chunk summaries")
+    parser.add_argument("--base", type=float, default=0.4, help="fixed seconds per call")
+    parser.add_argument("--prefill-tps", type=float, default=5000, help="input tokens per second")
+    parser.add_argument("--decode-tps", type=float, default=250, help="output tokens per second")
+    parser.add_argument("--chunk-output", type=int, default=400, help="tokens per partial summary")
+    parser.add_argument("--final-output", type=int, default=1500, help="tokens in the final summary")
+    parser.add_argument("--scale", type=float, default=0.01, help="real seconds slept per simulated second")
+    args = parser.parse_args()
+
+    chunk_tokens = default_chunk_tokens(args.model)
+    final = SimulatedAssistant(args, args.final_output)
+    print(f"model={args.model} context={CONTEXT_WINDOWS[args.model]} chunk={chunk_tokens} workers={args.workers}")
+    print(f"{'video':>5} {'tokens':>8} {'single s':>9} {'map-reduce s':>13} {'chunks':>7} {'levels':>7} {'calls':>6}")
+    for hours in (1, 3, 6):
+        transcript = synthetic_transcript(hours)
+        tokens = estimate_tokens(transcript)
+
+        if tokens + args.final_output > CONTEXT_WINDOWS[args.model]:
+            single = "exceeds"
+        else:
+            started = time.perf_counter()
+            final.run(transcript)
+            single = f"{(time.perf_counter() - started) / args.scale:.1f}"
+
+        engine = MapReduceSummarizer(
+            lambda: SimulatedAssistant(args, args.chunk_output), chunk_tokens=chunk_tokens, max_workers=args.workers
+        )
+        if not engine.needs_condensing(transcript):
+            print(f"{hours:>4}h {tokens:>8} {single:>9} {'(single pass)':>13}")
+            continue
+        started = time.perf_counter()
+        condensed = engine.condense(transcript)
+        final.run(condensed.text)
+        mapped = (time.perf_counter() - started) / args.scale
+        print(
+            f"{hours:>4}h {tokens:>8} {single:>9} {mapped:>13.1f} "
+            f"{condensed.chunks:>7} {condensed.levels:>7} {condensed.calls + 1:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""End-to-end benchmark of every app's pipeline against local fake backends.
+
+Each folder's batch pipeline (``batch.make_pipeline``, the same stages as its
+apps) runs for every OpenAI and Groq model it supports, with the LLM served by
+``fake_llm.py`` and searches by ``fake_serpapi.py``. Nothing leaves the machine
+and no real key is needed. The research apps run twice, with the fan-out
+researcher and with the tool-calling one (``--sequential-search`` in the batch
+commands); their research cache is bypassed and the search cache cleared before
+every item. YouTube captions come from a transcript store seeded with a
+synthetic transcript of ``--transcript-minutes``, so long transcripts go
+through the map-reduce stage.
+
+Per pipeline and stage it reports latency, LLM calls, tokens in and out and
+tool calls; per pipeline also web searches and peak Python memory. Each
+pipeline runs one untimed warm-up item first; then items run one at a time, so
+every LLM request is attributed to the stage running when it arrived. Gemini models are skipped: the Gemini SDK cannot be pointed at a
+local server.
+
+``--json`` writes the results as JSON. ``--baseline`` compares with an earlier
+``--json`` file and exits with status 1 if a count or token figure grew by more
+than ``--tolerance``, or a latency or memory figure by more than
+``--time-tolerance``.
+
+Usage:
+    python benchmarks/pipelines.py [--items 2] [--latency 0.05] [--json results.json]
+    python benchmarks/pipelines.py --baseline results.json [--tolerance 0.05]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fake_llm import FakeLLM
+from fake_serpapi import FakeSerpApi
+
+ROOT = Path(__file__).resolve().parent.parent
+FOLDERS = ("Blog Writer", "Linkedin Post Writer", "Travel Agent", "Youtube Video")
+SAMPLES = {
+    "Blog Writer": [
+        {"topic": "Edge computing for retail", "audience": "CTOs of mid-size chains"},
+        {"topic": "Remote onboarding", "audience": "HR managers"},
+    ],
+    "Linkedin Post Writer": [
+        {"post_topic": "Lessons from a failed product launch", "style_preference": "candid"},
+        {"post_topic": "Why we moved to a four-day week", "style_preference": "data-driven"},
+    ],
+    "Travel Agent": [
+        {"destination": "Lisbon", "num_days": 3},
+        {"destination": "Kyoto", "num_days": 5},
+    ],
+    "Youtube Video": [
+        {"video_url": "https://www.youtube.com/watch?v=bench000001"},
+        {"video_url": "https://youtu.be/bench000002"},
+    ],
+}
+# Counts must not grow at all past the tolerance; timings are noisier.
+COUNT_METRICS = ("llm_calls", "tokens_in", "tokens_out", "tool_calls", "searches")
+TIME_METRICS = ("seconds", "peak_memory_mb")
+
+
+def use_app_dir(folder: str) -> None:
+    """Import the folder's sibling modules (``assistants``, ``batch`` etc.) from it alone."""
+    # Every app folder has its own ``assistants``, ``batch`` etc., so drop the previous folder's.
+    for other in FOLDERS:
+        for module in (ROOT / other).glob("*.py"):
+            sys.modules.pop(module.stem, None)
+        if str(ROOT / other) in sys.path:
+            sys.path.remove(str(ROOT / other))
+    sys.path.insert(0, str(ROOT / folder))
+    if str(ROOT) not in sys.path:
+        sys.path.append(str(ROOT))
+
+
+def seed_transcripts(items: list, minutes: float) -> None:
+    """Store a synthetic transcript for every video so captions never hit YouTube."""
+    from transcript_store import canonical_video_id, get_transcript_store
+
+    store = get_transcript_store()
+    words = "so the next thing we looked at was how the team measured results over time".split()
+    for item in items:
+        # About 150 spoken words a minute, in 5-second caption lines.
+        lines = [
+            {"text": " ".join(words[(i + j) % len(words)] for j in range(12)), "start": i * 5.0, "duration": 5.0}
+            for i in range(int(minutes * 12))
+        ]
+        store.put(canonical_video_id(item["video_url"]), lines)
+
+
+def make_pipeline(folder: str, provider: str, model_id: str, search: str, args):
+    import batch
+
+    if folder == "Youtube Video":
+        return batch.make_pipeline(provider, model_id, "fake-key", max_parallel=args.max_parallel)
+    return batch.make_pipeline(
+        provider, model_id, "fake-key", "fake-key", parallel_search=search == "fanout", use_research_cache=False,
+    )
+
+
+def attribute(requests: list, finished: float, timings: dict, stages: dict) -> None:
+    """Add each request to the stage that was running when it arrived.
+
+    ``timings`` are in stage order and the last stage ends when the pipeline
+    returns at ``finished``, so stage boundaries are counted back from there.
+    """
+    bounds, end = [], finished
+    for stage, seconds in reversed(timings.items()):
+        bounds.insert(0, (stage, end))
+        end -= seconds
+    for stage, seconds in timings.items():
+        stages.setdefault(stage, dict.fromkeys(("seconds", "llm_calls", "tokens_in", "tokens_out", "tool_calls"), 0))
+        stages[stage]["seconds"] += seconds
+    for request in requests:
+        stage = next((name for name, end in bounds if request.at < end), bounds[-1][0])
+        totals = stages[stage]
+        totals["llm_calls"] += 1
+        totals["tokens_in"] += request.tokens_in
+        totals["tokens_out"] += request.tokens_out
+        totals["tool_calls"] += request.tool_calls
+
+
+def run_pipeline(folder: str, provider: str, model_id: str, search: str, items: list, llm: FakeLLM,
+                 serpapi: FakeSerpApi, args) -> dict:
+    process = make_pipeline(folder, provider, model_id, search, args)
+    stages, totals = {}, dict.fromkeys(("seconds", "llm_calls", "tokens_in", "tokens_out", "tool_calls", "searches"), 0)
+    if folder != "Youtube Video":
+        from shared.search_cache import SEARCH_CACHE
+    # One untimed item first, so lazy SDK imports and client setup are not measured.
+    process(dict(items[0], id="warm-up"))
+    searches_before = serpapi.requests
+    tracemalloc.start()
+    for number, item in enumerate(items):
+        if folder != "Youtube Video":
+            SEARCH_CACHE.clear()
+        llm.reset()
+        started = time.perf_counter()
+        result = process(dict(item, id=f"bench-{number}"))
+        finished = time.perf_counter()
+        totals["seconds"] += finished - started
+        attribute(list(llm.log), finished, result["timings"], stages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for stage in stages.values():
+        for metric in ("llm_calls", "tokens_in", "tokens_out", "tool_calls"):
+            totals[metric] += stage[metric]
+        stage["seconds"] = round(stage["seconds"] / len(items), 3)
+    totals["seconds"] = round(totals["seconds"] / len(items), 3)
+    totals["searches"] = serpapi.requests - searches_before
+    return {
+        "folder": folder,
+        "provider": provider,
+        "model": model_id,
+        "search": search,
+        "items": len(items),
+        **totals,
+        "peak_memory_mb": round(peak / 2 ** 20, 2),
+        "stages": stages,
+    }
+
+
+def run_all(args) -> dict:
+    results, skipped = {}, []
+    with FakeLLM(args.latency, args.tokens_per_second, args.output_tokens) as llm, FakeSerpApi(args.search_latency) as serpapi:
+        os.environ.update(
+            OPENAI_BASE_URL=f"{llm.base_url}/v1",
+            GROQ_BASE_URL=llm.base_url,
+            SERPAPI_BASE_URL=serpapi.base_url,
+            OPENAI_API_KEY="fake-key",
+            GROQ_API_KEY="fake-key",
+            SERPER_API_KEY="fake-key",
+            # The fake backends have no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+        for folder in args.folders:
+            use_app_dir(folder)
+            from assistants import BUILDERS
+
+            items = [SAMPLES[folder][i % len(SAMPLES[folder])] for i in range(args.items)]
+            if folder == "Youtube Video":
+                seed_transcripts(items, args.transcript_minutes)
+            searches = ("none",) if folder == "Youtube Video" else ("fanout", "tools")
+            for provider, model_id in BUILDERS:
+                if provider == "google":
+                    skipped.append({"folder": folder, "model": model_id, "reason": "the Gemini SDK has no endpoint override"})
+                    continue
+                for search in searches:
+                    key = f"{folder}/{model_id}/{search}"
+                    print(f"running {key}...", file=sys.stderr)
+                    results[key] = run_pipeline(folder, provider, model_id, search, items, llm, serpapi, args)
+    return {
+        "settings": {
+            "items": args.items,
+            "latency": args.latency,
+            "tokens_per_second": args.tokens_per_second,
+            "output_tokens": args.output_tokens,
+            "search_latency": args.search_latency,
+            "transcript_minutes": args.transcript_minutes,
+            "python": platform.python_version(),
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def regressions(current: dict, baseline: dict, tolerance: float, time_tolerance: float) -> list:
+    """Return a line for every figure of ``current`` that grew past its tolerance over ``baseline``."""
+    found = []
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        rows = [(key, result, before)]
+        rows += [(f"{key} [{stage}]", metrics, before.get("stages", {}).get(stage, {})) for stage, metrics in result["stages"].items()]
+        for name, now, then in rows:
+            for metric in COUNT_METRICS + TIME_METRICS:
+                if metric not in now or metric not in then:
+                    continue
+                allowed = then[metric] * (1 + (time_tolerance if metric in TIME_METRICS else tolerance))
+                if now[metric] > allowed and now[metric] - then[metric] > 1e-3:
+                    found.append(f"{name}: {metric} {then[metric]} -> {now[metric]}")
+    return found
+
+
+def print_table(report: dict) -> None:
+    print(f"{'pipeline':<58} {'stage':<10} {'s/item':>7} {'calls':>6} {'tok in':>8} {'tok out':>8} {'tools':>6} {'search':>6} {'MB':>7}")
+    for key, result in report["results"].items():
+        print(
+            f"{key:<58} {'total':<10} {result['seconds']:>7.2f} {result['llm_calls']:>6} {result['tokens_in']:>8} "
+            f"{result['tokens_out']:>8} {result['tool_calls']:>6} {result['searches']:>6} {result['peak_memory_mb']:>7.1f}"
+        )
+        for stage, metrics in result["stages"].items():
+            print(
+                f"{'':<58} {stage:<10} {metrics['seconds']:>7.2f} {metrics['llm_calls']:>6} {metrics['tokens_in']:>8} "
+                f"{metrics['tokens_out']:>8} {metrics['tool_calls']:>6}"
+            )
+    for skip in report["skipped"]:
+        print(f"skipped {skip['folder']}/{skip['model']}: {skip['reason']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", dest="folders", action="append", choices=FOLDERS, help="run only this folder (repeatable)")
+    parser.add_argument("--items", type=int, default=2, help="inputs run per pipeline")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LLM seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=2000, help="fake LLM output token rate")
+    parser.add_argument("--output-tokens", type=int, default=300, help="tokens per fake LLM text reply")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="fake SerpApi seconds per search")
+    parser.add_argument("--transcript-minutes", type=float, default=90, help="length of the seeded video transcripts")
+    parser.add_argument("--max-parallel", type=int, default=4, help="parallel chunk summaries per video")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results of an earlier --json run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="allowed growth of counts and tokens")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed growth of latency and memory")
+    args = parser.parse_args()
+    args.folders = args.folders or list(FOLDERS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the benchmark's research and transcripts out of the apps' own stores.
+        os.environ["RESEARCH_CACHE_PATH"] = os.path.join(tmp, "research.sqlite3")
+        os.environ["TRANSCRIPT_STORE_PATH"] = os.path.join(tmp, "transcripts.sqlite3")
+        report = run_all(args)
+
+    print_table(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = regressions(report, json.load(f), args.tolerance, args.time_tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Cached prompt tokens and time to first token, with the old and the prefix-stable prompts.
+
+Writes LinkedIn posts from the same research in ``--styles`` styles, one
+after the other and ``--rounds`` times over (a user trying styles and
+regenerating), with the llama writer against the local fake LLM, whose prompt
+cache works like OpenAI's. Two ways:
+
+* ``before``: the writer keeps ``add_datetime_to_instructions`` (the time to
+  the microsecond inside its system prompt) and the style comes before the
+  research in the message, as the apps did;
+* ``after``: the writer is wrapped in ``stable_prefix`` (the date at the end of
+  the message) and the research comes before the style.
+
+Reports wall-clock seconds, prompt tokens, the cached prompt tokens recorded
+in the run's trace and their share, for prompts read at
+``--prefill-tokens-per-second`` when they are not cached.
+
+Usage:
+    python benchmarks/prompt_cache.py [--styles casual professional inspiring] [--rounds 2] [--research-tokens 3000]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from fake_llm import WORDS, FakeLLM
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Linkedin Post Writer"))
+sys.path.insert(0, str(ROOT))
+
+TOPIC = "Lessons from a failed product launch"
+PROVIDER, MODEL_ID = "groq", "llama-3.3-70b-versatile"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--styles", nargs="+", default=["casual", "professional", "inspiring"], help="styles to write")
+    parser.add_argument("--rounds", type=int, default=2, help="times every style is written")
+    parser.add_argument("--research-tokens", type=int, default=3000, help="tokens of research in every prompt")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake LLM time to first token in seconds, before prefill")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=5000, help="fake LLM prompt tokens read per second when not cached")
+    parser.add_argument("--output-tokens", type=int, default=100, help="tokens per fake LLM reply")
+    args = parser.parse_args()
+
+    research = "\n".join(
+        f"{i}. " + " ".join(WORDS[(i + j) % len(WORDS)] for j in range(25)) for i in range(1, args.research_tokens // 40 + 1)
+    )
+    with FakeLLM(args.latency, 10_000, args.output_tokens, prefill_tokens_per_second=args.prefill_tokens_per_second) as llm:
+        os.environ.update(
+            GROQ_BASE_URL=llm.base_url,
+            GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "fake-key"),
+            # The fake backend has no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+        from assistants import BUILDERS, build_assistants, writer_factory
+        from phi.assistant import Assistant
+        from shared.backends import llm_kwargs
+        from shared.rate_limit import rate_limited
+        from shared.telemetry import Trace, instrumented
+
+        def old_writer_factory(writer):
+            def make_writer():
+                assistant = Assistant(
+                    name=writer.name,
+                    role=writer.role,
+                    description=writer.description,
+                    instructions=writer.instructions,
+                    markdown=writer.markdown,
+                    add_datetime_to_instructions=writer.add_datetime_to_instructions,
+                    **llm_kwargs(PROVIDER, MODEL_ID, "fake-key"),
+                )
+                return rate_limited(instrumented(assistant, PROVIDER, MODEL_ID), PROVIDER, MODEL_ID)
+
+            return make_writer
+
+        modes = {
+            "before": (
+                old_writer_factory(BUILDERS[(PROVIDER, MODEL_ID)]("fake-key", "fake-key")[1]),
+                lambda style: f"LinkedIn post on '{TOPIC}' with style '{style}' using the following research:\n\n{research}",
+            ),
+            "after": (
+                writer_factory(build_assistants(PROVIDER, MODEL_ID, "fake-key", "fake-key")[1], PROVIDER, MODEL_ID, "fake-key"),
+                lambda style: f"LinkedIn post on '{TOPIC}' using the following research:\n\n{research}\n\nWrite it with style '{style}'.",
+            ),
+        }
+        print(f"{'mode':<7} {'calls':>6} {'wall s':>7} {'s/call':>7} {'tokens in':>10} {'cached':>8} {'share':>6}")
+        for mode, (make_writer, prompt) in modes.items():
+            llm.reset(prompt_cache=True)
+            started = time.perf_counter()
+            with Trace(f"prompt-cache-{mode}") as trace:
+                for _ in range(args.rounds):
+                    for style in args.styles:
+                        make_writer().run(prompt(style), stream=False)
+            elapsed = time.perf_counter() - started
+            totals = trace.totals()
+            print(
+                f"{mode:<7} {totals['llm_calls']:>6} {elapsed:>7.2f} {elapsed / max(totals['llm_calls'], 1):>7.2f} "
+                f"{totals['tokens_in']:>10,} {totals['tokens_cached']:>8,} {totals['tokens_cached'] / max(totals['tokens_in'], 1):>6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
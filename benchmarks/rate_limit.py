@@ -0,0 +1,110 @@
+"""Model calls against a rate-limited provider, with and without ``RateLimiter``.
+
+A simulated provider accepts ``--quota`` requests per ``--window`` seconds and
+answers the rest with a 429. Like the real APIs it meters requests with a token
+bucket that refills continuously, here on a shorter clock than a minute. ``--calls`` concurrent model calls run in three modes:
+
+* ``direct``: no limiter; a 429 fails the call (the old behaviour);
+* ``limited``: the limiter configured with the provider's real quota;
+* ``overset``: the limiter configured with 3x the real quota, so only its
+  429 backoff and adaptive concurrency keep it in line.
+
+Usage:
+    python benchmarks/rate_limit.py [--calls 120] [--quota 10] [--window 1] [--latency 0.2]
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.rate_limit import RateLimiter, _limiters, rate_limited  # noqa: E402
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class SimulatedProvider:
+    def __init__(self, quota: int, window: float, latency: float):
+        self.quota = quota
+        self.window = window
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+        self._bucket = float(quota)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def invoke(self, messages):
+        with self._lock:
+            now = time.monotonic()
+            self._bucket = min(self.quota, self._bucket + (now - self._refilled) * self.quota / self.window)
+            self._refilled = now
+            if self._bucket < 1:
+                self.rejected += 1
+                raise RateLimitError("429 Too Many Requests")
+            self._bucket -= 1
+            self.accepted += 1
+        time.sleep(self.latency)
+        return "ok"
+
+    def invoke_stream(self, messages):
+        yield self.invoke(messages)
+
+
+class SimulatedAssistant:
+    def __init__(self, provider: SimulatedProvider):
+        self.llm = provider
+
+
+def run(mode: str, args) -> None:
+    provider = SimulatedProvider(args.quota, args.window, args.latency)
+    assistant = SimulatedAssistant(provider)
+    limiter = None
+    if mode != "direct":
+        # Quotas are per minute; scale the simulated window up to one.
+        rpm = int(args.quota * 60 / args.window * (3 if mode == "overset" else 1))
+        limiter = RateLimiter(mode, rpm=rpm, tpm=10 ** 9, base_backoff=args.window / 10, max_backoff=args.window)
+        _limiters[("benchmark", mode)] = limiter
+        rate_limited(assistant, "benchmark", mode)
+
+    def call(_):
+        try:
+            assistant.llm.invoke([])
+            return True
+        except Exception:
+            return False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.calls) as pool:
+        succeeded = sum(pool.map(call, range(args.calls)))
+    elapsed = time.perf_counter() - started
+    # A full bucket goes out at once, then calls are paced at the quota.
+    ideal = max(0, args.calls - args.quota) / args.quota * args.window + args.latency
+    share = f"{ideal / elapsed:.0%}" if succeeded == args.calls else "-"
+    print(
+        f"{mode:<8} {succeeded:>4}/{args.calls:<4} {provider.rejected:>5} {elapsed:>7.2f} {ideal:>8.2f} {share:>7}"
+        f"   {limiter.summary() if limiter else ''}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=120, help="concurrent model calls")
+    parser.add_argument("--quota", type=int, default=10, help="requests accepted per window")
+    parser.add_argument("--window", type=float, default=1.0, help="quota window in seconds")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per accepted call")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'ok':>9} {'429s':>5} {'wall s':>7} {'ideal s':>8} {'of max':>7}")
+    for mode in ("direct", "limited", "overset"):
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Rerun latency of every app's launcher, and what its requests pay for the assistants.
+
+Streamlit reruns the whole script on each widget interaction. The launchers
+build nothing on a rerun; every request builds its own assistants with
+``assistants.build_assistants``, around the SDK clients the process keeps
+(``shared.backends.sdk_client``). For every backend of every use case this
+script reports, in milliseconds (medians):
+
+* ``page``: a rerun of ``launcher.main(backend)``, driven by
+  ``streamlit.testing.v1.AppTest``;
+* ``new clients``: the ``build_assistants`` call of a request with the SDK
+  clients dropped first, as the first request of a process makes it (the
+  assistants, their LLMs, their SDK clients and their tools all built);
+* ``build``: the same call with the SDK clients kept, as every later request
+  makes it.
+
+No request is sent to any provider; placeholder keys are used when the real
+ones are not set. ``benchmarks/cold_start.py`` measures the first page and the
+first request of a fresh process.
+
+Usage:
+    python benchmarks/rerun_latency.py [--runs 20] [--app "Blog Writer"]
+"""
+import argparse
+import importlib
+import inspect
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+APPS = sorted(path.parent.name for path in ROOT.glob("*/launcher.py"))
+KEYS = ("OPENAI_API_KEY", "GROQ_API_KEY", "GEMINI_API_KEY", "SERPER_API_KEY")
+PLACEHOLDER = "benchmark-placeholder"
+
+
+def use_app_dir(app: str):
+    """Import the app's own modules (``assistants``, ``launcher``...) from its folder; return its ``assistants``."""
+    # The preload thread of the previous app may still be importing from its folder.
+    for thread in threading.enumerate():
+        if thread.name == "preload":
+            thread.join()
+    # Every app folder has its own ``assistants`` module, so drop the previous folder's copies.
+    for folder in {path.parent for path in ROOT.glob("*/launcher.py")}:
+        for module in folder.glob("*.py"):
+            sys.modules.pop(module.stem, None)
+        if str(folder) in sys.path:
+            sys.path.remove(str(folder))
+    sys.path[:0] = [str(ROOT / app)]
+    if str(ROOT) not in sys.path:
+        sys.path.append(str(ROOT))
+    return importlib.import_module("assistants")
+
+
+def time_page(backend: str, runs: int) -> list:
+    at = AppTest.from_string(f"from launcher import main\n\nmain({backend!r})\n", default_timeout=60)
+    at.run()  # warm up imports
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"{backend} failed: {at.exception[0].message}")
+    return timings
+
+
+def time_build_assistants(assistants, provider: str, model_id: str, runs: int, new_clients: bool) -> list:
+    from shared import backends
+
+    # The YouTube assistants need no SerpApi key.
+    keys = [PLACEHOLDER] * (len(inspect.signature(assistants.build_assistants).parameters) - 2)
+    assistants.build_assistants(provider, model_id, *keys)  # warm up imports
+    timings = []
+    for _ in range(runs):
+        if new_clients:
+            backends._clients.clear()
+        start = time.perf_counter()
+        assistants.build_assistants(provider, model_id, *keys)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="reruns and calls measured per backend and mode")
+    parser.add_argument("--app", action="append", choices=APPS, help="use case folder (repeatable)")
+    args = parser.parse_args()
+
+    for key in KEYS:
+        os.environ.setdefault(key, PLACEHOLDER)
+    # Streamlit warns on every call made outside a script run, as the timed ones here are.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(lambda record: "ScriptRunContext" not in record.getMessage())
+
+    print(f"{'app':<22} {'backend':<36} {'page ms':>8} {'new clients ms':>15} {'build ms':>9}")
+    for app in args.app or APPS:
+        assistants = use_app_dir(app)
+        for provider, model_id in assistants.BUILDERS:
+            backend = f"{provider}/{model_id}"
+            page = statistics.median(time_page(backend, args.runs)) * 1000
+            new_clients = statistics.median(time_build_assistants(assistants, provider, model_id, args.runs, new_clients=True)) * 1000
+            build = statistics.median(time_build_assistants(assistants, provider, model_id, args.runs, new_clients=False)) * 1000
+            print(f"{app:<22} {backend:<36} {page:>8.1f} {new_clients:>15.1f} {build:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
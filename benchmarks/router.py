@@ -0,0 +1,73 @@
+"""Stage latency and failures with one fixed provider vs the latency router.
+
+Three fake providers (see ``fake_providers.py``) serve a stream of stage runs.
+Halfway through, the provider that starts out fastest degrades: it gets slower
+and fails most calls. Modes:
+
+* ``fixed``: every run goes to that provider, as in the single-backend apps;
+* ``routed``: ``Router`` picks the fastest healthy provider and fails over;
+* ``hedged``: as ``routed``, plus a hedged request once the primary passes its p95.
+
+Times are simulated seconds, run ``--scale`` times faster than real time.
+
+Usage:
+    python benchmarks/router.py [--runs 200] [--scale 0.01]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fake_providers import FakeAssistant  # noqa: E402
+from shared.router import Router, RoutedAssistant, _percentile  # noqa: E402
+
+
+def providers(scale: float) -> dict:
+    return {
+        "groq": FakeAssistant("groq", latency=1.0, spread=0.6, scale=scale, seed=1),
+        "gemini": FakeAssistant("gemini", latency=1.8, spread=0.3, scale=scale, seed=2),
+        "openai": FakeAssistant("openai", latency=2.5, spread=0.3, scale=scale, seed=3),
+    }
+
+
+def run(mode: str, args) -> None:
+    backends = providers(args.scale)
+    if mode == "fixed":
+        stage = backends["groq"]
+    else:
+        router = Router(cooldown=60 * args.scale, hedge_after=10 * args.scale)
+        stage = RoutedAssistant(router, "write", backends, hedge=mode == "hedged")
+
+    latencies, failures = [], 0
+    for i in range(args.runs):
+        if i == args.runs // 2:
+            backends["groq"].latency, backends["groq"].error_rate = 6.0, 0.6
+        started = time.perf_counter()
+        try:
+            stage.run(f"request {i}")
+            latencies.append((time.perf_counter() - started) / args.scale)
+        except Exception:
+            failures += 1
+    calls = ", ".join(f"{name} {backend.calls}" for name, backend in backends.items())
+    print(
+        f"{mode:<7} {_percentile(latencies, 0.5):>6.2f} {_percentile(latencies, 0.95):>6.2f} "
+        f"{max(latencies):>6.2f} {failures:>8}   calls: {calls}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200, help="stage runs per mode")
+    parser.add_argument("--scale", type=float, default=0.01, help="real seconds slept per simulated second")
+    args = parser.parse_args()
+
+    print(f"{'mode':<7} {'p50 s':>6} {'p95 s':>6} {'max s':>6} {'failures':>8}")
+    for mode in ("fixed", "routed", "hedged"):
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""SerpApi quota and latency with and without ``CachedSerpApiTools``.
+
+Simulates concurrent sessions researching overlapping topics against the local
+fake SerpApi server and reports upstream requests and wall-clock time for:
+
+* ``direct``: every ``search_google`` call goes upstream (the old behaviour);
+* ``cached``: results are memoized and identical in-flight queries coalesced.
+
+Usage:
+    python benchmarks/search_cache.py [--sessions 24] [--topics 4] [--latency 0.5]
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fake_serpapi import FakeSerpApi  # noqa: E402
+from shared.search_tools import CachedSerpApiTools, SearchCache  # noqa: E402
+
+
+def session_queries(session: int, topics: int) -> list:
+    topic = f"topic {session % topics}"
+    # Same terms a researcher would generate, with the casing and spacing noise models produce.
+    return [f"{topic} trends", f"{topic.upper()}  statistics", f"{topic} best practices"]
+
+
+def run(mode: str, sessions: int, topics: int, latency: float) -> None:
+    with FakeSerpApi(latency=latency) as server:
+        cache = SearchCache(ttl=3600)
+        tool = CachedSerpApiTools(api_key="benchmark", base_url=server.base_url, cache=cache)
+        search = tool.search_google if mode == "cached" else (lambda query: tool._fetch(query, 10))
+
+        def research(session: int) -> None:
+            for query in session_queries(session, topics):
+                search(query)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            list(pool.map(research, range(sessions)))
+        elapsed = time.perf_counter() - start
+        calls = sessions * 3
+        print(f"{mode:<7} {calls:>6} {server.requests:>9} {elapsed:>8.2f}   {cache.summary() if mode == 'cached' else ''}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=24, help="concurrent research sessions")
+    parser.add_argument("--topics", type=int, default=4, help="distinct topics shared by the sessions")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake SerpApi latency in seconds")
+    args = parser.parse_args()
+
+    print(f"{'mode':<7} {'calls':>6} {'upstream':>9} {'wall s':>8}")
+    for mode in ("direct", "cached"):
+        run(mode, args.sessions, args.topics, args.latency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Lookup latency and match quality of the research cache's ``SemanticIndex``.
+
+Indexes ``--entries`` synthetic research requests (a topic of a common domain
+word plus two rarer words, and an audience) and looks up three kinds of
+requests against them:
+
+* ``reworded``: a stored topic reordered, with stopwords and plurals added,
+  for the same audience; should reuse the stored research;
+* ``audience``: a stored topic for another audience; should reuse it too;
+* ``unrelated``: a stored topic with one of its rarer words replaced; the
+  subject gate should keep it from reusing anything.
+
+Reports p50/p99 lookup latency and, per kind, how many lookups matched the
+stored request they were derived from. Exits with status 1 when the p99
+latency exceeds ``--budget-ms``.
+
+Usage:
+    python benchmarks/semantic_cache.py [--entries 100000] [--lookups 2000] [--budget-ms 1]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.semantic_index import SemanticIndex  # noqa: E402
+
+DOMAINS = ["ai", "cloud", "data", "marketing", "healthcare", "finance", "remote work", "startup", "security", "retail"]
+AUDIENCES = ["developers", "managers", "students", "doctors", "founders", "teachers", "CFOs", "designers"]
+
+
+def make_entries(count: int, rng: random.Random) -> tuple:
+    vocab = [f"term{i}" for i in range(max(1000, count // 20))]
+    return [(f"{rng.choice(DOMAINS)} {' '.join(rng.sample(vocab, 2))}", rng.choice(AUDIENCES)) for _ in range(count)], vocab
+
+
+def reworded(entry: tuple, rng: random.Random) -> tuple:
+    words = [word + "s" for word in entry[0].split()]
+    rng.shuffle(words)
+    return (f"the {words[0]} of {' and '.join(words[1:])}", entry[1])
+
+
+def other_audience(entry: tuple, rng: random.Random) -> tuple:
+    return (entry[0], rng.choice([audience for audience in AUDIENCES if audience != entry[1]]))
+
+
+def unrelated(entry: tuple, rng: random.Random, vocab: list) -> tuple:
+    words = entry[0].split()
+    words[-1] = rng.choice(vocab)
+    return (" ".join(words), entry[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000, help="indexed requests")
+    parser.add_argument("--lookups", type=int, default=2000, help="lookups per kind")
+    parser.add_argument("--threshold", type=float, default=0.5, help="similarity threshold")
+    parser.add_argument("--budget-ms", type=float, default=1.0, help="p99 lookup latency budget")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    entries, vocab = make_entries(args.entries, rng)
+    index = SemanticIndex(threshold=args.threshold)
+    started = time.perf_counter()
+    for entry in entries:
+        index.add(entry)
+    print(f"indexed {len(index)} entries in {time.perf_counter() - started:.1f}s")
+
+    kinds = {
+        "reworded": lambda entry: reworded(entry, rng),
+        "audience": lambda entry: other_audience(entry, rng),
+        "unrelated": lambda entry: unrelated(entry, rng, vocab),
+    }
+    latencies = []
+    print(f"{'kind':<10} {'lookups':>8} {'matched':>8} {'same':>6} {'p50 ms':>7} {'p99 ms':>7}")
+    for kind, derive in kinds.items():
+        timings, matched, same = [], 0, 0
+        for entry in rng.sample(entries, args.lookups):
+            query = derive(entry)
+            start = time.perf_counter()
+            match = index.lookup(query)
+            timings.append(time.perf_counter() - start)
+            matched += match is not None
+            same += match is not None and match.inputs == entry
+        latencies += timings
+        cuts = statistics.quantiles(timings, n=100)
+        print(f"{kind:<10} {args.lookups:>8} {matched:>8} {same:>6} {cuts[49] * 1000:>7.3f} {cuts[98] * 1000:>7.3f}")
+
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    print(f"overall p99 {p99:.3f} ms (budget {args.budget_ms} ms)")
+    if p99 > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
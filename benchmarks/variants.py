@@ -0,0 +1,97 @@
+"""LinkedIn style variants: one full run per style versus one research pass and parallel writers.
+
+Writes a post on the same topic in ``--styles`` styles against the local fake
+LLM and fake SerpApi, two ways:
+
+* ``separate``: one batch pipeline run (research, then writer) per style, the
+  way users compared styles before; the research cache is bypassed, as each
+  style used to be a different research request;
+* ``variants``: one research pass, then one writer per style at the same time
+  with ``write_variants``.
+
+Reports wall-clock seconds, LLM calls and web searches for both, next to the
+time of the slowest single writer call of the variants run.
+
+Usage:
+    python benchmarks/variants.py [--styles casual professional inspiring] [--latency 0.3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fake_llm import FakeLLM
+from fake_serpapi import FakeSerpApi
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Linkedin Post Writer"))
+sys.path.insert(0, str(ROOT))
+
+TOPIC = "Lessons from a failed product launch"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--styles", nargs="+", default=["casual", "professional", "inspiring"], help="styles to write")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake LLM time to first token in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=100, help="fake LLM output rate per request")
+    parser.add_argument("--output-tokens", type=int, default=300, help="tokens per fake LLM text reply")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="fake SerpApi seconds per search")
+    args = parser.parse_args()
+
+    with FakeLLM(args.latency, args.tokens_per_second, args.output_tokens) as llm, FakeSerpApi(args.search_latency) as serpapi, \
+            tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            OPENAI_BASE_URL=f"{llm.base_url}/v1",
+            SERPAPI_BASE_URL=serpapi.base_url,
+            RESEARCH_CACHE_PATH=os.path.join(tmp, "research.sqlite3"),
+            # The fake backends have no quota; the real limits would only add waiting.
+            RATE_LIMIT_RPM="1000000",
+            RATE_LIMIT_TPM="1000000000",
+        )
+        import batch
+        from assistants import build_assistants, writer_factory
+        from shared.app_assistants import build_fanout_researcher
+        from shared.search_cache import SEARCH_CACHE
+        from variants import write_variants
+
+        generate = batch.make_pipeline("openai", "gpt-4o", "fake-key", "fake-key", use_research_cache=False)
+        # One untimed item first, so lazy SDK imports and client setup are not measured.
+        generate({"id": "warm-up", "post_topic": TOPIC, "style_preference": args.styles[0]})
+
+        print(f"{'mode':<9} {'styles':>6} {'wall s':>7} {'calls':>6} {'searches':>9}")
+        SEARCH_CACHE.clear()
+        llm.reset()
+        searches = serpapi.requests
+        started = time.perf_counter()
+        for number, style in enumerate(args.styles):
+            generate({"id": f"bench-{number}", "post_topic": TOPIC, "style_preference": style})
+        elapsed = time.perf_counter() - started
+        print(f"{'separate':<9} {len(args.styles):>6} {elapsed:>7.2f} {len(llm.log):>6} {serpapi.requests - searches:>9}")
+
+        SEARCH_CACHE.clear()
+        llm.reset()
+        searches = serpapi.requests
+        started = time.perf_counter()
+        researcher, writer = build_assistants("openai", "gpt-4o", "fake-key", "fake-key")
+        researcher = build_fanout_researcher(researcher, "openai", "gpt-4o", "fake-key", "fake-key")
+        styles = ", ".join(args.styles)
+        research = researcher.run(f"Linkedin Post topic: {TOPIC} for the style preference: {styles}", stream=False)
+        researched = time.perf_counter()
+        variants = [
+            variant
+            for _, variant in write_variants(
+                writer_factory(writer, "openai", "gpt-4o", "fake-key"),
+                args.styles,
+                lambda style: f"LinkedIn post on '{TOPIC}' using the following research:\n\n{research}\n\nWrite it with style '{style}'.",
+            )
+        ]
+        elapsed = time.perf_counter() - started
+        print(f"{'variants':<9} {len(args.styles):>6} {elapsed:>7.2f} {len(llm.log):>6} {serpapi.requests - searches:>9}")
+        print(f"  research {researched - started:.2f}s + slowest writer {max(variant.seconds for variant in variants):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Modules every app folder uses, kept here once instead of in each folder.
+
+Each app folder keeps only its own prompts, builders, pages and pipelines. Its
+entry points put this repository's root on ``sys.path``, so ``shared`` imports
+from any working directory.
+"""
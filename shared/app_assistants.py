@@ -0,0 +1,132 @@
+"""Build and route the assistants of any app from its builders.
+
+Each app's ``assistants`` module knows its own prompts: ``BUILDERS`` maps
+every (provider, model id) it serves to a function that builds its assistants
+for that backend, and its part factories name the role and prompts of the
+assistants that write one part of a long result. The functions here take
+those as parameters and do the rest the same way for every app: wrap the
+assistants (see ``backends.prepared``), fan the research out, and route each
+stage across the backends with an API key set, building a backend's
+assistants only once the router tries it.
+
+Every request builds assistants of its own, so concurrent requests never
+share phi's per-run state (messages, tool calls, metrics) and never wait for
+each other. Building them takes about a millisecond once phi is
+imported: the SDK clients and their connections are kept for the process
+(see ``backends.sdk_client``), and so are the search cache, the limiters and
+the routers.
+"""
+from functools import partial
+from typing import List, Optional, Sequence
+
+from .backends import llm_kwargs, prepared
+from .fanout import ANALYST_INSTRUCTIONS, TERM_INSTRUCTIONS, FanoutResearcher
+from .prompts import stable_prefix
+from .rate_limit import rate_limited
+from .router import LazyBackends, RoutedAssistant, available_backends, get_router
+from .telemetry import instrumented, traced_tool
+
+
+def check_backend(builders, provider: str, model_id: str) -> None:
+    if (provider, model_id) not in builders:
+        raise ValueError(f"Unsupported provider/model: {provider}/{model_id}")
+
+
+def build_assistants(builders, provider: str, model_id: str, *keys: str) -> tuple:
+    """Build new assistants of ``builders`` for one backend without caching.
+
+    ``keys`` are the API key of the backend, then the keys of the app's tools.
+    """
+    check_backend(builders, provider, model_id)
+    return tuple(prepared(assistant, provider, model_id) for assistant in builders[(provider, model_id)](*keys))
+
+
+def build_fanout_researcher(researcher, provider: str, model_id: str, api_key: str, serp_api_key: str) -> FanoutResearcher:
+    """Build a ``FanoutResearcher`` with the prompts of ``researcher``."""
+    from phi.assistant import Assistant
+
+    from .search_tools import CachedSerpApiTools
+
+    term_writer = Assistant(
+        name="SearchTermWriter",
+        role="Writes web search terms for a research request",
+        description=researcher.description,
+        instructions=TERM_INSTRUCTIONS,
+        **llm_kwargs(provider, model_id, api_key),
+    )
+    analyst = Assistant(
+        name="Analyst",
+        role=researcher.role,
+        description=researcher.description,
+        instructions=ANALYST_INSTRUCTIONS,
+        markdown=researcher.markdown,
+        **llm_kwargs(provider, model_id, api_key),
+    )
+    prepared(term_writer, provider, model_id)
+    prepared(analyst, provider, model_id)
+    return FanoutResearcher(term_writer, analyst, traced_tool("search_google", CachedSerpApiTools(api_key=serp_api_key).search_google))
+
+
+def build_routed_assistants(app: str, builders, stages: Sequence[str], *keys: str, parallel_search: bool = False, hedge: bool = False) -> tuple:
+    """Build one ``RoutedAssistant`` per stage, routing every run across all backends with an API key set.
+
+    ``stages`` names the assistants of ``builders`` in order and ``keys`` are
+    the keys of the app's tools. With ``parallel_search`` the first stage, the
+    researcher, runs its searches concurrently. A backend's assistants are
+    built the first time the router tries it at any stage. The router and its
+    latency statistics are shared by every session of the app.
+    """
+    def build(provider: str, model_id: str, api_key: str) -> List[object]:
+        assistants = list(build_assistants(builders, provider, model_id, api_key, *keys))
+        if parallel_search:
+            assistants[0] = build_fanout_researcher(assistants[0], provider, model_id, api_key, *keys)
+        return assistants
+
+    per_backend = LazyBackends({name: partial(build, *spec) for name, spec in available_backends(builders).items()})
+    router = get_router(app)
+    return tuple(
+        RoutedAssistant(router, stage, LazyBackends({name: partial(_stage_of, per_backend, name, index) for name in per_backend}), hedge=hedge)
+        for index, stage in enumerate(stages)
+    )
+
+
+def _stage_of(per_backend, name: str, index: int):
+    return per_backend[name][index]
+
+
+def part_factory(builders, provider: str, model_id: str, api_key: str, **prompt):
+    """Return a function that builds a new tool-free assistant for one part of a long result.
+
+    ``prompt`` holds the ``Assistant`` fields every part shares (role,
+    description...); a name and instructions given to the function replace
+    those of ``prompt``.
+    """
+    check_backend(builders, provider, model_id)
+
+    def make_assistant(name: Optional[str] = None, instructions: Optional[List[str]] = None):
+        from phi.assistant import Assistant
+
+        fields = {**prompt, "name": name or prompt.get("name"), "instructions": instructions or prompt.get("instructions")}
+        assistant = Assistant(**fields, **llm_kwargs(provider, model_id, api_key))
+        return rate_limited(instrumented(stable_prefix(assistant), provider, model_id), provider, model_id)
+
+    return make_assistant
+
+
+def routed_part_factory(app: str, builders, stage: str, factory, hedge: bool = False):
+    """Like ``factory(provider, model_id, api_key)``, but every part is routed across all backends with an API key set.
+
+    A backend's factory and each part's assistant on it are built the first
+    time the router tries that backend.
+    """
+    factories = LazyBackends({name: partial(factory, *spec) for name, spec in available_backends(builders).items()})
+    router = get_router(app)
+
+    def make_assistant(*args) -> RoutedAssistant:
+        return RoutedAssistant(router, stage, LazyBackends({name: partial(_make_part, factories, name, *args) for name in factories}), hedge=hedge)
+
+    return make_assistant
+
+
+def _make_part(factories, name: str, *args):
+    return factories[name](*args)
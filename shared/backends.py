@@ -0,0 +1,129 @@
+"""The LLM backends of the apps, and what every app does to an assistant it runs.
+
+Each app's ``assistants`` module knows its own prompts and builders; this
+module knows the providers. ``llm_kwargs`` builds a provider's phi LLM,
+``prepared`` wraps an assistant the way every app runs it (see ``prompts``,
+``telemetry`` and ``rate_limit``) and ``preload`` imports phi and the SDKs in
+the background, so an app draws its first page without them.
+
+Every request builds its own assistants and phi LLMs, which is cheap, but
+phi's OpenAI and Groq LLMs also build a new SDK client, with its own HTTP
+connection pool, for every model request unless they are given one.
+``sdk_client`` keeps one client per provider and API key for the process;
+``llm_kwargs`` and ``prepared`` give it to every LLM, so requests reuse open
+connections. The clients are thread-safe. Gemini's LLM keeps its own model
+client and is left alone.
+"""
+import hashlib
+import importlib
+import logging
+import threading
+from typing import Dict, Tuple
+
+import streamlit as st
+
+from .prompts import stable_prefix, without_chat_history
+from .rate_limit import rate_limited
+from .telemetry import instrumented
+
+logger = logging.getLogger(__name__)
+
+# The phi module of each provider's LLM, imported by the builders.
+PROVIDER_MODULES = {
+    "openai": "phi.llm.openai",
+    "groq": "phi.llm.groq",
+    "google": "phi.llm.google",
+}
+
+
+def key_fingerprint(*keys: str) -> str:
+    """Return a short, non-reversible fingerprint of the given API keys."""
+    digest = hashlib.sha256()
+    for key in keys:
+        digest.update((key or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+# The client attribute of each provider's phi LLM that ``sdk_client`` fills in.
+CLIENT_FIELDS = {
+    "openai": "openai_client",
+    "groq": "groq_client",
+}
+
+_clients: Dict[Tuple[str, str], object] = {}
+_clients_lock = threading.Lock()
+
+
+def sdk_client(provider: str, api_key: str):
+    """Return the SDK client of ``provider`` for ``api_key``, shared by every LLM of the process."""
+    key = (provider, key_fingerprint(api_key))
+    with _clients_lock:
+        if key not in _clients:
+            if provider == "openai":
+                from openai import OpenAI
+
+                _clients[key] = OpenAI(api_key=api_key)
+            elif provider == "groq":
+                from groq import Groq
+
+                _clients[key] = Groq(api_key=api_key)
+            else:
+                raise ValueError(f"No shared client for provider: {provider}")
+        return _clients[key]
+
+
+def share_client(llm, provider: str) -> None:
+    """Give ``llm`` the process's SDK client for its provider and API key, unless it has a client already."""
+    field = CLIENT_FIELDS.get(provider)
+    if field is not None and getattr(llm, field, None) is None:
+        setattr(llm, field, sdk_client(provider, llm.api_key))
+
+
+def llm_kwargs(provider: str, model_id: str, api_key: str) -> dict:
+    """Return a new LLM for ``provider``/``model_id`` as ``Assistant`` keyword arguments.
+
+    Each assistant needs its own LLM instance because the assistant attaches its
+    tools to it; OpenAI and Groq LLMs share the process's SDK client.
+    """
+    if provider == "openai":
+        from phi.llm.openai import OpenAIChat
+
+        return {"llm": OpenAIChat(model=model_id, api_key=api_key, openai_client=sdk_client(provider, api_key))}
+    if provider == "groq":
+        from phi.llm.groq import Groq
+
+        return {"llm": Groq(model=model_id, api_key=api_key, groq_client=sdk_client(provider, api_key))}
+    if provider == "google":
+        from phi.llm.google import Gemini
+
+        return {"llm": Gemini(model=model_id, api_key=api_key)}
+    raise ValueError(f"Unsupported provider: {provider}")
+
+
+def prepared(assistant, provider: str, model_id: str):
+    """Give ``assistant`` a stable prompt prefix, no chat history, tracing, the shared SDK client and rate limiter; return it."""
+    if getattr(assistant, "llm", None) is not None:
+        share_client(assistant.llm, provider)
+    return rate_limited(instrumented(stable_prefix(without_chat_history(assistant)), provider, model_id), provider, model_id)
+
+
+@st.cache_resource(show_spinner=False)
+def preload(modules: Tuple[str, ...], providers: Tuple[str, ...]) -> threading.Thread:
+    """Import ``modules`` and the LLM modules of ``providers`` on a background thread, once per process.
+
+    Nothing is built: the first request finds the modules loaded instead of
+    waiting for them, and the first page does not wait either.
+    """
+
+    def load() -> None:
+        for module in [*modules, *(PROVIDER_MODULES[provider] for provider in providers)]:
+            try:
+                importlib.import_module(module)
+            except Exception:
+                # The builder raises it again, where the request can show it.
+                logger.warning("preloading %s failed", module, exc_info=True)
+
+    thread = threading.Thread(target=load, name="preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,189 @@
+"""Headless batch runs of an app's pipeline.
+
+The apps run one item per button click. ``run_batch`` reads many inputs from a
+JSONL or CSV file, runs them on a bounded thread pool and appends one JSON line
+per item to the output file as soon as it finishes. Every item has a stable
+``id`` (its ``id`` field, or a hash of its inputs). Rerunning the same command
+after a crash skips the ids that already have an ``ok`` line, so only
+unfinished and failed items run again.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Sequence
+
+from .router import API_KEY_ENV, _percentile
+from .telemetry import Trace, start_metrics_server
+
+logger = logging.getLogger(__name__)
+
+
+def argument_parser(doc: str, builders) -> argparse.ArgumentParser:
+    """Return a parser with the options shared by every app's batch command."""
+    parser = argparse.ArgumentParser(description=doc, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", help="JSONL or CSV file of inputs")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--model", default="llama-3.3-70b-versatile", choices=sorted(model for _, model in builders))
+    parser.add_argument("--workers", type=int, default=4, help="items run at the same time")
+    parser.add_argument("--verbose", action="store_true", help="log every pipeline stage")
+    return parser
+
+
+def required_env(name: str) -> str:
+    """Return the environment variable ``name``; exit with a message when it is not set."""
+    if not os.environ.get(name):
+        raise SystemExit(f"{name} is not set")
+    return os.environ[name]
+
+
+def provider_and_key(model_id: str, builders) -> tuple:
+    """Return (provider, api key) for ``model_id``, reading the key from the environment."""
+    provider = next(provider for provider, model in builders if model == model_id)
+    return provider, required_env(API_KEY_ENV[provider])
+
+
+def configure_logging(verbose: bool) -> None:
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s", level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    if verbose:
+        logging.getLogger().setLevel(logging.INFO)
+
+
+def item_id(row: dict, fields: Sequence[str]) -> str:
+    payload = json.dumps([" ".join(str(row.get(field, "")).casefold().split()) for field in fields])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def read_inputs(path: str, fields: Sequence[str]) -> List[dict]:
+    """Read rows from a .jsonl or .csv file, check ``fields`` and give each row an ``id``."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    items, seen = [], set()
+    for number, row in enumerate(rows, 1):
+        missing = [field for field in fields if not str(row.get(field) or "").strip()]
+        if missing:
+            raise ValueError(f"{path}: row {number} is missing {', '.join(missing)}")
+        row = dict(row, id=str(row.get("id") or item_id(row, fields)))
+        if row["id"] in seen:
+            logger.info("skipping duplicate input %s (row %d)", row["id"], number)
+            continue
+        seen.add(row["id"])
+        items.append(row)
+    return items
+
+
+def finished_ids(path: str) -> set:
+    """Return the ids that already have a successful result in ``path``."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:  # a line cut short by a crash
+                continue
+            if record.get("status") == "ok":
+                done.add(record.get("id"))
+    return done
+
+
+class ResultWriter:
+    """Append JSON lines to a file, each one flushed to disk before the next."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        # Start on a new line if a crash left a partial last line behind.
+        partial = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                partial = f.read(1) != b"\n"
+        self._file = open(path, "a", encoding="utf-8")
+        if partial:
+            self._file.write("\n")
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BatchSummary(NamedTuple):
+    total: int
+    skipped: int
+    ok: int
+    failed: int
+    seconds: float
+    latencies: List[float]
+
+    def __str__(self) -> str:
+        per_minute = self.ok / self.seconds * 60 if self.seconds else 0.0
+        return (
+            f"Batch: {self.total} items, {self.skipped} already done, {self.ok} ok, {self.failed} failed "
+            f"in {self.seconds:.1f}s · {per_minute:.1f} items/min · latency p50 "
+            f"{_percentile(self.latencies, 0.5):.1f}s, p95 {_percentile(self.latencies, 0.95):.1f}s"
+        )
+
+
+def run_batch(items: List[dict], process: Callable[[dict], dict], output: str, workers: int = 4) -> BatchSummary:
+    """Run ``process`` on every unfinished item, ``workers`` at a time, appending results to ``output``.
+
+    ``process`` gets the input row and returns the fields to store next to it.
+    A failing item is recorded with its error and retried on the next run.
+    Every item is traced; its record gets the trace id and the trace's model
+    calls, tokens and tool calls, and metrics are served if ``METRICS_PORT`` is set.
+    """
+    start_metrics_server()
+    done = finished_ids(output)
+    pending = [item for item in items if item["id"] not in done]
+    writer = ResultWriter(output)
+    lock = threading.Lock()
+    latencies, failures = [], []
+
+    def run_one(item: dict) -> None:
+        started = time.perf_counter()
+        record = {"id": item["id"], "input": item}
+        with Trace(f"batch {item['id']}") as trace:
+            try:
+                record.update(process(item), status="ok")
+            except Exception as e:
+                logger.warning("item %s failed: %s", item["id"], e, exc_info=logger.isEnabledFor(logging.DEBUG))
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+        record.update(trace_id=trace.id, usage=trace.totals())
+        seconds = time.perf_counter() - started
+        record["seconds"] = round(seconds, 3)
+        writer.write(record)
+        with lock:
+            (latencies if record["status"] == "ok" else failures).append(seconds)
+            finished = len(latencies) + len(failures)
+        logger.info("[%d/%d] %s %s in %.1fs", finished, len(pending), item["id"], record["status"], seconds)
+
+    logger.info("%d items, %d already done, running %d with %d workers", len(items), len(items) - len(pending), len(pending), workers)
+    started = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for future in [pool.submit(run_one, item) for item in pending]:
+            future.result()
+    except KeyboardInterrupt:
+        # Items already running finish and are written; queued ones run on the next attempt.
+        logger.warning("interrupted, waiting for running items; rerun the same command to resume")
+        pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        pool.shutdown(wait=True)
+        writer.close()
+    return BatchSummary(len(items), len(items) - len(pending), len(latencies), len(failures), time.perf_counter() - started, latencies)
@@ -0,0 +1,197 @@
+"""Fit research results into a token budget for the writer/planner prompt.
+
+The research text is pasted into the second-stage prompt in full, next to the
+assistant's long description and instructions, and nothing checked its size.
+``ContextBudget.fit`` counts the whole prompt for the target model and, when
+it is over budget, splits the research into items, drops near-duplicates,
+ranks the rest by relevance to the request and keeps the best items (shortened
+if needed) in their original order until the prompt fits.
+"""
+import logging
+import re
+from typing import List, NamedTuple, Optional
+
+from .tokens import CONTEXT_WINDOWS, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Prompt budgets leave room for the output and stay under the per-minute token
+# limits of the Groq models.
+DEFAULT_BUDGETS = {
+    "gpt-4o": 16000,
+    "llama-3.3-70b-versatile": 6000,
+    "mixtral-8x7b-32768": 6000,
+    "gemini-1.5-flash": 16000,
+}
+
+_ITEM_START = re.compile(r"^\s*(?:\d+[.)]|[-*•]|#{1,6})\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_URL = re.compile(r"https?://\S+")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "the a an and or of for to in on with by from about into your their this that these those is are be "
+    "using use who what how why days day".split()
+)
+
+
+class Fitted(NamedTuple):
+    text: str
+    prompt_tokens: int
+    research_tokens_before: int
+    research_tokens_after: int
+    items: int
+    kept: int
+    duplicates: int
+    shortened: int
+
+    def summary(self, budget: int) -> str:
+        if self.research_tokens_before == self.research_tokens_after:
+            return f"Prompt: ~{self.prompt_tokens:,} tokens (budget {budget:,})."
+        return (
+            f"Prompt: ~{self.prompt_tokens:,} tokens (budget {budget:,}); research trimmed from "
+            f"~{self.research_tokens_before:,} to ~{self.research_tokens_after:,} tokens, {self.kept} of "
+            f"{self.items} items kept, {self.duplicates} duplicates dropped, {self.shortened} shortened."
+        )
+
+
+def default_budget(model_id: str) -> int:
+    return DEFAULT_BUDGETS.get(model_id, min(CONTEXT_WINDOWS.get(model_id, 32768) // 4, 16000))
+
+
+def system_prompt(assistant) -> str:
+    """The parts of an assistant's system prompt that scale with its configuration."""
+    return "\n".join(filter(None, [assistant.description, assistant.role, *(assistant.instructions or [])]))
+
+
+def split_items(research: str) -> List[str]:
+    """Split research into list items or, failing that, paragraphs."""
+    items, current = [], []
+    lines = str(research).splitlines()
+    if sum(bool(_ITEM_START.match(line)) for line in lines) >= 2:
+        for line in lines:
+            if _ITEM_START.match(line) and current:
+                items.append("\n".join(current).strip())
+                current = []
+            current.append(line)
+        items.append("\n".join(current).strip())
+    else:
+        items = [block.strip() for block in re.split(r"\n\s*\n", str(research))]
+    return [item for item in items if item]
+
+
+def _words(text: str) -> set:
+    return {word for word in _WORD.findall(text.casefold()) if word not in _STOPWORDS}
+
+
+def dedupe(items: List[str], threshold: float = 0.8, seen: Optional[List[set]] = None) -> List[str]:
+    """Drop items whose word sets overlap an earlier item by ``threshold`` (Jaccard) or more.
+
+    ``seen`` holds the word sets of items kept by earlier calls; the word sets
+    of the items kept now are appended to it.
+    """
+    kept, kept_words = [], seen if seen is not None else []
+    for item in items:
+        words = _words(item)
+        if any(words and len(words & other) / len(words | other) >= threshold for other in kept_words):
+            continue
+        kept.append(item)
+        kept_words.append(words)
+    return kept
+
+
+def shorten(item: str, max_tokens: int, model_id: str) -> str:
+    """Keep the leading sentences of ``item`` and its links within ``max_tokens``.
+
+    An item that already fits is returned as it is. A first sentence that is
+    too long on its own is cut at a word boundary.
+    """
+    if estimate_tokens(item, model_id) <= max_tokens:
+        return item
+    marker = _ITEM_START.match(item)
+    prefix = marker.group(0).strip() + " " if marker else ""
+    body = item[marker.end():] if marker else item
+    links = " ".join(dict.fromkeys(_URL.findall(body)))
+    suffix = f" {links}" if links else ""
+    kept = ""
+    for sentence in _SENTENCE_END.split(_URL.sub("", body).strip()):
+        candidate = f"{kept} {sentence}".strip()
+        if estimate_tokens(prefix + candidate + suffix, model_id) > max_tokens:
+            break
+        kept = candidate
+    if not kept:
+        words = body.split()
+        while words and estimate_tokens(prefix + " ".join(words) + "…" + suffix, model_id) > max_tokens:
+            words = words[: len(words) * 3 // 4]
+        kept = " ".join(words) + "…" if words else ""
+    # An item cut down to a few words carries no useful research.
+    if len(kept.split()) < 8:
+        return ""
+    return prefix + kept + suffix
+
+
+def shared_words(request: str, text: str) -> float:
+    """The share of ``request``'s words that ``text`` also has, from 0 to 1."""
+    request_words = _words(request)
+    return len(_words(text) & request_words) / (len(request_words) or 1)
+
+
+def rank(items: List[str], request: str) -> List[int]:
+    """Return the positions of ``items``, most relevant to ``request`` first."""
+
+    def score(position: int, item: str) -> float:
+        relevance = shared_words(request, item)
+        has_source = 0.3 if _URL.search(item) else 0.0
+        # Research lists usually lead with their strongest points.
+        return relevance + has_source + 0.5 / (position + 1)
+
+    return sorted(range(len(items)), key=lambda i: score(i, items[i]), reverse=True)
+
+
+class ContextBudget:
+    def __init__(self, model_id: str, budget_tokens: int, max_item_tokens: int = 400):
+        self.model_id = model_id
+        self.budget_tokens = budget_tokens
+        self.max_item_tokens = max_item_tokens
+
+    def count(self, text: str) -> int:
+        return estimate_tokens(text, self.model_id)
+
+    def fit(self, research: str, request: str, prompt_overhead: str = "") -> Fitted:
+        """Return ``research`` trimmed so that overhead + research fits the budget.
+
+        ``prompt_overhead`` is everything else sent with it: the system prompt and
+        the rest of the user message.
+        """
+        research = str(research)
+        overhead = self.count(prompt_overhead)
+        before = self.count(research)
+        items = split_items(research)
+        if overhead + before <= self.budget_tokens:
+            fitted = Fitted(research, overhead + before, before, before, len(items), len(items), 0, 0)
+        else:
+            fitted = self._trim(research, items, request, overhead, before)
+        logger.info(
+            "%s prompt: %d tokens (budget %d), research %d -> %d tokens",
+            self.model_id, fitted.prompt_tokens, self.budget_tokens, before, fitted.research_tokens_after,
+        )
+        return fitted
+
+    def _trim(self, research: str, items: List[str], request: str, overhead: int, before: int) -> Fitted:
+        unique = dedupe(items)
+        ranked = rank(unique, request)
+        available = self.budget_tokens - overhead
+        chosen, shortened = {}, 0
+        for i in ranked:
+            item = unique[i]
+            tokens = self.count(item) + 1
+            if tokens > self.max_item_tokens or tokens > available:
+                item = shorten(item, min(self.max_item_tokens, available), self.model_id)
+                tokens = self.count(item) + 1
+                if not item or tokens > available:
+                    continue
+                shortened += 1
+            chosen[i] = item
+            available -= tokens
+        text = "\n\n".join(chosen[i] for i in sorted(chosen))
+        after = self.count(text)
+        return Fitted(text, overhead + after, before, after, len(items), len(chosen), len(items) - len(unique), shortened)
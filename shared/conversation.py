@@ -0,0 +1,130 @@
+"""This session's earlier generations, summarized and capped, as context for a related request.
+
+phi's chat history replayed the last three messages of an assistant shared by
+every session, full length, after every message (see ``prompts``). A
+``ConversationMemory`` holds the turns of one session in ``st.session_state``
+instead. The latest ``keep_turns`` turns are kept in full. Older turns are
+folded into a summary line each, without a model call: the request, the
+headings and the first sentence of every paragraph. Everything it holds stays
+within ``max_tokens``: summaries take at most half of it, the oldest going
+first, and a long response in full keeps its leading sentences.
+
+Every turn is kept with what it is ``about`` (the topic or the destination).
+``context`` returns the turns that share at least ``min_overlap`` of the words
+the new request is about, and nothing for an unrelated request. A prompt then
+grows by at most ``max_tokens``, however many generations came before it.
+
+Settings come from the environment:
+    CONVERSATION_MAX_TOKENS   tokens of earlier turns a prompt may carry (default 1500)
+    CONVERSATION_MIN_OVERLAP  share of a request's subject words an earlier turn must share to be added (default 0.5)
+"""
+import logging
+import os
+import re
+import threading
+from typing import List, NamedTuple
+
+import streamlit as st
+
+from .context_budget import shared_words, shorten
+from .tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Tokens of an older turn's summary line.
+SUMMARY_TOKENS = 120
+HEADER = "Earlier in this session (use it only where it helps with the request below):"
+
+_HEADING = re.compile(r"^\s*#{1,6}\s+(.+?)\s*#*\s*$")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class Turn(NamedTuple):
+    about: str
+    request: str
+    response: str
+    # The summary line the turn is folded into, made from the response before it is cut.
+    summary: str
+    folded: bool
+
+
+def digest(response: str) -> str:
+    """The headings and the first sentence of every paragraph of ``response``, on one line."""
+    parts = []
+    for paragraph in _PARAGRAPH.split(str(response)):
+        lines = [line for line in paragraph.strip().splitlines() if line.strip()]
+        while lines and _HEADING.match(lines[0]):
+            parts.append(_HEADING.match(lines.pop(0)).group(1).rstrip(":") + ":")
+        if lines:
+            parts.append(_SENTENCE_END.split(" ".join(line.strip() for line in lines), 1)[0])
+    return " ".join(parts)
+
+
+class ConversationMemory:
+    """The turns of one session, the latest in full and older ones summarized, within ``max_tokens``."""
+
+    def __init__(self, model_id: str, max_tokens: int = 1500, keep_turns: int = 1, min_overlap: float = 0.5):
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.min_overlap = min_overlap
+        self.dropped = 0
+        self._turns: List[Turn] = []
+        self._lock = threading.Lock()
+
+    def _text(self, turn: Turn) -> str:
+        label = "Earlier response (summary)" if turn.folded else "Earlier response"
+        return f"Earlier request: {turn.request}\n{label}: {turn.response}" if turn.response else f"Earlier request: {turn.request}"
+
+    def _tokens(self, turns: List[Turn]) -> int:
+        return sum(estimate_tokens(self._text(turn), self.model_id) for turn in turns)
+
+    def add(self, about: str, request: str, response: str) -> None:
+        """Keep a finished turn; fold, drop and cut older turns to stay within the limits."""
+        with self._lock:
+            response = str(response or "").strip()
+            self._turns.append(Turn(about, request, response, shorten(digest(response), SUMMARY_TOKENS, self.model_id), folded=False))
+            full = [i for i, turn in enumerate(self._turns) if not turn.folded]
+            for i in full[: max(0, len(full) - self.keep_turns)]:
+                self._turns[i] = self._turns[i]._replace(response=self._turns[i].summary, folded=True)
+            # Summaries take at most half of the cap, the oldest going first; the turns in full share the rest.
+            while self._tokens([turn for turn in self._turns if turn.folded]) > self.max_tokens // 2:
+                self._turns.pop(next(i for i, turn in enumerate(self._turns) if turn.folded))
+                self.dropped += 1
+            full = [i for i, turn in enumerate(self._turns) if not turn.folded]
+            room = (self.max_tokens - self._tokens([turn for turn in self._turns if turn.folded])) // max(len(full), 1)
+            for i in full:
+                turn = self._turns[i]
+                if self._tokens([turn]) > room:
+                    # A long response keeps its leading sentences.
+                    overhead = self._tokens([turn._replace(response=".")])
+                    self._turns[i] = turn._replace(response=shorten(turn.response, max(room - overhead, 0), self.model_id))
+
+    def context(self, about: str) -> str:
+        """The earlier turns about the same thing, as text to put before a message, or "" when there are none."""
+        with self._lock:
+            related = [turn for turn in self._turns if shared_words(about, turn.about) >= self.min_overlap]
+        if not related:
+            return ""
+        logger.info("conversation: %d of %d earlier turns added for %r", len(related), len(self._turns), about)
+        return "\n\n".join([HEADER, *(self._text(turn) for turn in related)]) + "\n\n"
+
+    def summary(self) -> str:
+        with self._lock:
+            turns = list(self._turns)
+        return (
+            f"Conversation memory: {len(turns)} turns ({sum(turn.folded for turn in turns)} summarized) · "
+            f"~{self._tokens(turns):,} of {self.max_tokens:,} tokens · {self.dropped} dropped"
+        )
+
+
+def get_conversation(model_id: str) -> ConversationMemory:
+    """Return this session's conversation memory, created on first use."""
+    if "conversation" not in st.session_state:
+        st.session_state.conversation = ConversationMemory(
+            model_id,
+            max_tokens=int(os.environ.get("CONVERSATION_MAX_TOKENS", 1500)),
+            min_overlap=float(os.environ.get("CONVERSATION_MIN_OVERLAP", 0.5)),
+        )
+    return st.session_state.conversation
@@ -0,0 +1,89 @@
+"""Research stage that runs the researcher's searches concurrently.
+
+The tool-using researcher asks the model for search terms and then calls
+``search_google`` once per term, one model turn and one HTTP request at a time.
+``FanoutResearcher`` splits that into one model call that writes the terms, all
+searches at once on a thread pool, and one analysis call over the merged
+results, so the search phase takes as long as the slowest search.
+"""
+import contextvars
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+TERM_INSTRUCTIONS = [
+    "Given a research request, write the Google search terms that would find the most relevant sources for it.",
+    "Reply with the search terms only, one per line, without numbering, quotes or commentary.",
+]
+
+ANALYST_INSTRUCTIONS = [
+    "The web search results for the research request are provided below; do not ask for more searches.",
+    "Analyze the results and return the 10 most relevant insights or references for the request.",
+    "Keep the links and sources from the results so they can be cited.",
+    "Remember: the quality of the results is important.",
+]
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def parse_terms(text: str, limit: int) -> List[str]:
+    """Pull up to ``limit`` distinct search terms out of a model reply."""
+    terms, seen = [], set()
+    for line in str(text).splitlines():
+        term = _LIST_MARKER.sub("", line).strip().strip("\"'`").strip()
+        if term and term.casefold() not in seen:
+            seen.add(term.casefold())
+            terms.append(term)
+    return terms[:limit]
+
+
+class FanoutResearcher:
+    """Drop-in for the researcher's ``run``: write terms, search them concurrently, analyze once."""
+
+    name = "FanoutResearcher"
+
+    def __init__(self, term_writer, analyst, search: Callable[[str], str], num_terms: int = 3):
+        self.term_writer = term_writer
+        self.analyst = analyst
+        self.search = search
+        self.num_terms = num_terms
+        # Used by the research cache fingerprint, like an Assistant's prompt fields.
+        self.description = analyst.description
+        self.instructions = [*term_writer.instructions, *analyst.instructions, f"num_terms={num_terms}"]
+
+    def run(self, message: str, stream: bool = False) -> str:
+        started = time.perf_counter()
+        reply = self.term_writer.run(f"{message}\n\nWrite {self.num_terms} search terms.", stream=False)
+        # Fall back to searching the request itself if the reply has no usable terms.
+        terms = parse_terms(reply, self.num_terms) or [message]
+        terms_done = time.perf_counter()
+
+        durations = {}
+
+        def timed_search(term: str) -> str:
+            search_started = time.perf_counter()
+            try:
+                return self.search(term)
+            finally:
+                durations[term] = time.perf_counter() - search_started
+
+        with ThreadPoolExecutor(max_workers=len(terms)) as pool:
+            # Each search runs in a copy of this context, so its span joins the run's trace.
+            futures = [pool.submit(contextvars.copy_context().run, timed_search, term) for term in terms]
+            results = [future.result() for future in futures]
+        searches_done = time.perf_counter()
+
+        merged = "\n\n".join(f"### Search results for: {term}\n{result}" for term, result in zip(terms, results))
+        analysis = self.analyst.run(f"{message}\n\nWeb search results:\n\n{merged}", stream=False)
+        logger.info(
+            "fan-out research: terms=%.2fs searches=%.2fs (sequential would be %.2fs) analysis=%.2fs",
+            terms_done - started,
+            searches_done - terms_done,
+            sum(durations.values()),
+            time.perf_counter() - searches_done,
+        )
+        return analysis
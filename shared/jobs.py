@@ -0,0 +1,343 @@
+"""Background jobs, so a generation survives Streamlit reruns.
+
+The apps used to run their pipeline on the script thread inside
+``if st.button(...)``, so touching any widget reran the script and threw away
+a generation that was still in progress. ``JobQueue.submit`` returns a ``Job``
+at once and a shared pool of worker threads runs the pipeline. The pipeline
+reports to its job instead of to Streamlit: ``set_stage`` for what it is doing,
+``caption`` for notes, ``section``/``write``/``run`` for output. The job keeps
+all of it, together with the run's ``Trace``.
+
+``start_job`` remembers the job ID in the session and in the page URL.
+``render_job`` shows the job from any rerun and refreshes itself while the job
+runs, so a reconnecting browser picks the job up too. Finished jobs are
+dropped ``JOB_RETENTION_SECONDS`` after they finish. Submissions are refused
+while ``JOB_QUEUE_DEPTH`` jobs are already waiting for a worker.
+
+Jobs started with a ``key`` (the inputs and the model) are also kept in the
+session's bounded "results" ``SessionMemo``: asking again for the same key
+shows the earlier job at once instead of running a new one, and
+``render_history`` lets the user bring back any result the session still keeps.
+
+Settings come from the environment:
+    JOB_WORKERS            pipelines run at once per process (default 4)
+    JOB_QUEUE_DEPTH        jobs waiting for a worker before new ones are refused (default 16)
+    JOB_RETENTION_SECONDS  how long finished jobs and their output are kept (default 3600)
+"""
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import streamlit as st
+
+from .session_memo import get_session_memo, text_size
+from .streaming import TimedStream
+from .telemetry import Trace
+
+logger = logging.getLogger(__name__)
+
+# Seconds between refreshes of a running job's output.
+REFRESH_SECONDS = 0.5
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class JobView(NamedTuple):
+    id: str
+    name: str
+    status: str
+    stage: str
+    seconds: float
+    blocks: List[tuple]
+    error: Optional[str]
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+class Job:
+    """One pipeline run: its status, current stage, notes, output so far and trace.
+
+    Output is a list of blocks, shown in order: ``("caption", text)``,
+    ``("output", title, text)`` and ``("columns", {title: (text, note)})``.
+    """
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.status = "queued"
+        self.stage = "Waiting for a worker..."
+        self.error: Optional[str] = None
+        self.result = None
+        self.trace: Optional[Trace] = None
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._blocks: List[list] = []
+        self._lock = threading.Lock()
+
+    def set_stage(self, stage: str) -> None:
+        with self._lock:
+            self.stage = stage
+
+    def caption(self, text: str) -> None:
+        with self._lock:
+            self._blocks.append(["caption", text])
+
+    def section(self, title: str = "") -> None:
+        """Start a new output block; ``write`` appends to the latest one."""
+        with self._lock:
+            self._blocks.append(["output", title, ""])
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            if not self._blocks or self._blocks[-1][0] != "output":
+                self._blocks.append(["output", "", ""])
+            self._blocks[-1][2] += text
+
+    def columns(self, titles: List[str]) -> None:
+        """Start a block of side-by-side outputs, filled in with ``write_column``."""
+        with self._lock:
+            self._blocks.append(["columns", {title: (None, "") for title in titles}])
+
+    def write_column(self, title: str, text: str, note: str = "") -> None:
+        with self._lock:
+            block = next(block for block in reversed(self._blocks) if block[0] == "columns" and title in block[1])
+            block[1][title] = (text, note)
+
+    def run(self, assistant, message: str, stream: bool = True, stage: str = "Writing...") -> str:
+        """Run ``assistant`` on ``message`` into the latest output block and return the text.
+
+        With ``stream`` set, chunks show up as they arrive; otherwise the full
+        response shows up once it is complete. Either way the time to first
+        token is noted next to the total latency.
+        """
+        self.set_stage(stage)
+        started = time.perf_counter()
+        timed = TimedStream(assistant.run(message, stream=True) if stream else [assistant.run(message, stream=False)], started)
+        parts = []
+        for chunk in timed:
+            parts.append(chunk)
+            self.write(chunk)
+        self.caption(timed.summary())
+        logger.info("%s: first_token=%.3fs total=%.3fs stream=%s", assistant.name, timed.first_token, timed.total, stream)
+        return "".join(parts)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def size(self) -> int:
+        """Characters of output, notes, result and trace the job holds."""
+        with self._lock:
+            blocks = sum(
+                sum(len(text or "") + len(note) for text, note in block[1].values()) if block[0] == "columns" else sum(map(len, block[1:]))
+                for block in self._blocks
+            )
+        return blocks + text_size(self.result) + text_size(self.trace)
+
+    def view(self) -> JobView:
+        """A consistent copy of the job's state for rendering from another thread."""
+        with self._lock:
+            blocks = [tuple(dict(part) if isinstance(part, dict) else part for part in block) for block in self._blocks]
+            end = self.finished or time.time()
+            seconds = end - self.started if self.started else end - self.submitted
+            return JobView(self.id, self.name, self.status, self.stage, seconds, blocks, self.error)
+
+
+class JobQueue:
+    """A bounded queue of jobs and the worker threads that run them, shared by every session."""
+
+    def __init__(self, workers: int = 4, max_queued: int = 16, retention_seconds: float = 3600):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self.completed = 0
+        self.failed = 0
+        self.refused = 0
+        self._jobs: Dict[str, Job] = {}
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        for number in range(workers):
+            threading.Thread(target=self._work, name=f"job-worker-{number}", daemon=True).start()
+
+    def submit(self, name: str, function: Callable[[Job], object]) -> Job:
+        """Queue ``function(job)`` and return the job; raise ``QueueFull`` if too many jobs are waiting."""
+        with self._lock:
+            self._prune()
+            if sum(job.status == "queued" for job in self._jobs.values()) >= self.max_queued:
+                self.refused += 1
+                raise QueueFull(f"{self.max_queued} jobs are already waiting; try again in a moment.")
+            job = Job(name)
+            self._jobs[job.id] = job
+        self._queue.put((job, function))
+        logger.info("job %s (%s) queued", job.id, name)
+        return job
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id) if job_id else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def summary(self) -> str:
+        counts = self.counts()
+        return (
+            f"Jobs: {counts['running']} running of {self.workers} workers · {counts['queued']} queued "
+            f"(max {self.max_queued}) · {counts['done'] + counts['failed']} finished kept {self.retention_seconds / 60:g} min"
+        )
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def _work(self) -> None:
+        while True:
+            job, function = self._queue.get()
+            job.status, job.started = "running", time.time()
+            job.set_stage("Starting...")
+            try:
+                with Trace(job.name) as trace:
+                    job.trace = trace
+                    job.result = function(job)
+                job.status = "done"
+                self.completed += 1
+            except Exception as e:
+                logger.exception("job %s (%s) failed", job.id, job.name)
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+                self.failed += 1
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
+            logger.info("job %s (%s) %s in %.2fs", job.id, job.name, job.status, job.finished - job.started)
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue shared by every session."""
+    return JobQueue(
+        workers=int(os.environ.get("JOB_WORKERS", 4)),
+        max_queued=int(os.environ.get("JOB_QUEUE_DEPTH", 16)),
+        retention_seconds=float(os.environ.get("JOB_RETENTION_SECONDS", 3600)),
+    )
+
+
+def _show(job: Job, reused: bool) -> None:
+    st.session_state.job_id = job.id
+    st.session_state.job_reused = reused
+    # In the URL too, so a reloaded or reconnecting page finds the job again.
+    st.query_params["job"] = job.id
+
+
+def start_job(jobs: JobQueue, name: str, function: Callable[[Job], object], key: Optional[Tuple] = None, reuse: bool = True) -> Optional[Job]:
+    """Submit a job and make it this session's current job, or show why it was refused.
+
+    With ``key`` set, the job is kept in the session's results memo, and with
+    ``reuse`` set a job kept for the same key that did not fail is shown again
+    instead of a new one.
+    """
+    results = get_session_memo("results")
+    earlier = results.get(key) if key is not None and reuse else None
+    if earlier is not None and earlier.status != "failed":
+        _show(earlier, reused=True)
+        return earlier
+    try:
+        job = jobs.submit(name, function)
+    except QueueFull as e:
+        st.error(str(e))
+        return None
+    if key is not None:
+        results.put(key, job)
+    _show(job, reused=False)
+    return job
+
+
+def current_job(jobs: JobQueue) -> Optional[Job]:
+    """Return this session's current job, from the session or the page URL, if it is still kept."""
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    # The session keeps its results after the queue has dropped them.
+    return jobs.get(job_id) or next((job for job in get_session_memo("results").values() if job.id == job_id), None)
+
+
+def render_history() -> None:
+    """A sidebar picker of the results this session still keeps, newest first."""
+    results = get_session_memo("results")
+    entries = {job.id: key for key, job in results.items()}
+    if not entries:
+        return
+
+    def label(job_id: str) -> str:
+        model_id, *inputs = entries[job_id]
+        return f"{' · '.join(value for value in inputs if value)} ({model_id})"
+
+    def pick() -> None:
+        job = next((job for job in results.values() if job.id == st.session_state.history_pick), None)
+        if job is not None:
+            _show(job, reused=True)
+
+    st.sidebar.selectbox("Earlier results", list(entries), index=None, format_func=label, key="history_pick", on_change=pick, placeholder="Show an earlier result")
+    st.sidebar.caption(f"Session results: {results.summary()}")
+
+
+def _render_blocks(view: JobView) -> None:
+    for block in view.blocks:
+        if block[0] == "caption":
+            st.caption(block[1])
+        elif block[0] == "output":
+            if block[1]:
+                st.write(block[1])
+            if block[2]:
+                st.markdown(block[2])
+        else:
+            for column, (title, (text, note)) in zip(st.columns(len(block[1])), block[1].items()):
+                column.markdown(f"**{title}**")
+                if text is None:
+                    column.caption("Writing...")
+                else:
+                    column.write(text)
+                    if note:
+                        column.caption(note)
+
+
+def render_job(job: Optional[Job]) -> None:
+    """Show ``job``'s output so far and its stage, refreshing while it runs.
+
+    Once the job is finished, the app reruns once and the job's trace becomes
+    the session's last trace.
+    """
+    if job is None:
+        return
+    if st.session_state.get("job_reused"):
+        st.caption("Shown again from this session's results.")
+    if job.done:
+        _render_blocks(job.view())
+        if job.error:
+            st.error(f"{job.name} failed: {job.error}")
+        st.session_state.last_trace = job.trace
+        return
+
+    @st.fragment(run_every=REFRESH_SECONDS)
+    def running() -> None:
+        view = job.view()
+        _render_blocks(view)
+        if view.done:
+            # The sidebar and the trace are outside this fragment.
+            st.rerun()
+        st.caption(f"⏳ {view.stage} ({view.seconds:.0f}s)")
+
+    running()
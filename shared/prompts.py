@@ -0,0 +1,135 @@
+"""Prompts that start the same way on every request, so provider prompt caches match them.
+
+OpenAI, Groq and Gemini serve a prompt prefix they have seen recently from a
+cache: those tokens are billed at a discount and skip most of the time to
+first token. A prefix only matches up to the first token that differs. The
+assistants set ``add_datetime_to_instructions``, which phi writes as
+``The current time is <datetime.now()>``, down to the microsecond, among the
+system prompt's instructions, so everything after it (the remaining
+instructions, the chat history and the message) never matched.
+
+``stable_prefix`` turns that off and ends every message with the date
+instead, at ``PROMPT_DATE_GRANULARITY``: the tool definitions and the system
+prompt are then the same for every request to an assistant. Callers put what
+several requests share (research, an outline) before what differs between
+them (a style, a day, a section) for the same reason. The cached prompt tokens
+providers report are recorded on every model span by ``telemetry``.
+
+The writers and planners also set ``add_chat_history_to_prompt``, so phi
+replayed their last three messages after every message. When every session
+of the process shared these assistants, a generation carried the full-length
+posts or itineraries of whichever session ran before it, and phi kept every
+run's messages, tool calls and response times for as long as the process
+lived. ``without_chat_history`` turns the replay off and drops all of it after
+each run. Apps whose
+assistants wanted the history add the session's own earlier turns from a
+``conversation.ConversationMemory`` instead. Each request now builds its own
+assistants (see ``app_assistants``), so no other run ever sees that state.
+
+Settings come from the environment:
+    PROMPT_DATE_GRANULARITY  date added to the end of each message: day, hour, minute or off (default day)
+"""
+import functools
+import os
+from datetime import datetime
+from typing import Optional
+
+DATE_FORMATS = {
+    "day": "The current date is %Y-%m-%d (%A).",
+    "hour": "The current time is %Y-%m-%d %H:00.",
+    "minute": "The current time is %Y-%m-%d %H:%M.",
+}
+
+
+def current_date(granularity: Optional[str] = None) -> str:
+    """The date line for ``granularity`` (default ``PROMPT_DATE_GRANULARITY``), or "" when it is off."""
+    granularity = (granularity or os.environ.get("PROMPT_DATE_GRANULARITY") or "day").lower()
+    if granularity == "off":
+        return ""
+    if granularity not in DATE_FORMATS:
+        raise ValueError(f"PROMPT_DATE_GRANULARITY must be one of {', '.join(DATE_FORMATS)} or off, not {granularity!r}")
+    return datetime.now().strftime(DATE_FORMATS[granularity])
+
+
+def dated(message):
+    """``message`` with the date line at its end; messages that are not text are left alone."""
+    date = current_date()
+    if not date or not isinstance(message, str):
+        return message
+    return f"{message}\n\n{date}"
+
+
+def wants_date(assistant) -> bool:
+    """Whether ``assistant`` was built to know the date, before or after ``stable_prefix``."""
+    return bool(getattr(assistant, "add_datetime_to_instructions", False) or getattr(assistant, "_stable_prefix", False))
+
+
+def stable_prefix(assistant):
+    """Move ``assistant``'s datetime instruction to the end of each message; return the assistant."""
+    if getattr(assistant, "_stable_prefix", False) or not getattr(assistant, "add_datetime_to_instructions", False):
+        return assistant
+    # phi assistants are pydantic objects that reject unknown attributes, so
+    # the wrapper is stored on the instance directly.
+    object.__setattr__(assistant, "_stable_prefix", True)
+    assistant.add_datetime_to_instructions = False
+    run = assistant.run
+
+    @functools.wraps(run)
+    def wrapper(message=None, stream: bool = True, **kwargs):
+        return run(dated(message), stream=stream, **kwargs)
+
+    object.__setattr__(assistant, "run", wrapper)
+    return assistant
+
+
+def wants_history(assistant) -> bool:
+    """Whether ``assistant`` was built to see earlier turns, before or after ``without_chat_history``.
+
+    A routed assistant wants them when any of its backends does.
+    """
+    backends = getattr(assistant, "assistants", None)
+    if isinstance(backends, dict):
+        return any(wants_history(backend) for backend in backends.values())
+    return bool(getattr(assistant, "add_chat_history_to_prompt", False) or getattr(assistant, "_wants_history", False))
+
+
+def _forget(assistant) -> None:
+    memory = assistant.memory
+    memory.chat_history, memory.llm_messages, memory.references = [], [], []
+    llm = assistant.llm
+    if llm is not None:
+        # The LLM keeps every tool call with its full result, and every response time.
+        llm.function_call_stack = None
+        llm.metrics = {}
+        if getattr(llm, "function_declarations", None):
+            # Gemini adds the tools' declarations again on every run; the next run re-adds them.
+            llm.function_declarations = None
+
+
+def without_chat_history(assistant):
+    """Stop phi replaying ``assistant``'s chat history and keeping its messages after a run; return the assistant."""
+    if getattr(assistant, "_without_chat_history", False) or getattr(assistant, "memory", None) is None:
+        return assistant
+    object.__setattr__(assistant, "_without_chat_history", True)
+    object.__setattr__(assistant, "_wants_history", wants_history(assistant))
+    assistant.add_chat_history_to_prompt = False
+    run = assistant.run
+
+    @functools.wraps(run)
+    def wrapper(message=None, stream: bool = True, **kwargs):
+        if not stream:
+            try:
+                return run(message, stream=False, **kwargs)
+            finally:
+                _forget(assistant)
+
+        def chunks():
+            try:
+                yield from run(message, stream=True, **kwargs)
+            finally:
+                _forget(assistant)
+
+        return chunks()
+
+    object.__setattr__(assistant, "run", wrapper)
+    return assistant
@@ -0,0 +1,284 @@
+"""Process-wide rate limiting of model calls, per provider and model.
+
+Every assistant used to call its provider as fast as it could, and a 429 from
+Groq or Gemini failed the whole run. ``rate_limited`` routes an assistant's
+model requests through the shared ``RateLimiter`` of its provider and model:
+
+* token buckets for requests and tokens per minute keep the process under the
+  quota, so calls wait in a queue instead of failing;
+* on every 429 the concurrency limit halves and the request rate drops by a
+  quarter; both grow back after runs of successful calls (AIMD), so a quota
+  set too high converges on what the provider actually allows;
+* a 429 pauses every caller of that model for the ``retry-after`` time or a
+  jittered backoff, and the call is retried, so one rejection does not turn
+  into an error storm.
+
+Settings come from the environment. The quotas can be set per model, with the
+model id upper-cased and every other character than letters and digits
+turned into ``_`` (RATE_LIMIT_RPM_LLAMA_3_3_70B_VERSATILE), or for every
+model at once:
+    RATE_LIMIT_RPM_<MODEL>      requests per minute of one model
+    RATE_LIMIT_TPM_<MODEL>      tokens per minute of one model
+    RATE_LIMIT_RPM              requests per minute of the other models (default per model below)
+    RATE_LIMIT_TPM              tokens per minute of the other models (default per model below)
+    RATE_LIMIT_MAX_CONCURRENCY  concurrent requests before any 429 (default 8)
+    RATE_LIMIT_MAX_RETRIES      retries of a rate-limited call (default 5)
+"""
+import functools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Optional
+
+from .tokens import estimate_tokens, prompt_tokens, reported_usage, response_text
+
+logger = logging.getLogger(__name__)
+
+# (requests per minute, tokens per minute) of the default API tiers.
+DEFAULT_LIMITS = {
+    ("openai", "gpt-4o"): (500, 30000),
+    ("groq", "llama-3.3-70b-versatile"): (30, 12000),
+    ("groq", "mixtral-8x7b-32768"): (30, 5000),
+    ("google", "gemini-1.5-flash"): (15, 1000000),
+}
+_FALLBACK_LIMITS = (60, 100000)
+
+
+class RateLimited(Exception):
+    """Raised when a call is still rate limited after every retry."""
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Recognize a 429 from the OpenAI, Groq and Google SDKs."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return status == 429 or type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int = 8, max_retries: int = 5,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.concurrency = max_concurrency
+        # Share of ``rpm`` currently allowed, lowered on 429s.
+        self.rate = 1.0
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._requests = self._burst()
+        self._tokens = float(tpm)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def _burst(self) -> float:
+        # At most one second of requests at once: providers also enforce their limits over short windows.
+        return max(1.0, self.rpm * self.rate / 60)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled
+        self._refilled = now
+        self._requests = min(self._burst(), self._requests + elapsed * self.rpm * self.rate / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens: int) -> float:
+        """Wait for a request slot and ``tokens`` of quota; return the seconds waited."""
+        tokens = min(tokens, self.tpm)
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                waits = [self._paused_until - now]
+                if self._requests < 1:
+                    waits.append((1 - self._requests) * 60 / (self.rpm * self.rate))
+                if self._tokens < tokens:
+                    waits.append((tokens - self._tokens) * 60 / self.tpm)
+                wait = max(waits)
+                if wait <= 0 and self.in_flight < self.concurrency:
+                    break
+                # A finished call notifies; otherwise wake up when the buckets have refilled.
+                self._cond.wait(wait if wait > 0 else None)
+            self._requests -= 1
+            self._tokens -= tokens
+            self.in_flight += 1
+            waited = time.monotonic() - started
+            self.calls += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        if waited > 0.05:
+            logger.info("%s: waited %.2fs in queue (%d in flight, limit %d)", self.name, waited, self.in_flight, self.concurrency)
+        return waited
+
+    def release(self, ok: bool = True, used_tokens: int = 0) -> None:
+        """Give the slot back and charge ``used_tokens`` beyond the estimate to the bucket."""
+        with self._cond:
+            self.in_flight -= 1
+            self._tokens -= used_tokens
+            if ok:
+                self._successes += 1
+                if self._successes >= self.concurrency:
+                    self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                    self.rate = min(1.0, self.rate * 1.1)
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def on_rate_limited(self, attempt: int, delay: Optional[float] = None) -> float:
+        """Back off after a 429: halve concurrency and pause every caller; return the pause."""
+        if delay is None:
+            # Full jitter keeps waiting callers from retrying in lockstep.
+            delay = random.uniform(self.base_backoff, min(self.max_backoff, self.base_backoff * 2 ** (attempt + 1)))
+        with self._cond:
+            self.throttled += 1
+            self.concurrency = max(1, self.concurrency // 2)
+            self.rate = max(0.1, self.rate * 0.75)
+            self._successes = 0
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._requests = min(self._requests, 0.0)
+            self._cond.notify_all()
+        logger.warning(
+            "%s: rate limited, pausing %.1fs (concurrency %d, %.0f rpm)", self.name, delay, self.concurrency, self.rpm * self.rate
+        )
+        return delay
+
+    def summary(self) -> str:
+        average = self.total_wait / self.calls if self.calls else 0.0
+        return (
+            f"Rate limiter ({self.name}): {self.calls} calls, {self.throttled} rate limited, "
+            f"queue wait avg {average:.2f}s / max {self.max_wait:.2f}s, concurrency {self.concurrency}/{self.max_concurrency}, "
+            f"rate {self.rpm * self.rate:.0f}/{self.rpm} rpm"
+        )
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _quota(name: str, model_id: str, default: int) -> int:
+    """``name`` for ``model_id`` from the environment: its per-model variable, then ``name``, then ``default``."""
+    per_model = f"{name}_{re.sub(r'[^A-Z0-9]', '_', model_id.upper())}"
+    return int(os.environ.get(per_model) or os.environ.get(name) or default)
+
+
+def get_limiter(provider: str, model_id: str) -> RateLimiter:
+    """Return the limiter shared by every assistant of ``provider``/``model_id`` in this process."""
+    with _limiters_lock:
+        if (provider, model_id) not in _limiters:
+            rpm, tpm = DEFAULT_LIMITS.get((provider, model_id), _FALLBACK_LIMITS)
+            _limiters[(provider, model_id)] = RateLimiter(
+                f"{provider}/{model_id}",
+                rpm=_quota("RATE_LIMIT_RPM", model_id, rpm),
+                tpm=_quota("RATE_LIMIT_TPM", model_id, tpm),
+                max_concurrency=int(os.environ.get("RATE_LIMIT_MAX_CONCURRENCY", 8)),
+                max_retries=int(os.environ.get("RATE_LIMIT_MAX_RETRIES", 5)),
+            )
+        return _limiters[(provider, model_id)]
+
+
+def _used_tokens(model_id: str, estimate: int, reported: tuple, text: str) -> int:
+    """Tokens a call used: as reported by the provider, else the prompt estimate plus the output's."""
+    prompt, completion = reported[:2]
+    return (prompt or estimate) + (completion or estimate_tokens(text, model_id))
+
+
+def _limited_invoke(limiter: RateLimiter, model_id: str, invoke):
+    @functools.wraps(invoke)
+    def wrapper(*args, **kwargs):
+        estimate = prompt_tokens(model_id, args, kwargs)
+        for attempt in range(limiter.max_retries + 1):
+            limiter.acquire(estimate)
+            try:
+                response = invoke(*args, **kwargs)
+            except Exception as e:
+                limiter.release(ok=False)
+                if not is_rate_limit_error(e):
+                    raise
+                if attempt == limiter.max_retries:
+                    raise RateLimited(f"{limiter.name}: still rate limited after {attempt} retries") from e
+                time.sleep(limiter.on_rate_limited(attempt, retry_after(e)))
+                continue
+            used = _used_tokens(model_id, estimate, reported_usage(response), response_text(response))
+            limiter.release(ok=True, used_tokens=max(0, used - estimate))
+            return response
+
+    return wrapper
+
+
+def _limited_invoke_stream(limiter: RateLimiter, model_id: str, invoke_stream):
+    @functools.wraps(invoke_stream)
+    def wrapper(*args, **kwargs):
+        estimate = prompt_tokens(model_id, args, kwargs)
+        for attempt in range(limiter.max_retries + 1):
+            limiter.acquire(estimate)
+            reported, text = (0, 0, 0), []
+            started = released = False
+            try:
+                for chunk in invoke_stream(*args, **kwargs):
+                    started = True
+                    reported = tuple(max(seen, now) for seen, now in zip(reported, reported_usage(chunk)))
+                    text.append(response_text(chunk))
+                    yield chunk
+                return
+            except Exception as e:
+                # A stream cut off midway still used the tokens it produced.
+                used = _used_tokens(model_id, estimate, reported, "".join(text)) if started else estimate
+                limiter.release(ok=False, used_tokens=max(0, used - estimate))
+                released = True
+                # Only a rejection before the first chunk can be retried transparently.
+                if started or not is_rate_limit_error(e):
+                    raise
+                if attempt == limiter.max_retries:
+                    raise RateLimited(f"{limiter.name}: still rate limited after {attempt} retries") from e
+                time.sleep(limiter.on_rate_limited(attempt, retry_after(e)))
+            finally:
+                # Also reached when the caller stops reading early: charge what was streamed so far.
+                if not released:
+                    used = _used_tokens(model_id, estimate, reported, "".join(text))
+                    limiter.release(ok=True, used_tokens=max(0, used - estimate))
+
+    return wrapper
+
+
+def assistant_llm(assistant):
+    """The LLM ``assistant`` runs on, or None for objects that are not phi assistants.
+
+    An assistant built without ``llm`` gets phi's default one on its first run;
+    ``update_llm`` sets it now instead, so it can be wrapped like any other.
+    """
+    if getattr(assistant, "llm", None) is None and hasattr(assistant, "update_llm"):
+        assistant.update_llm()
+    return getattr(assistant, "llm", None)
+
+
+def rate_limited(assistant, provider: str, model_id: str):
+    """Route the model requests of ``assistant`` through the shared limiter; return the assistant."""
+    llm = assistant_llm(assistant)
+    if llm is None or getattr(llm, "_rate_limiter", None) is not None:
+        return assistant
+    limiter = get_limiter(provider, model_id)
+    # phi models are pydantic objects that reject unknown attributes, so the
+    # wrappers are stored on the instance directly.
+    object.__setattr__(llm, "_rate_limiter", limiter)
+    object.__setattr__(llm, "invoke", _limited_invoke(limiter, model_id, llm.invoke))
+    object.__setattr__(llm, "invoke_stream", _limited_invoke_stream(limiter, model_id, llm.invoke_stream))
+    return assistant
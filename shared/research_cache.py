@@ -0,0 +1,221 @@
+"""On-disk cache of researcher output.
+
+Research is the slowest stage of every pipeline (several SerpApi searches plus
+an LLM analysis) and repeat topics are common. Results are stored in SQLite,
+keyed by the normalized prompt inputs, the model id and a fingerprint of the
+researcher's description and instructions, so editing a prompt invalidates the
+entries it produced. Entries expire after a TTL and the least recently used ones
+are evicted once the cache holds more than ``max_entries``.
+
+A request whose exact key misses can still reuse research stored for a
+similar one ("AI for healthcare" for "healthcare professionals" after "AI in
+healthcare" for "doctors"): every model and fingerprint has an in-memory
+``SemanticIndex`` of the stored inputs, rebuilt from SQLite on first use, and
+the closest entry at or above the similarity threshold is returned instead.
+The index and NumPy are imported on that first use too, not with this module.
+
+Settings come from the environment:
+    RESEARCH_CACHE_PATH         SQLite file (default ~/.cache/agentic-ai/research.sqlite3)
+    RESEARCH_CACHE_TTL          seconds before an entry expires (default 86400)
+    RESEARCH_CACHE_MAX_ENTRIES  entries kept before LRU eviction (default 1000)
+    RESEARCH_CACHE_SIMILARITY   similarity needed to reuse another request's research,
+                                1 for exact matches only (default 0.5)
+    RESEARCH_CACHE_SUBJECT_SIMILARITY
+                                similarity the first input (topic, destination) needs on
+                                its own when a request has several (default 0.8)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import streamlit as st
+
+from .telemetry import record_cache, span
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "agentic-ai", "research.sqlite3")
+
+
+def normalize(value) -> str:
+    """Case-fold and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(str(value).casefold().split())
+
+
+def instructions_fingerprint(assistant) -> str:
+    """Fingerprint the parts of an assistant that shape its research output."""
+    payload = json.dumps(
+        [assistant.name, assistant.description, assistant.instructions],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ResearchCache:
+    """SQLite-backed research cache with TTL expiry, LRU eviction, similarity lookup and hit/miss counters."""
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = 86400, max_entries: int = 1000, similarity: float = 0.5,
+                 subject_similarity: float = 0.8):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.subject_similarity = subject_similarity
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # A SemanticIndex per (model id, fingerprint), built on first use.
+        self._indexes: Dict[Tuple[str, str], object] = {}
+        # A bare file name is in the working directory, which exists
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS research (
+                    key TEXT PRIMARY KEY,
+                    model_id TEXT NOT NULL,
+                    inputs TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL DEFAULT '',
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(research)")}
+            if "fingerprint" not in columns:
+                # Caches written before similarity lookup; their rows still serve exact hits.
+                self._conn.execute("ALTER TABLE research ADD COLUMN fingerprint TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS research_accessed_at ON research (accessed_at)")
+
+    @staticmethod
+    def make_key(model_id: str, fingerprint: str, *inputs) -> str:
+        payload = json.dumps([model_id, fingerprint, [normalize(value) for value in inputs]])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT result, created_at FROM research WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            result, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM research WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE research SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: str, model_id: str, *inputs, fingerprint: str = "") -> None:
+        now = time.time()
+        normalized = [normalize(value) for value in inputs]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO research (key, model_id, inputs, fingerprint, result, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model_id, json.dumps(normalized), fingerprint, result, now, now),
+            )
+            if (model_id, fingerprint) in self._indexes:
+                self._indexes[model_id, fingerprint].add(normalized)
+            self._evict("created_at < ?", (now - self.ttl,))
+            self._evict("key IN (SELECT key FROM research ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def _evict(self, where: str, params: tuple) -> None:
+        """Delete the matching rows and drop them from the similarity indexes; call with the lock held."""
+        for model_id, fingerprint, inputs in self._conn.execute(f"SELECT model_id, fingerprint, inputs FROM research WHERE {where}", params).fetchall():
+            if (model_id, fingerprint) in self._indexes:
+                self._indexes[model_id, fingerprint].remove(json.loads(inputs))
+        self._conn.execute(f"DELETE FROM research WHERE {where}", params)
+
+    def _index(self, model_id: str, fingerprint: str):
+        from .semantic_index import SemanticIndex
+
+        with self._lock:
+            index = self._indexes.get((model_id, fingerprint))
+            if index is None:
+                index = self._indexes[model_id, fingerprint] = SemanticIndex(subject_threshold=self.subject_similarity)
+                rows = self._conn.execute(
+                    "SELECT inputs FROM research WHERE model_id = ? AND fingerprint = ? ORDER BY created_at",
+                    (model_id, fingerprint),
+                )
+                for (inputs,) in rows:
+                    index.add(json.loads(inputs))
+            return index
+
+    def get_similar(self, model_id: str, fingerprint: str, inputs: tuple, threshold: Optional[float] = None) -> Optional[str]:
+        """Return research stored for the inputs most similar to ``inputs``, or None."""
+        threshold = self.similarity if threshold is None else threshold
+        if threshold >= 1:
+            return None
+        index = self._index(model_id, fingerprint)
+        match = index.lookup([normalize(value) for value in inputs], threshold)
+        if match is None:
+            return None
+        result = self.get(self.make_key(model_id, fingerprint, *match.inputs))
+        if result is None:
+            # Expired since it was indexed; only the exact lookup counts as a miss.
+            index.remove(match.inputs)
+            with self._lock:
+                self.misses -= 1
+            return None
+        with self._lock:
+            # ``get`` counted the matched entry as a hit and the exact lookup as a miss.
+            self.hits -= 1
+            self.misses -= 1
+            self.similar_hits += 1
+        return result
+
+    def get_or_run(
+        self, model_id: str, fingerprint: str, inputs: tuple, run: Callable[[], str], refresh: bool = False,
+        similarity: Optional[float] = None,
+    ) -> Tuple[str, bool]:
+        """Return ``(result, hit)``, calling ``run`` and storing its output on a miss.
+
+        An exact miss falls back to the research of the most similar stored
+        inputs at or above ``similarity`` (default: the cache's threshold).
+        With ``refresh`` set the lookup is skipped and the stored entry is replaced.
+        """
+        key = self.make_key(model_id, fingerprint, *inputs)
+        with span("research"):
+            result = None if refresh else self.get(key)
+            outcome = "refresh" if refresh else "miss" if result is None else "hit"
+            if outcome == "miss":
+                result = self.get_similar(model_id, fingerprint, inputs, similarity)
+                outcome = "miss" if result is None else "similar"
+            record_cache("research", outcome)
+            if result is not None:
+                return result, True
+            result = run()
+        # Empty or non-text responses are usually failures; don't pin them for a whole TTL.
+        if isinstance(result, str) and result.strip():
+            self.put(key, result, model_id, *inputs, fingerprint=fingerprint)
+        return result, False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM research").fetchone()[0]
+
+    def summary(self) -> str:
+        return f"Research cache: {self.hits} hits · {self.similar_hits} similar · {self.misses} misses · {len(self)} stored"
+
+
+@st.cache_resource(show_spinner=False)
+def get_research_cache() -> ResearchCache:
+    """Return the process-wide research cache shared by every session."""
+    return ResearchCache(
+        path=os.environ.get("RESEARCH_CACHE_PATH", DEFAULT_PATH),
+        ttl=float(os.environ.get("RESEARCH_CACHE_TTL", 86400)),
+        max_entries=int(os.environ.get("RESEARCH_CACHE_MAX_ENTRIES", 1000)),
+        similarity=float(os.environ.get("RESEARCH_CACHE_SIMILARITY", 0.5)),
+        subject_similarity=float(os.environ.get("RESEARCH_CACHE_SUBJECT_SIMILARITY", 0.8)),
+    )
@@ -0,0 +1,179 @@
+"""The part of the page every research app draws around its own inputs and output.
+
+The Blog Writer, LinkedIn Post Writer and Travel Agent launchers research a
+request with SerpApi, then write from the research. ``render_research_page``
+draws what their pages share before the app's own settings and inputs: the
+title, the backend, the API key check, the preload and the sidebar settings
+of the research and of the prompt. It returns a ``ResearchPage`` with those
+settings, whose ``assistants`` builds the assistants of a request (see
+``app_assistants``), whose ``research`` runs a job's research step and whose
+``render_footer`` draws the job, the history and the sidebar summaries.
+"""
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import streamlit as st
+
+from .app_assistants import build_assistants, build_fanout_researcher, build_routed_assistants
+from .backends import preload
+from .context_budget import default_budget
+from .jobs import current_job, render_history, render_job
+from .rate_limit import get_limiter
+from .research_cache import ResearchCache, get_research_cache, instructions_fingerprint
+from .router import API_KEY_ENV, ROUTED, get_router, pick_backend, serving_backends
+from .search_cache import SEARCH_CACHE
+from .telemetry import render_trace, start_metrics_server
+from .tokens import CONTEXT_WINDOWS
+
+
+class ResearchPage:
+    """The backend and the research and prompt settings of one run of a research app's page."""
+
+    def __init__(
+        self,
+        app: str,
+        backend: str,
+        backends: Dict[str, Tuple[str, str, str]],
+        serp_api_key: str,
+        stream_output: bool,
+        parallel_search: bool,
+        hedge: bool,
+        research_cache: ResearchCache,
+        use_research_cache: bool,
+        research_similarity: float,
+        prompt_budget: int,
+    ):
+        self.app = app
+        self.backend = backend
+        self.backends = backends
+        self.routed = backend == ROUTED
+        # Routed research is cached under the router, whichever backend produced it
+        self.model = ROUTED if self.routed else backend.split("/", 1)[1]
+        self.serp_api_key = serp_api_key
+        self.stream_output = stream_output
+        self.parallel_search = parallel_search
+        self.hedge = hedge
+        self.research_cache = research_cache
+        self.use_research_cache = use_research_cache
+        self.research_similarity = research_similarity
+        self.prompt_budget = prompt_budget
+
+    def assistants(self, builders, stages: Sequence[str]) -> tuple:
+        """Build the (researcher, writer) of ``builders`` for one request on this page's backend, routed or not."""
+        if self.routed:
+            return build_routed_assistants(self.app, builders, stages, self.serp_api_key, parallel_search=self.parallel_search, hedge=self.hedge)
+        provider, model_id, api_key = self.backends[self.backend]
+        researcher, writer = build_assistants(builders, provider, model_id, api_key, self.serp_api_key)
+        if self.parallel_search:
+            researcher = build_fanout_researcher(researcher, provider, model_id, api_key, self.serp_api_key)
+        return researcher, writer
+
+    def research(self, job, researcher, request: tuple, message: str) -> str:
+        """Research ``request`` with ``message``, reusing stored research for a repeat topic."""
+        job.set_stage("Researching...")
+        results, cached = self.research_cache.get_or_run(
+            self.model,
+            instructions_fingerprint(researcher),
+            request,
+            lambda: researcher.run(message, stream=False),
+            refresh=not self.use_research_cache,
+            similarity=self.research_similarity,
+        )
+        if cached:
+            job.caption("Research loaded from cache.")
+        elif self.routed and researcher.last_backend:
+            job.caption(f"Research by {researcher.last_backend}.")
+        return results
+
+    def render_footer(self, jobs) -> None:
+        """Draw this session's current job and history, then the sidebar summaries and the last trace."""
+        # This session's current job, shown on every rerun until it expires
+        render_job(current_job(jobs))
+        render_history()
+
+        st.sidebar.caption(self.research_cache.summary())
+        st.sidebar.caption(SEARCH_CACHE.summary())
+        st.sidebar.caption(jobs.summary())
+        # Kept in the session from the first request whose writer wants earlier turns
+        if "conversation" in st.session_state:
+            st.sidebar.caption(st.session_state.conversation.summary())
+        if self.routed:
+            for line in get_router(self.app).summary():
+                st.sidebar.caption(line)
+        for provider, model_id, _ in self.backends.values():
+            st.sidebar.caption(get_limiter(provider, model_id).summary())
+
+        # Where the time and tokens of this session's last run went
+        render_trace(st.session_state.get("last_trace"))
+
+
+def render_research_page(
+    app: str,
+    builders,
+    preload_modules: Sequence[str],
+    title: str,
+    caption: str,
+    routed_caption: str,
+    writer: str = "writer",
+    action: str = "writing",
+    backend: Optional[str] = None,
+) -> Optional[ResearchPage]:
+    """Draw the top of a research app's page and its shared sidebar settings; return them.
+
+    ``caption`` is shown for one backend, with ``{backend}`` replaced by its
+    name, and ``routed_caption`` when every step is routed. ``writer`` names
+    the assistant that writes from the research and ``action`` what it does.
+    Returns None, after saying which key to set, when the backend or SerpApi
+    has no API key.
+    """
+    # Serve Prometheus metrics on METRICS_PORT, if set (once per process)
+    start_metrics_server()
+
+    # Set up the Streamlit app
+    st.title(title)
+
+    backend = pick_backend(builders, backend)
+    routed = backend == ROUTED
+    backends = serving_backends(builders, backend)
+    models = [model_id for _, model_id, _ in backends.values()]
+    st.caption(routed_caption if routed else caption.format(backend=backend))
+
+    serp_api_key = os.environ.get('SERPER_API_KEY')
+    if not (backends and serp_api_key):
+        needed = "an API key of any backend" if routed else API_KEY_ENV[backend.split("/", 1)[0]]
+        st.info(f"Set {needed} and SERPER_API_KEY to start {action}.")
+        return None
+
+    # phi and this backend's SDK load in the background while the page is in use
+    preload(tuple(preload_modules), tuple(sorted({provider for provider, _, _ in backends.values()})))
+
+    # Stream the second stage so output shows up while it is being generated
+    stream_output = st.sidebar.toggle("Stream output", value=True, help="Show tokens as they arrive instead of waiting for the full response.")
+
+    # Run the researcher's searches concurrently instead of one tool call at a time
+    parallel_search = st.sidebar.toggle("Parallel search", value=True, help="Write all search terms in one model call, run the searches at once, then analyze the merged results.")
+
+    # Race a second backend when the first one is slower than usual
+    hedge = routed and st.sidebar.toggle("Hedge slow requests", value=False, help="When a step takes longer than its backend's p95 latency, send it to the next backend too and use the first answer. Streamed output is never hedged.")
+
+    # Repeat topics reuse stored research instead of searching again
+    research_cache = get_research_cache()
+    use_research_cache = st.sidebar.toggle("Reuse cached research", value=True, help="Turn off to research again and refresh the stored result.")
+    research_similarity = st.sidebar.slider("Research similarity threshold", min_value=0.3, max_value=1.0, value=research_cache.similarity, step=0.05, help="Reuse research stored for a similar request at or above this similarity; 1 reuses exact repeats only.")
+
+    # Research is trimmed to fit the smallest prompt budget of the backends
+    prompt_budget = st.sidebar.number_input(f"{writer.capitalize()} prompt budget (tokens)", min_value=1000, max_value=min(CONTEXT_WINDOWS[model_id] for model_id in models), value=min(default_budget(model_id) for model_id in models), step=1000, help=f"Longer research is deduplicated, ranked and shortened before it is sent to the {writer}.")
+
+    return ResearchPage(
+        app,
+        backend,
+        backends,
+        serp_api_key,
+        stream_output=stream_output,
+        parallel_search=parallel_search,
+        hedge=hedge,
+        research_cache=research_cache,
+        use_research_cache=use_research_cache,
+        research_similarity=research_similarity,
+        prompt_budget=prompt_budget,
+    )
@@ -0,0 +1,332 @@
+"""Route each pipeline stage to the fastest healthy provider.
+
+Every app is wired to one backend, so a slow or failing provider stalls the
+whole pipeline. A ``RoutedAssistant`` stands in for one stage (research,
+writing, ...) and holds that stage's assistant for every configured backend.
+The shared ``Router`` keeps a rolling window of latencies and errors per stage
+and backend, and each run goes to the healthy backend with the lowest median
+latency, scaled up by its error rate; backends with too few samples are tried first so every
+backend gets measured. A failed run falls over to the next backend. With
+hedging on, a non-streaming run that is still going after the primary's p95
+latency is sent to the second backend as well, and the first answer wins.
+
+Backends are plain objects with ``run(message, stream=False)``, so the router
+works the same with local fake providers (see ``benchmarks/router.py``). A
+``LazyBackends`` builds each one the first time the router tries it, so a
+run that the first backend answers builds nothing else, and a hedge backend
+is built only when the hedge fires.
+
+An app serves one backend, ``"provider/model"``, or ``ROUTED`` across every
+backend with a key set; ``pick_backend`` chooses it and ``serving_backends``
+resolves either.
+
+Settings come from the environment:
+    APP_BACKEND  backend to serve, e.g. groq/llama-3.3-70b-versatile, or routed (default: picked in the sidebar)
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Environment variables the apps read their provider keys from.
+API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "google": "GEMINI_API_KEY",
+}
+
+# The backend name that routes across every backend with a key set.
+ROUTED = "routed"
+
+
+def available_backends(builders) -> Dict[str, Tuple[str, str, str]]:
+    """Return ``{"provider/model": (provider, model_id, api_key)}`` for every backend with a key set."""
+    return {
+        f"{provider}/{model_id}": (provider, model_id, os.environ[API_KEY_ENV[provider]])
+        for provider, model_id in builders
+        if os.environ.get(API_KEY_ENV.get(provider, ""))
+    }
+
+
+def backend_names(builders) -> List[str]:
+    """Every backend an app can serve: ``"provider/model"`` for each builder, then ``ROUTED``."""
+    return [f"{provider}/{model_id}" for provider, model_id in builders] + [ROUTED]
+
+
+def serving_backends(builders, backend: str) -> Dict[str, Tuple[str, str, str]]:
+    """The backends with a key set that ``backend`` runs on: all of them for ``ROUTED``, else that one or none."""
+    if backend not in backend_names(builders):
+        raise ValueError(f"Unsupported backend {backend!r}; expected one of {', '.join(backend_names(builders))}")
+    backends = available_backends(builders)
+    return backends if backend == ROUTED else {name: spec for name, spec in backends.items() if name == backend}
+
+
+def pick_backend(builders, backend: Optional[str] = None) -> str:
+    """``backend``, else ``APP_BACKEND``, else the user's pick among the backends with a key set."""
+    backend = backend or os.environ.get("APP_BACKEND")
+    if backend:
+        return backend
+    choices = list(available_backends(builders))
+    if len(choices) > 1:
+        choices.append(ROUTED)
+    if not choices:
+        return ROUTED
+    return st.sidebar.selectbox("Model", choices, help="Routed sends each step to the fastest available model.")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class BackendStats:
+    """Rolling latency and error record of one backend for one stage."""
+
+    def __init__(self, window: int = 20):
+        self.samples: deque = deque(maxlen=window)
+        self.consecutive_errors = 0
+        self.last_error_at = 0.0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.samples.append((seconds, ok))
+        if ok:
+            self.consecutive_errors = 0
+        else:
+            self.consecutive_errors += 1
+            self.last_error_at = time.monotonic()
+
+    def latencies(self) -> List[float]:
+        return [seconds for seconds, ok in self.samples if ok]
+
+    @property
+    def p50(self) -> Optional[float]:
+        latencies = self.latencies()
+        return _percentile(latencies, 0.5) if latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        latencies = self.latencies()
+        return _percentile(latencies, 0.95) if latencies else None
+
+    @property
+    def error_rate(self) -> float:
+        return sum(not ok for _, ok in self.samples) / len(self.samples) if self.samples else 0.0
+
+
+class Router:
+    def __init__(self, min_samples: int = 3, max_error_rate: float = 0.5, cooldown: float = 60.0,
+                 hedge_after: float = 10.0, window: int = 20):
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        # Hedge delay until the primary has a p95 of its own.
+        self.hedge_after = hedge_after
+        self.window = window
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._stats: Dict[Tuple[str, str], BackendStats] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="router")
+
+    def stats(self, stage: str, backend: str) -> BackendStats:
+        with self._lock:
+            return self._stats.setdefault((stage, backend), BackendStats(self.window))
+
+    def record(self, stage: str, backend: str, seconds: float, ok: bool) -> None:
+        stats = self.stats(stage, backend)
+        with self._lock:
+            stats.record(seconds, ok)
+
+    def healthy(self, stats: BackendStats) -> bool:
+        # A backend that keeps failing sits out the cooldown, then gets one more try.
+        if stats.consecutive_errors >= 3 and time.monotonic() - stats.last_error_at < self.cooldown:
+            return False
+        return len(stats.samples) < self.min_samples or stats.error_rate <= self.max_error_rate
+
+    def order(self, stage: str, backends: List[str]) -> List[str]:
+        """Return ``backends`` best first: unmeasured, then healthy by expected latency, then unhealthy."""
+        def rank(backend: str):
+            stats = self.stats(stage, backend)
+            with self._lock:
+                measured = len(stats.latencies())
+                # Median latency per successful answer, counting the failed tries before it.
+                expected = (stats.p50 or 0.0) / max(0.05, 1 - stats.error_rate)
+                return (
+                    not self.healthy(stats),
+                    measured >= self.min_samples,
+                    measured if measured < self.min_samples else 0,
+                    expected,
+                )
+
+        return sorted(backends, key=rank)
+
+    def _timed(self, stage: str, backend: str, assistant, message: str) -> str:
+        started = time.perf_counter()
+        try:
+            result = assistant.run(message, stream=False)
+        except Exception:
+            self.record(stage, backend, time.perf_counter() - started, ok=False)
+            raise
+        self.record(stage, backend, time.perf_counter() - started, ok=True)
+        return result
+
+    def run(self, stage: str, assistants: Mapping, message: str, hedge: bool = False) -> Tuple[str, str]:
+        """Run ``message`` on the best backend, failing over in order; return (backend, text)."""
+        ranked = self.order(stage, list(assistants))
+        errors = []
+        while ranked:
+            primary = ranked.pop(0)
+            if not (hedge and ranked):
+                try:
+                    return primary, self._timed(stage, primary, assistants[primary], message)
+                except Exception as e:
+                    logger.warning("%s on %s failed, trying the next backend: %s", stage, primary, e)
+                    errors.append(f"{primary}: {e}")
+                    continue
+            # Hedged: give the primary until its p95, then race the runner-up.
+            delay = self.stats(stage, primary).p95 or self.hedge_after
+            futures = {self._pool.submit(contextvars.copy_context().run, self._timed, stage, primary, assistants[primary], message): primary}
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                secondary = ranked.pop(0)
+                self.hedges += 1
+                logger.info("%s: %s slower than %.1fs, hedging on %s", stage, primary, delay, secondary)
+                futures[self._pool.submit(contextvars.copy_context().run, self._timed, stage, secondary, assistants[secondary], message)] = secondary
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    backend = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning("%s on %s failed: %s", stage, backend, e)
+                        errors.append(f"{backend}: {e}")
+                        continue
+                    if backend != primary:
+                        self.hedge_wins += 1
+                    # The slower request keeps running in the background; its result is dropped.
+                    return backend, result
+        raise RuntimeError(f"{stage}: every backend failed ({'; '.join(errors)})")
+
+    def stream(self, stage: str, assistants: Mapping, message: str) -> Iterator[str]:
+        """Stream from the best backend; fail over only while nothing has been yielded yet."""
+        errors = []
+        for backend in self.order(stage, list(assistants)):
+            started = time.perf_counter()
+            yielded = False
+            try:
+                for chunk in assistants[backend].run(message, stream=True):
+                    yielded = True
+                    yield chunk
+            except Exception as e:
+                self.record(stage, backend, time.perf_counter() - started, ok=False)
+                if yielded:
+                    raise
+                logger.warning("%s on %s failed, trying the next backend: %s", stage, backend, e)
+                errors.append(f"{backend}: {e}")
+                continue
+            self.record(stage, backend, time.perf_counter() - started, ok=True)
+            return
+        raise RuntimeError(f"{stage}: every backend failed ({'; '.join(errors)})")
+
+    def summary(self) -> List[str]:
+        """One line per stage and backend, for the sidebar."""
+        with self._lock:
+            items = sorted(self._stats.items())
+        lines = []
+        for (stage, backend), stats in items:
+            if not stats.samples:
+                continue
+            p50, p95 = stats.p50, stats.p95
+            latency = f"p50 {p50:.1f}s / p95 {p95:.1f}s" if p50 is not None else "no successful runs"
+            lines.append(f"{stage} · {backend}: {latency}, {stats.error_rate:.0%} errors ({len(stats.samples)} runs)")
+        if self.hedges:
+            lines.append(f"Hedged runs: {self.hedges}, won by the second backend: {self.hedge_wins}")
+        return lines
+
+
+class LazyBackends(Mapping):
+    """``{backend: assistant}`` whose assistants are built the first time they are looked up."""
+
+    def __init__(self, builds: Dict[str, Callable[[], object]]):
+        self._builds = builds
+        self._built: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, backend: str):
+        with self._lock:
+            if backend not in self._built:
+                self._built[backend] = self._builds[backend]()
+            return self._built[backend]
+
+    def __iter__(self):
+        return iter(self._builds)
+
+    def __len__(self) -> int:
+        return len(self._builds)
+
+    def built(self) -> List[str]:
+        """The backends built so far, in the order they were built."""
+        with self._lock:
+            return list(self._built)
+
+
+class RoutedAssistant:
+    """One pipeline stage served by several backends; a drop-in for ``Assistant.run``."""
+
+    def __init__(self, router: Router, stage: str, assistants: Mapping, hedge: bool = False):
+        if not assistants:
+            raise ValueError(f"No backends configured for {stage}")
+        self.router = router
+        self.stage = stage
+        self.assistants = assistants
+        self.hedge = hedge
+        self.last_backend: Optional[str] = None
+
+    def _prompt_source(self):
+        # Every backend has the same prompt fields, so read them from one already built.
+        built = self.assistants.built() if isinstance(self.assistants, LazyBackends) else []
+        return self.assistants[built[0] if built else next(iter(self.assistants))]
+
+    # Prompt fields of a backend, for cache fingerprints and token budgets.
+    @property
+    def name(self) -> str:
+        return f"Routed{self._prompt_source().name}"
+
+    @property
+    def role(self) -> Optional[str]:
+        return getattr(self._prompt_source(), "role", None)
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._prompt_source().description
+
+    @property
+    def instructions(self) -> Optional[List[str]]:
+        return self._prompt_source().instructions
+
+    def run(self, message: str, stream: bool = False):
+        if stream:
+            return self.router.stream(self.stage, self.assistants, message)
+        self.last_backend, text = self.router.run(self.stage, self.assistants, message, hedge=self.hedge)
+        return text
+
+
+_routers: Dict[str, Router] = {}
+_routers_lock = threading.Lock()
+
+
+def get_router(name: str) -> Router:
+    """Return the router shared by every session of app ``name`` in this process."""
+    with _routers_lock:
+        return _routers.setdefault(name, Router())
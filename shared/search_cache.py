@@ -0,0 +1,81 @@
+"""Process-wide cache of web search results, shared by every search tool.
+
+Kept apart from ``search_tools`` so an app can show the cache's counters
+without importing phi's toolkit.
+
+Settings come from the environment:
+    SEARCH_CACHE_TTL          seconds a result is reused (default 3600)
+    SEARCH_CACHE_MAX_ENTRIES  results kept before LRU eviction (default 2048)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+from .telemetry import record_cache
+
+
+class SearchCache:
+    """Thread-safe TTL/LRU cache that coalesces concurrent fetches of the same key."""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], str]) -> str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache("search", "hit")
+                return entry[1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        record_cache("search", "miss" if owner else "coalesced")
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as exc:
+            # Failures are shared with the waiters but never cached.
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self) -> str:
+        return f"Search cache: {self.hits} hits · {self.misses} misses · {self.coalesced} coalesced"
+
+
+# Shared by every tool instance, session and app in the process.
+SEARCH_CACHE = SearchCache(
+    ttl=float(os.environ.get("SEARCH_CACHE_TTL", 3600)),
+    max_entries=int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", 2048)),
+)
@@ -0,0 +1,77 @@
+"""Memoizing drop-in replacement for phi's ``SerpApiTools``.
+
+The researcher calls ``search_google`` itself, so the same queries reach SerpApi
+again and again when sessions research similar topics. ``CachedSerpApiTools``
+exposes the same tool and the same result payload, but answers repeat queries
+from a process-wide cache and merges identical queries that are in flight at
+the same time into one upstream request.
+
+Settings come from the environment:
+    SERPAPI_BASE_URL       SerpApi endpoint (default https://serpapi.com); point it
+                           at a local fake server to test without quota
+
+The cache itself is ``search_cache.SEARCH_CACHE`` (see there for its settings).
+"""
+import json
+import os
+import urllib.parse
+import urllib.request
+from typing import Optional
+
+from phi.tools import Toolkit
+from phi.utils.log import logger
+
+from .search_cache import SEARCH_CACHE, SearchCache
+
+
+class CachedSerpApiTools(Toolkit):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, cache: Optional[SearchCache] = None):
+        super().__init__(name="serpapi_tools")
+
+        self.api_key = api_key or os.getenv("SERP_API_KEY")
+        self.base_url = (base_url or os.getenv("SERPAPI_BASE_URL", "https://serpapi.com")).rstrip("/")
+        self.cache = cache or SEARCH_CACHE
+        self.register(self.search_google)
+
+    def search_google(self, query: str, num_results: int = 10) -> str:
+        """
+        Search Google using the Serpapi API. Returns the search results.
+
+        Args:
+            query(str): The query to search for.
+            num_results(int): The number of results to return.
+
+        Returns:
+            str: The search results from Google.
+                Keys:
+                    - 'search_results': List of organic search results.
+                    - 'recommended_answer': Recommended answer from the search.
+                    - 'people_also_ask': Related questions from the search.
+                    - 'knowledge_graph': Knowledge graph from the search.
+        """
+        try:
+            if not self.api_key:
+                return "Please provide an API key"
+            if not query:
+                return "Please provide a query to search for"
+
+            key = (" ".join(query.casefold().split()), int(num_results))
+            return self.cache.get_or_fetch(key, lambda: self._fetch(query, num_results))
+        except Exception as e:
+            return f"Error searching for the query {query}: {e}"
+
+    def _fetch(self, query: str, num_results: int) -> str:
+        logger.info(f"Searching Google for: {query}")
+        params = urllib.parse.urlencode({"engine": "google", "q": query, "num": num_results, "api_key": self.api_key})
+        with urllib.request.urlopen(f"{self.base_url}/search.json?{params}", timeout=30) as response:
+            results = json.load(response)
+        if "error" in results:
+            raise RuntimeError(results["error"])
+
+        filtered_results = {
+            "search_results": results.get("organic_results", ""),
+            "recommended_answer": results.get("answer_box", ""),
+            "people_also_ask": results.get("related_questions", ""),
+            "knowledge_graph": results.get("knowledge_graph", ""),
+        }
+        return json.dumps(filtered_results)
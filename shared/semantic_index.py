@@ -0,0 +1,198 @@
+"""Near-duplicate lookup of research requests, on CPU and without network.
+
+The research cache only reuses research for the exact same inputs after
+normalization, so "AI in healthcare" for "doctors" and "AI for healthcare" for
+"healthcare professionals" are researched twice. ``SemanticIndex`` finds the
+most similar earlier request with hashed TF-IDF vectors:
+
+* every word outside a small stopword list, lightly stemmed, is hashed to a
+  feature and weighted by its inverse document frequency;
+* vectors are kept as an inverted index of NumPy arrays; a lookup only scores
+  the entries that share a word with the request that is rare enough to lift
+  them over the threshold, so it stays under a millisecond at 100k entries
+  (see ``benchmarks/semantic_cache.py``);
+* a match needs a cosine similarity of at least ``threshold`` over all inputs
+  and, when there are several, of at least ``subject_threshold`` over the
+  first input (the topic or destination), so "AI in finance" never reuses
+  "AI in healthcare" research just because the audience is the same. A single
+  input is its own subject, so ``threshold`` alone decides.
+"""
+import bisect
+import math
+import re
+import threading
+import zlib
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+FEATURES = 1 << 20
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it its of on or the their them they this to what when "
+    "where who why with about".split()
+)
+_WORD = re.compile(r"[^\W_]+")
+
+
+def terms(text: str) -> List[str]:
+    """Lowercase content words of ``text`` with plural and possessive endings removed."""
+    found = []
+    for word in _WORD.findall(str(text).casefold()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        found.append(word)
+    return found
+
+
+def features(text: str) -> Dict[int, float]:
+    """Return hashed term counts of ``text``."""
+    counts: Dict[int, float] = {}
+    for term in terms(text):
+        feature = zlib.crc32(term.encode()) % FEATURES
+        counts[feature] = counts.get(feature, 0) + 1
+    return counts
+
+
+class Match(NamedTuple):
+    inputs: Tuple[str, ...]
+    score: float
+    subject_score: float
+
+
+class SemanticIndex:
+    """Thread-safe inverted index of request inputs, looked up by TF-IDF cosine similarity."""
+
+    def __init__(self, threshold: float = 0.5, subject_threshold: float = 0.8):
+        self.threshold = threshold
+        self.subject_threshold = subject_threshold
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries: List[Tuple[str, ...]] = []
+        self._subjects: List[Dict[int, float]] = []
+        self._rows: Dict[Tuple[str, ...], int] = {}
+        self._document_frequency: Dict[int, int] = {}
+        # feature -> (entry rows in ascending order, weights), appended in place and read through NumPy views
+        self._postings: Dict[int, Tuple[array, array]] = {}
+        self._max_weight: Dict[int, float] = {}
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _idf(self, feature: int) -> float:
+        return math.log((1 + len(self._entries)) / (1 + self._document_frequency.get(feature, 0))) + 1
+
+    def _vector(self, counts: Dict[int, float]) -> Dict[int, float]:
+        weights = {feature: (1 + math.log(count)) * self._idf(feature) for feature, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {feature: weight / norm for feature, weight in weights.items()}
+
+    def _count(self, counts: Dict[int, float]) -> None:
+        for feature in counts:
+            self._document_frequency[feature] = self._document_frequency.get(feature, 0) + 1
+
+    def _insert(self, inputs: Tuple[str, ...], counts: Dict[int, float]) -> None:
+        row = len(self._entries)
+        self._entries.append(inputs)
+        self._subjects.append(self._vector(features(inputs[0])))
+        self._rows[inputs] = row
+        # Entry weights use the IDF at insertion time; queries use the current one.
+        for feature, weight in self._vector(counts).items():
+            rows, weights = self._postings.setdefault(feature, (array("i"), array("f")))
+            rows.append(row)
+            weights.append(weight)
+            self._max_weight[feature] = max(weight, self._max_weight.get(feature, 0.0))
+
+    def add(self, inputs: Sequence) -> None:
+        """Index one request's inputs; adding the same inputs again is a no-op."""
+        inputs = tuple(str(value) for value in inputs)
+        counts = features(" ".join(inputs))
+        if not counts:
+            return
+        with self._lock:
+            if inputs not in self._rows:
+                self._count(counts)
+                self._insert(inputs, counts)
+
+    def remove(self, inputs: Sequence) -> None:
+        """Stop matching ``inputs``, e.g. after the cache evicted their research."""
+        inputs = tuple(str(value) for value in inputs)
+        with self._lock:
+            row = self._rows.pop(inputs, None)
+            if row is None:
+                return
+            for feature in features(" ".join(inputs)):
+                rows, weights = self._postings[feature]
+                weights[bisect.bisect_left(rows, row)] = 0.0
+            self._removed += 1
+            # Compact once most rows are dead, so their postings are not scanned forever.
+            if self._removed > 1024 and self._removed > len(self._rows):
+                entries = [(inputs, features(" ".join(inputs))) for inputs in sorted(self._rows, key=self._rows.get)]
+                self._reset()
+                for inputs, counts in entries:
+                    self._count(counts)
+                for inputs, counts in entries:
+                    self._insert(inputs, counts)
+
+    def _scores(self, query: Dict[int, float], threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (candidate rows, their cosine similarity to ``query``); call with the lock held."""
+        lists = sorted(
+            ((feature, weight) for feature, weight in query.items() if feature in self._postings),
+            key=lambda item: len(self._postings[item[0]][0]),
+        )
+        # Rows that only share the longest posting lists (common words) with the query cannot
+        # reach the threshold, so candidates come from the shorter lists alone.
+        bound, sources = 0.0, len(lists)
+        while sources and bound + lists[sources - 1][1] * self._max_weight[lists[sources - 1][0]] < threshold:
+            sources -= 1
+            bound += lists[sources][1] * self._max_weight[lists[sources][0]]
+        if not sources:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        if sum(len(self._postings[feature][0]) for feature, _ in lists[:sources]) > len(self._entries) // 64:
+            # Broad queries touch a good share of the index anyway: one dense score per row is cheaper.
+            scores = np.zeros(len(self._entries), dtype=np.float32)
+            for feature, weight in lists:
+                rows, weights = self._postings[feature]
+                scores[np.frombuffer(rows, dtype=np.int32)] += weight * np.frombuffer(weights, dtype=np.float32)
+            return np.arange(len(self._entries), dtype=np.int32), scores
+        candidates = np.unique(np.concatenate([np.frombuffer(self._postings[feature][0], dtype=np.int32) for feature, _ in lists[:sources]]))
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        for feature, weight in lists:
+            rows = np.frombuffer(self._postings[feature][0], dtype=np.int32)
+            at = np.minimum(np.searchsorted(rows, candidates), len(rows) - 1)
+            found = rows[at] == candidates
+            scores[found] += weight * np.frombuffer(self._postings[feature][1], dtype=np.float32)[at[found]]
+        return candidates, scores
+
+    def lookup(self, inputs: Sequence, threshold: Optional[float] = None, attempts: int = 5) -> Optional[Match]:
+        """Return the most similar indexed request above the thresholds, or None."""
+        threshold = self.threshold if threshold is None else threshold
+        inputs = tuple(str(value) for value in inputs)
+        counts = features(" ".join(inputs))
+        if not counts:
+            return None
+        with self._lock:
+            # NumPy views of the postings live only inside ``_scores``: a live view would stop
+            # ``add`` from growing the arrays.
+            candidates, scores = self._scores(self._vector(counts), threshold)
+            subject = self._vector(features(inputs[0])) if len(inputs) > 1 else None
+            for _ in range(min(attempts, len(scores))):
+                best = int(np.argmax(scores))
+                score = float(scores[best])
+                if score < threshold:
+                    break
+                scores[best] = 0.0
+                if subject is None:
+                    return Match(self._entries[candidates[best]], score, score)
+                stored = self._subjects[candidates[best]]
+                subject_score = sum(weight * stored.get(feature, 0.0) for feature, weight in subject.items())
+                if subject_score >= self.subject_threshold:
+                    return Match(self._entries[candidates[best]], score, subject_score)
+        return None
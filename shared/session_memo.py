@@ -0,0 +1,115 @@
+"""Per-session memo of results, keyed by the inputs and the model.
+
+A finished blog, itinerary, post or summary used to be produced again whenever
+the user asked for the same inputs twice. ``SessionMemo`` keeps the results of
+one session in ``st.session_state`` under ``input_key(model_id, *inputs)``, so
+a repeat request shows the earlier result at once. It is bounded: the least
+recently used entries are evicted once it holds more than ``max_entries``
+entries or more than ``max_chars`` characters of text, so a long-lived session
+does not grow without limit.
+
+Settings come from the environment:
+    SESSION_MEMO_MAX_ENTRIES  results kept per session and memo (default 10)
+    SESSION_MEMO_MAX_CHARS    characters of text kept per session and memo (default 1000000)
+"""
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, List, Optional, Tuple
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+
+def input_key(model_id: str, *inputs) -> Tuple[str, ...]:
+    """Case-fold and collapse whitespace so trivially different inputs share a key."""
+    return (model_id, *(re.sub(r"\s+", " ", str(value)).strip().casefold() for value in inputs))
+
+
+def text_size(value: Any) -> int:
+    """Characters of text held by ``value``: strings, containers of them, or anything with ``size()``."""
+    if isinstance(value, str):
+        return len(value)
+    if hasattr(value, "size"):
+        return value.size()
+    if isinstance(value, dict):
+        return sum(text_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(text_size(item) for item in value)
+    return 0
+
+
+class SessionMemo:
+    """A thread-safe LRU map bounded by entry count and text size.
+
+    Values may keep growing after ``put`` (a running job's output), so the
+    bounds are enforced again on every access.
+    """
+
+    def __init__(self, max_entries: int = 10, max_chars: int = 1_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            self._evict()
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Entries from the most to the least recently used."""
+        with self._lock:
+            self._evict()
+            return list(reversed(self._entries.items()))
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, value in self.items())
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(text_size(value) for value in self._entries.values())
+
+    def summary(self) -> str:
+        return f"{len(self)} of {self.max_entries} kept · {self.size():,} of {self.max_chars:,} characters · {self.evictions} evicted"
+
+    def _evict(self) -> None:
+        sizes = {key: text_size(value) for key, value in self._entries.items()}
+        total = sum(sizes.values())
+        # The newest entry stays even when it alone is over the limit.
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or total > self.max_chars):
+            key, _ = self._entries.popitem(last=False)
+            total -= sizes[key]
+            self.evictions += 1
+            logger.info("session memo: evicted %r", key)
+
+
+def get_session_memo(name: str) -> SessionMemo:
+    """Return this session's memo called ``name``, created on first use."""
+    key = f"memo_{name}"
+    if key not in st.session_state:
+        st.session_state[key] = SessionMemo(
+            max_entries=int(os.environ.get("SESSION_MEMO_MAX_ENTRIES", 10)),
+            max_chars=int(os.environ.get("SESSION_MEMO_MAX_CHARS", 1_000_000)),
+        )
+    return st.session_state[key]
@@ -0,0 +1,31 @@
+"""Time assistant output as it is generated.
+
+``Assistant.run(message, stream=True)`` yields text chunks as the provider
+sends them. ``TimedStream`` passes them on while recording the time to first
+token next to the total latency, so both can be tracked; ``Job.run`` uses it
+to show a background job's output as it arrives.
+"""
+import time
+from typing import Iterable, Iterator, Optional
+
+
+class TimedStream:
+    """Iterate over text chunks while recording time to first token and total latency."""
+
+    def __init__(self, chunks: Iterable[str], started: Optional[float] = None):
+        self._chunks = chunks
+        self.started = time.perf_counter() if started is None else started
+        self.first_token: Optional[float] = None
+        self.total: Optional[float] = None
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            if self.first_token is None and chunk:
+                self.first_token = time.perf_counter() - self.started
+            yield chunk
+        self.total = time.perf_counter() - self.started
+        if self.first_token is None:
+            self.first_token = self.total
+
+    def summary(self) -> str:
+        return f"Time to first token: {self.first_token:.2f}s · Total: {self.total:.2f}s"
@@ -0,0 +1,452 @@
+"""Stage timings, token usage, tool calls and cache hits, as metrics and traces.
+
+Nothing in the apps said where the time of a run went: the research stage, the
+searches in its tool loop or the writer. ``instrumented`` wraps an assistant's
+``run``, its model requests and its tools, and ``span`` marks the pipeline
+stages around them. Every span is recorded twice:
+
+* in the process-wide ``METRICS`` registry (durations, calls, tokens, errors,
+  cache lookups), served in the Prometheus text format by
+  ``start_metrics_server``;
+* in the active ``Trace``, if the code runs inside ``with Trace(...)``: a tree
+  of spans for one run (research -> searches -> writing) that the apps show in
+  the sidebar with ``render_trace``.
+
+Model spans also note ``tokens_cached``, the prompt tokens the provider served
+from its prompt cache (see ``prompts``), so the share of cached prompt tokens
+shows in the metrics and in every trace.
+
+Spans follow the caller's ``contextvars`` context, so work handed to a thread
+pool joins the trace when it is submitted with ``contextvars.copy_context().run``.
+
+Settings come from the environment:
+    METRICS_PORT    serve metrics at http://<host>:<port>/metrics (default: off)
+    TRACE_LOG_PATH  append every finished trace to this JSONL file (default: off)
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import streamlit as st
+
+from .rate_limit import assistant_llm
+from .tokens import estimate_tokens, prompt_tokens, reported_usage, response_text
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+METRIC_HELP = {
+    "agentic_stage_seconds": ("histogram", "Duration of pipeline stages and assistant runs."),
+    "agentic_stage_runs_total": ("counter", "Pipeline stages and assistant runs by status."),
+    "agentic_llm_seconds": ("histogram", "Duration of model requests, streamed ones until the last chunk."),
+    "agentic_llm_requests_total": ("counter", "Model requests by status."),
+    "agentic_llm_tokens_total": ("counter", "Model tokens by direction; estimated when the provider reports none."),
+    "agentic_llm_cached_tokens_total": ("counter", "Prompt tokens the provider served from its prompt cache."),
+    "agentic_tool_seconds": ("histogram", "Duration of tool calls."),
+    "agentic_tool_calls_total": ("counter", "Tool calls by status."),
+    "agentic_cache_lookups_total": ("counter", "Cache lookups by cache and result."),
+}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """Thread-safe counters and histograms with labels, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, list]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            # One count per bucket, then the sum and the total count.
+            series = self._histograms.setdefault(name, {}).setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def value(self, name: str, **labels) -> float:
+        """Return a counter's value, or a histogram's count, for exactly these labels."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            if name in self._histograms:
+                return self._histograms[name].get(key, [0])[-1]
+            return self._counters.get(name, {}).get(key, 0)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(set(self._counters) | set(self._histograms)):
+                kind, help_text = METRIC_HELP.get(name, ("counter" if name in self._counters else "histogram", ""))
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for key, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{_labels(key)} {value:g}")
+                for key, series in sorted(self._histograms.get(name, {}).items()):
+                    for bound, count in zip(self.buckets, series):
+                        le = f'le="{bound:g}"'
+                        lines.append(f"{name}_bucket{_labels(key, le)} {count}")
+                    le = 'le="+Inf"'
+                    lines.append(f"{name}_bucket{_labels(key, le)} {series[-1]}")
+                    lines.append(f"{name}_sum{_labels(key)} {series[-2]:.6f}")
+                    lines.append(f"{name}_count{_labels(key)} {series[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every session and run in the process.
+METRICS = Metrics()
+
+
+class Span:
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attrs: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.kind = kind
+        self.parent_id = parent.id if parent else None
+        self.attrs = attrs
+        self.error: Optional[str] = None
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "id": self.id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start - origin, 4),
+            "seconds": round(self.seconds, 4),
+            "error": self.error,
+            **({"attrs": self.attrs} if self.attrs else {}),
+        }
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("current_span", default=(None, None))
+
+
+class Trace:
+    """The spans of one run; use as ``with Trace(name) as trace:`` around the run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.id = uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> "Trace":
+        self._token = _current.set((self, None))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current.reset(self._token)
+        self.seconds = time.perf_counter() - self.origin
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        path = os.environ.get("TRACE_LOG_PATH")
+        if path:
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(self.to_dict(), default=str) + "\n")
+            except OSError as e:
+                logger.warning("could not write trace %s to %s: %s", self.id, path, e)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def size(self) -> int:
+        """Characters of text the spans hold: names, attributes and errors."""
+        with self._lock:
+            return sum(
+                len(span.name) + len(span.error or "") + sum(len(str(key)) + len(str(value)) for key, value in span.attrs.items())
+                for span in self.spans
+            )
+
+    def totals(self, spans: Optional[List[Span]] = None) -> dict:
+        """Sum the model requests, tokens, tool calls and cache lookups of ``spans`` (default: all)."""
+        totals = {"llm_calls": 0, "tokens_in": 0, "tokens_cached": 0, "tokens_out": 0, "tool_calls": 0, "errors": 0}
+        for span in self.spans if spans is None else spans:
+            if span.kind == "llm":
+                totals["llm_calls"] += 1
+                totals["tokens_in"] += span.attrs.get("tokens_in", 0)
+                totals["tokens_cached"] += span.attrs.get("tokens_cached", 0)
+                totals["tokens_out"] += span.attrs.get("tokens_out", 0)
+            elif span.kind == "tool":
+                totals["tool_calls"] += 1
+            totals["errors"] += span.error is not None
+        return totals
+
+    def stages(self) -> List[Tuple[int, Span, dict]]:
+        """Return (depth, span, totals of the span and everything below it) for every stage span, in start order."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        children: Dict[Optional[str], List[Span]] = {}
+        for span in spans:
+            children.setdefault(span.parent_id, []).append(span)
+
+        def below(span: Span) -> List[Span]:
+            found = [span]
+            for child in children.get(span.id, []):
+                found += below(child)
+            return found
+
+        rows = []
+
+        def walk(parent_id: Optional[str], depth: int) -> None:
+            for span in children.get(parent_id, []):
+                if span.kind == "stage":
+                    rows.append((depth, span, self.totals(below(span))))
+                    walk(span.id, depth + 1)
+                else:
+                    walk(span.id, depth)
+
+        walk(None, 0)
+        return rows
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return {
+            "trace_id": self.id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "seconds": round(self.seconds if self.seconds is not None else time.perf_counter() - self.origin, 4),
+            "error": self.error,
+            "totals": self.totals(spans),
+            "spans": [span.to_dict(self.origin) for span in spans],
+        }
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()[0]
+
+
+def _record(span: Span) -> None:
+    status = "error" if span.error else "ok"
+    if span.kind == "llm":
+        labels = {"provider": span.attrs.get("provider", ""), "model": span.attrs.get("model", "")}
+        METRICS.observe("agentic_llm_seconds", span.seconds, **labels)
+        METRICS.inc("agentic_llm_requests_total", status=status, **labels)
+        METRICS.inc("agentic_llm_tokens_total", span.attrs.get("tokens_in", 0), direction="in", **labels)
+        METRICS.inc("agentic_llm_tokens_total", span.attrs.get("tokens_out", 0), direction="out", **labels)
+        METRICS.inc("agentic_llm_cached_tokens_total", span.attrs.get("tokens_cached", 0), **labels)
+    elif span.kind == "tool":
+        METRICS.observe("agentic_tool_seconds", span.seconds, tool=span.name)
+        METRICS.inc("agentic_tool_calls_total", tool=span.name, status=status)
+    else:
+        METRICS.observe("agentic_stage_seconds", span.seconds, stage=span.name)
+        METRICS.inc("agentic_stage_runs_total", stage=span.name, status=status)
+
+
+@contextmanager
+def span(name: str, kind: str = "stage", **attrs) -> Iterator[Span]:
+    """Time the block as a span of the active trace (if any) and record it in ``METRICS``."""
+    trace, parent = _current.get()
+    current = Span(name, kind, parent, attrs)
+    token = _current.set((trace, current))
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end = time.perf_counter()
+        try:
+            _current.reset(token)
+        except ValueError:  # a generator closed from another context
+            pass
+        if trace is not None:
+            trace.add(current)
+        _record(current)
+
+
+def record_cache(cache: str, result: str) -> None:
+    """Count a cache lookup (``hit``, ``miss``, ...) and note it on the current span."""
+    METRICS.inc("agentic_cache_lookups_total", cache=cache, result=result)
+    _, parent = _current.get()
+    if parent is not None:
+        parent.attrs[f"{cache}_cache"] = result
+
+
+def traced_tool(name: str, function):
+    """Wrap a tool function so every call is a ``tool`` span."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with span(name, kind="tool"):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _traced_invoke(provider: str, model_id: str, invoke):
+    @functools.wraps(invoke)
+    def wrapper(*args, **kwargs):
+        with span(model_id, kind="llm", provider=provider, model=model_id) as current:
+            response = invoke(*args, **kwargs)
+            tokens_in, tokens_out, tokens_cached = reported_usage(response)
+            current.attrs["tokens_in"] = tokens_in or prompt_tokens(model_id, args, kwargs)
+            current.attrs["tokens_out"] = tokens_out or estimate_tokens(response_text(response), model_id)
+            current.attrs["tokens_cached"] = tokens_cached
+            return response
+
+    return wrapper
+
+
+def _traced_invoke_stream(provider: str, model_id: str, invoke_stream):
+    @functools.wraps(invoke_stream)
+    def wrapper(*args, **kwargs):
+        with span(model_id, kind="llm", provider=provider, model=model_id) as current:
+            reported, text = (0, 0, 0), []
+            for chunk in invoke_stream(*args, **kwargs):
+                reported = tuple(max(seen, now) for seen, now in zip(reported, reported_usage(chunk)))
+                text.append(response_text(chunk))
+                yield chunk
+            current.attrs["tokens_in"] = reported[0] or prompt_tokens(model_id, args, kwargs)
+            current.attrs["tokens_out"] = reported[1] or estimate_tokens("".join(text), model_id)
+            current.attrs["tokens_cached"] = reported[2]
+
+    return wrapper
+
+
+def _traced_run(name: str, run):
+    @functools.wraps(run)
+    def wrapper(message=None, stream: bool = True, **kwargs):
+        if not stream:
+            with span(name):
+                return run(message, stream=False, **kwargs)
+
+        def chunks():
+            with span(name):
+                yield from run(message, stream=True, **kwargs)
+
+        return chunks()
+
+    return wrapper
+
+
+def instrumented(assistant, provider: str, model_id: str):
+    """Trace the runs, model requests and tool calls of ``assistant``; return the assistant."""
+    if getattr(assistant, "_instrumented", False):
+        return assistant
+    # phi assistants and models are pydantic objects that reject unknown
+    # attributes, so the wrappers are stored on the instances directly.
+    object.__setattr__(assistant, "_instrumented", True)
+    object.__setattr__(assistant, "run", _traced_run(assistant.name, assistant.run))
+    llm = assistant_llm(assistant)
+    if llm is not None:
+        object.__setattr__(llm, "invoke", _traced_invoke(provider, model_id, llm.invoke))
+        object.__setattr__(llm, "invoke_stream", _traced_invoke_stream(provider, model_id, llm.invoke_stream))
+    for tool in getattr(assistant, "tools", None) or []:
+        for name, function in getattr(tool, "functions", {}).items():
+            function.entrypoint = traced_tool(name, function.entrypoint)
+    return assistant
+
+
+_server_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        payload = METRICS.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: Optional[int] = None) -> Optional[int]:
+    """Serve ``METRICS`` on ``port`` (default ``METRICS_PORT``) from a daemon thread, once per process.
+
+    Return the port, or None when no port is configured or it is taken.
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        port = port if port is not None else int(os.environ.get("METRICS_PORT") or 0)
+        if not port:
+            return None
+        try:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+        except OSError as e:
+            logger.warning("metrics server not started on port %d: %s", port, e)
+            return None
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+        logger.info("serving metrics on port %d", port)
+        return port
+
+
+def render_trace(trace: Optional[Trace]) -> None:
+    """Show where the time of ``trace`` went, in a sidebar expander."""
+    if trace is None:
+        return
+    with st.sidebar.expander("Last run breakdown"):
+        rows = ["| Stage | Seconds | LLM calls | Tokens in (cached) / out | Tool calls |", "|---|---:|---:|---:|---:|"]
+        for depth, stage, totals in trace.stages():
+            label = "&nbsp;&nbsp;" * depth + ("↳ " if depth else "") + stage.name
+            if stage.error:
+                label += " ⚠️"
+            cached = [f"{key.removesuffix('_cache')} {value}" for key, value in stage.attrs.items() if key.endswith("_cache")]
+            if cached:
+                label += f" ({', '.join(cached)})"
+            rows.append(
+                f"| {label} | {stage.seconds:.2f} | {totals['llm_calls']} | "
+                f"{totals['tokens_in']:,} ({totals['tokens_cached']:,}) / {totals['tokens_out']:,} | {totals['tool_calls']} |"
+            )
+        st.markdown("\n".join(rows))
+        totals = trace.totals()
+        st.caption(
+            f"Total {trace.seconds or 0:.2f}s · {totals['llm_calls']} LLM calls · {totals['tokens_in']:,} tokens in "
+            f"({totals['tokens_cached'] / max(totals['tokens_in'], 1):.0%} cached) · "
+            f"{totals['tokens_out']:,} out · {totals['tool_calls']} tool calls · {totals['errors']} errors"
+        )
+        st.download_button(
+            "Download trace (JSON)",
+            json.dumps(trace.to_dict(), indent=2, default=str),
+            file_name=f"trace-{trace.id}.json",
+            mime="application/json",
+        )
@@ -0,0 +1,93 @@
+"""Token counts for prompts and outputs, per provider and model.
+
+GPT-4o prompts are counted exactly with ``tiktoken`` when it is installed.
+The other providers don't ship a local tokenizer with their SDKs, so their
+counts use the average characters per token of each model's tokenizer on
+English prose, which is close enough for budgeting.
+
+``prompt_tokens``, ``reported_usage`` and ``response_text`` read the messages
+and responses of phi's ``invoke`` and ``invoke_stream``, for the rate limiter
+and for the traces.
+"""
+import math
+from functools import lru_cache
+from typing import Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional: only improves GPT-4o counts
+    tiktoken = None
+
+# Average characters per token when the model is unknown.
+CHARS_PER_TOKEN = 4.0
+
+MODEL_CHARS_PER_TOKEN = {
+    "gpt-4o": 4.0,
+    "llama-3.3-70b-versatile": 3.9,
+    "mixtral-8x7b-32768": 3.5,
+    "gemini-1.5-flash": 4.0,
+}
+
+CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "llama-3.3-70b-versatile": 128000,
+    "mixtral-8x7b-32768": 32768,
+    "gemini-1.5-flash": 1000000,
+}
+
+_TIKTOKEN_ENCODINGS = {"gpt-4o": "o200k_base"}
+
+
+@lru_cache(maxsize=None)
+def _encoding(model_id: str):
+    if tiktoken is None or model_id not in _TIKTOKEN_ENCODINGS:
+        return None
+    try:
+        return tiktoken.get_encoding(_TIKTOKEN_ENCODINGS[model_id])
+    except Exception:  # the encoding is downloaded on first use and may be unavailable offline
+        return None
+
+
+def estimate_tokens(text: str, model_id: Optional[str] = None) -> int:
+    """Count (or estimate) the tokens of ``text`` for ``model_id``."""
+    text = text or ""
+    encoding = _encoding(model_id) if model_id else None
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / MODEL_CHARS_PER_TOKEN.get(model_id, CHARS_PER_TOKEN))
+
+
+def prompt_tokens(model_id: str, args: tuple, kwargs: dict) -> int:
+    """Estimate the prompt tokens of an ``invoke(messages)`` call of a phi LLM."""
+    messages = kwargs.get("messages", args[0] if args else [])
+    return sum(estimate_tokens(str(getattr(message, "content", "") or ""), model_id) for message in messages or [])
+
+
+def reported_usage(response) -> Tuple[int, int, int]:
+    """Prompt, completion and cached prompt tokens as reported by the provider (0 when not reported)."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0)
+        return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0, cached or 0
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is not None:
+        return (
+            getattr(metadata, "prompt_token_count", 0) or 0,
+            getattr(metadata, "candidates_token_count", 0) or 0,
+            getattr(metadata, "cached_content_token_count", 0) or 0,
+        )
+    return 0, 0, 0
+
+
+def response_text(response) -> str:
+    """The text of a response or of one streamed chunk, from any provider."""
+    try:
+        choice = response.choices[0]
+        message = getattr(choice, "message", None) or getattr(choice, "delta", None)
+        return getattr(message, "content", None) or ""
+    except (AttributeError, IndexError, TypeError):
+        pass
+    try:
+        return getattr(response, "text", "") or ""
+    except ValueError:  # Gemini raises when a response part has no text
+        return ""
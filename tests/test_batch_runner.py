@@ -0,0 +1,69 @@
+"""A rerun batch resumes: only unfinished and failed items run again."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.batch_runner import finished_ids, read_inputs, run_batch  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_metrics_server(monkeypatch):
+    monkeypatch.delenv("METRICS_PORT", raising=False)
+
+
+def write_lines(path: Path, *lines: str) -> None:
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+
+
+def test_finished_ids_skips_failures_and_cut_lines(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(
+        output,
+        json.dumps({"id": "a", "status": "ok"}),
+        json.dumps({"id": "b", "status": "error", "error": "boom"}),
+        json.dumps({"id": "c", "status": "ok"}),
+        '{"id": "d", "stat',
+    )
+    assert finished_ids(str(output)) == {"a", "c"}
+
+
+def test_finished_ids_of_a_missing_file_is_empty(tmp_path):
+    assert finished_ids(str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_rerun_resumes_after_failures_and_a_crash(tmp_path):
+    inputs = tmp_path / "in.jsonl"
+    write_lines(inputs, *(json.dumps({"topic": topic}) for topic in ["ai", "farming", "cooking", "ai"]))
+    items = read_inputs(str(inputs), ["topic"])
+    assert len(items) == 3
+    output = tmp_path / "out.jsonl"
+    calls = []
+
+    def flaky(item: dict) -> dict:
+        calls.append(item["topic"])
+        if item["topic"] == "farming":
+            raise RuntimeError("rate limited")
+        return {"text": item["topic"].upper()}
+
+    first = run_batch(items, flaky, str(output), workers=2)
+    assert (first.total, first.skipped, first.ok, first.failed) == (3, 0, 2, 1)
+    # A crash leaves a partial line behind, which the next run steps over.
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"id": "x", "sta')
+
+    def steady(item: dict) -> dict:
+        calls.append(item["topic"])
+        return {"text": item["topic"].upper()}
+
+    calls.clear()
+    second = run_batch(items, steady, str(output), workers=2)
+    assert calls == ["farming"]
+    assert (second.skipped, second.ok, second.failed) == (2, 1, 0)
+    assert finished_ids(str(output)) == {item["id"] for item in items}
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines() if line.endswith("}")]
+    assert [record["input"]["topic"] for record in records if record["status"] == "ok"][-1] == "farming"
@@ -0,0 +1,69 @@
+"""Research is trimmed to fit the writer's prompt budget."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.context_budget import ContextBudget, shorten  # noqa: E402
+from shared.tokens import estimate_tokens  # noqa: E402
+
+# Counted by characters, so the budgets below do not depend on tiktoken.
+MODEL = "mixtral-8x7b-32768"
+
+
+def item(number: int, topic: str, sentences: int = 6) -> str:
+    body = " ".join(f"Sentence {n} explains how {topic} changes the daily work of many teams." for n in range(sentences))
+    return f"{number}. {body} https://example.com/{number}"
+
+
+def test_research_within_budget_is_kept_as_is():
+    research = "\n".join(item(n, "ai in healthcare", 1) for n in range(1, 4))
+    fitted = ContextBudget(MODEL, 10000).fit(research, "ai in healthcare", prompt_overhead="You write blogs.")
+    assert fitted.text == research
+    assert fitted.kept == fitted.items == 3
+    assert fitted.prompt_tokens == estimate_tokens(research, MODEL) + estimate_tokens("You write blogs.", MODEL)
+
+
+def test_research_over_budget_is_deduplicated_ranked_and_fits():
+    items = [
+        "1. Crop rotation keeps soil fertile and cuts fertilizer costs on small farms. https://example.com/1",
+        "2. AI in healthcare reads scans faster, so radiologists see more patients each day. https://example.com/2",
+        "3. AI in healthcare reads scans faster, so radiologists see more patients each day! https://example.com/3",
+        "4. Slow braising turns cheap cuts of beef tender over several quiet hours. https://example.com/4",
+        "5. Hospitals use AI triage in healthcare to route urgent cases to doctors sooner. https://example.com/5",
+    ]
+    research = "\n".join(items)
+    overhead = "x" * 200
+    budget = ContextBudget(MODEL, estimate_tokens(overhead, MODEL) + 70)
+    fitted = budget.fit(research, "ai in healthcare", prompt_overhead=overhead)
+    assert fitted.prompt_tokens <= budget.budget_tokens
+    assert (fitted.items, fitted.duplicates, fitted.kept) == (5, 1, 2)
+    # The relevant items win, and the kept ones stay in their original order.
+    assert fitted.text == items[1] + "\n\n" + items[4]
+    assert "trimmed" in fitted.summary(budget.budget_tokens)
+
+
+def test_long_items_are_shortened_to_the_item_limit():
+    research = "\n".join(item(n, "ai in healthcare", 30) for n in range(1, 4))
+    fitted = ContextBudget(MODEL, 600, max_item_tokens=150).fit(research, "ai in healthcare")
+    assert fitted.prompt_tokens <= 600
+    assert fitted.shortened == fitted.kept > 0
+    assert all(f"https://example.com/{n}" in fitted.text for n in range(1, fitted.kept + 1))
+
+
+def test_shorten_keeps_leading_sentences_and_links():
+    long_item = item(1, "ai in healthcare", 20)
+    short = shorten(long_item, 80, MODEL)
+    assert estimate_tokens(short, MODEL) <= 80
+    assert short.startswith("1. Sentence 0 explains")
+    assert short.endswith("https://example.com/1")
+    assert short.count("Sentence") < 20
+
+
+def test_shorten_returns_a_fitting_item_unchanged():
+    assert shorten(item(1, "ai", 1), 400, MODEL) == item(1, "ai", 1)
+
+
+def test_shorten_drops_items_cut_to_a_few_words():
+    assert shorten(item(1, "ai in healthcare", 20), 10, MODEL) == ""
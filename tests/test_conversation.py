@@ -0,0 +1,61 @@
+"""Conversation memory stays within its token cap and only returns related turns."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.conversation import HEADER, ConversationMemory, digest  # noqa: E402
+from shared.tokens import estimate_tokens  # noqa: E402
+
+# Counted by characters, so the caps below do not depend on tiktoken.
+MODEL = "mixtral-8x7b-32768"
+
+
+def post(topic: str, paragraphs: int = 20) -> str:
+    body = "\n\n".join(
+        f"Paragraph {n} on {topic} opens with a claim worth keeping. It then goes on at length about details of {topic}."
+        for n in range(paragraphs)
+    )
+    return f"## {topic.title()}\n\n{body}"
+
+
+def test_digest_keeps_headings_and_first_sentences():
+    assert digest("# Title\n\nFirst one. Second one.\n\n## Part:\nThird one! More.") == "Title: First one. Part: Third one!"
+
+
+def test_older_turns_are_summarized_and_the_latest_kept_in_full():
+    memory = ConversationMemory(MODEL, max_tokens=100_000)
+    memory.add("ai in healthcare", "Write about AI in healthcare", post("ai in healthcare", 2))
+    memory.add("ai in healthcare", "Write about AI in healthcare again", post("ai in healthcare", 2))
+    context = memory.context("ai in healthcare")
+    assert context.startswith(HEADER)
+    assert "Earlier response (summary): Ai In Healthcare: Paragraph 0" in context
+    assert context.count("Earlier response:") == 1
+    assert "goes on at length" in context.split("Earlier response:")[1]
+
+
+def test_memory_stays_within_max_tokens():
+    memory = ConversationMemory(MODEL, max_tokens=600)
+    for n in range(12):
+        memory.add("ai in healthcare", f"Write post {n} about AI in healthcare", post("ai in healthcare"))
+        context = memory.context("ai in healthcare")
+        assert estimate_tokens(context.replace(HEADER, ""), MODEL) <= 600 + 20
+    assert memory.dropped > 0
+    assert "Write post 11" in context and "Write post 0 " not in context
+    assert "600 tokens" in memory.summary()
+
+
+def test_summaries_take_at_most_half_of_the_cap():
+    memory = ConversationMemory(MODEL, max_tokens=400)
+    for n in range(10):
+        memory.add("ai in healthcare", f"Write post {n}", post("ai in healthcare"))
+    folded = [turn for turn in memory._turns if turn.folded]
+    assert memory._tokens(folded) <= 200
+
+
+def test_unrelated_request_gets_no_context():
+    memory = ConversationMemory(MODEL)
+    memory.add("ai in healthcare", "Write about AI in healthcare", post("ai in healthcare", 2))
+    assert memory.context("sourdough baking") == ""
+    assert memory.context("healthcare ai") != ""
@@ -0,0 +1,77 @@
+"""Skeleton replies and itineraries of the day planner are read into one entry per day."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "Travel Agent"), str(ROOT)]
+
+from day_planner import day_blocks, parse_skeleton, plan_from_itinerary, split_days  # noqa: E402
+
+
+def test_parse_skeleton_reads_the_overview_and_every_day():
+    skeleton = parse_skeleton(
+        "Ten days around Kyoto, staying near Kyoto Station.\n"
+        "Day trips go out by train.\n\n"
+        "Day 1: Higashiyama - temples and old streets\n"
+        "Day 2: Arashiyama - bamboo grove and river\n"
+        "Day 3: Nara - deer park and Todai-ji\n",
+        3,
+    )
+    assert skeleton.overview == "Ten days around Kyoto, staying near Kyoto Station.\nDay trips go out by train."
+    assert skeleton.days == ["Higashiyama - temples and old streets", "Arashiyama - bamboo grove and river", "Nara - deer park and Todai-ji"]
+    assert skeleton.text().splitlines()[1] == "Day 2: Arashiyama - bamboo grove and river"
+
+
+def test_parse_skeleton_accepts_markdown_day_lines():
+    skeleton = parse_skeleton("- **Day 1:** Old town walk\n* Day 2 – Museums\n### Day 3. Beach day", 3)
+    assert skeleton.overview == ""
+    assert skeleton.days == ["Old town walk", "Museums", "Beach day"]
+
+
+def test_parse_skeleton_leaves_missing_days_open_and_ignores_extra_ones():
+    skeleton = parse_skeleton("Day 1: Old town\nDay 1: Repeated\nDay 3: Hills\nDay 9: Not in this trip", 3)
+    assert skeleton.days[0] == "Old town"
+    assert skeleton.days[1].startswith("open day")
+    assert skeleton.days[2] == "Hills"
+    assert len(skeleton.days) == 3
+
+
+def test_parse_skeleton_without_day_lines_keeps_the_reply_as_overview():
+    skeleton = parse_skeleton("A relaxed trip.", 2)
+    assert skeleton.overview == "A relaxed trip."
+    assert all(day.startswith("open day") for day in skeleton.days)
+
+
+ITINERARY = (
+    "A week in Lisbon.\n\n"
+    "### Day 1: Alfama\nMorning at the castle.\n\n"
+    "### Day 2: Belém\nThe monastery, then pastries.\n\n"
+    "**Day 3: Sintra**\nPalaces in the hills.\n"
+)
+
+
+def test_split_days_cuts_the_itinerary_on_its_headings():
+    days = split_days(ITINERARY, range(1, 4))
+    assert list(days) == [1, 2, 3]
+    assert days[2] == "### Day 2: Belém\nThe monastery, then pastries."
+    assert days[3] == "**Day 3: Sintra**\nPalaces in the hills."
+    assert split_days(ITINERARY, range(2, 4)) == {2: days[2], 3: days[3]}
+
+
+def test_split_days_needs_every_day_in_order():
+    assert split_days(ITINERARY, range(1, 5)) is None
+    assert split_days("### Day 2: Belém\n\n### Day 1: Alfama", range(1, 3)) is None
+    assert split_days("A trip without headings.", range(1, 2)) is None
+
+
+def test_plan_from_itinerary_keeps_the_overview_and_a_title_per_day():
+    plan = plan_from_itinerary(ITINERARY, 3)
+    assert plan.overview == "A week in Lisbon."
+    assert plan.skeleton == ["Day 1: Alfama", "Day 2: Belém", "Day 3: Sintra"]
+    assert plan.text() == ITINERARY.strip()
+    assert plan_from_itinerary(ITINERARY, 4) is None
+
+
+def test_day_blocks_groups_consecutive_days():
+    assert day_blocks([1, 2, 3, 4, 5], 2) == [range(1, 3), range(3, 5), range(5, 6)]
+    assert day_blocks([2, 3, 7, 8, 9], 3) == [range(2, 4), range(7, 10)]
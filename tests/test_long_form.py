@@ -0,0 +1,50 @@
+"""Outline replies of the long-form writer are read into a title and one line per section."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "Blog Writer"), str(ROOT)]
+
+from long_form import Section, parse_outline, section_words  # noqa: E402
+
+
+def test_section_words_splits_the_length_into_intro_body_and_conclusion():
+    assert section_words(2000) == [200, 400, 400, 400, 400, 200]
+    assert section_words(1200) == [120, 480, 480, 120]
+
+
+def test_parse_outline_reads_the_title_and_every_section():
+    outline = parse_outline(
+        "# AI in Healthcare\n"
+        "Section 1: Introduction - why it matters now\n"
+        "Section 2: Diagnosis - reading scans faster\n"
+        "Section 3: Triage - routing urgent cases\n"
+        "Section 4: Conclusion - what to try next\n",
+        1200,
+    )
+    assert outline.title == "AI in Healthcare"
+    assert outline.sections == [
+        Section("Introduction", "why it matters now", 120),
+        Section("Diagnosis", "reading scans faster", 480),
+        Section("Triage", "routing urgent cases", 480),
+        Section("Conclusion", "what to try next", 120),
+    ]
+    assert outline.text().splitlines()[2] == "Section 2: Diagnosis - reading scans faster"
+
+
+def test_parse_outline_accepts_markdown_and_chatter():
+    outline = parse_outline("Here is the plan.\n# AI in Healthcare\n**Section 1: Introduction - why it matters**\n- Section 2 — Diagnosis", 1200)
+    assert outline.title == "AI in Healthcare"
+    assert outline.sections[0][:2] == ("Introduction", "why it matters")
+    assert outline.sections[1][:2] == ("Diagnosis", "")
+
+
+def test_parse_outline_fills_in_missing_sections_and_ignores_extra_ones():
+    outline = parse_outline("# Title\nSection 2: Diagnosis\nSection 2: Repeated\nSection 9: Too many", 1200)
+    assert [section.heading for section in outline.sections] == ["Introduction", "Diagnosis", "Part 3", "Conclusion"]
+    assert outline.sections[2].summary == "plan it from the research"
+
+
+def test_parse_outline_takes_the_title_only_before_the_sections():
+    outline = parse_outline("Section 1: Introduction\n# Not the title", 1200)
+    assert outline.title == ""
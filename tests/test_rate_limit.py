@@ -0,0 +1,128 @@
+"""The rate limiter backs off on 429s, recovers after successes and charges the tokens used."""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared import rate_limit  # noqa: E402
+from shared.rate_limit import RateLimited, RateLimiter  # noqa: E402
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def limiter(**kwargs) -> RateLimiter:
+    # Quotas and backoffs small enough that no test waits.
+    return RateLimiter("test/model", rpm=600_000, tpm=kwargs.pop("tpm", 1_000_000), base_backoff=0.001, max_backoff=0.002, **kwargs)
+
+
+def test_a_429_halves_concurrency_and_lowers_the_rate():
+    limits = limiter(max_concurrency=8)
+    limits.on_rate_limited(0, delay=0.0)
+    assert (limits.concurrency, limits.rate, limits.throttled) == (4, 0.75, 1)
+    limits.on_rate_limited(1, delay=0.0)
+    assert limits.concurrency == 2
+    assert limits.rate == pytest.approx(0.5625)
+
+
+def test_runs_of_successes_grow_concurrency_and_rate_back():
+    limits = limiter(max_concurrency=8)
+    limits.on_rate_limited(0, delay=0.0)
+    limits.on_rate_limited(0, delay=0.0)
+    for _ in range(50):
+        limits.acquire(0)
+        limits.release(ok=True)
+    assert limits.concurrency == 8
+    assert limits.rate == 1.0
+
+
+def test_rate_limited_call_is_retried_then_succeeds():
+    limits = limiter(max_retries=3)
+    attempts = []
+
+    def invoke(messages):
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError("slow down")
+        return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+
+    limited = rate_limit._limited_invoke(limits, "gpt-4o", invoke)
+    limited([SimpleNamespace(content="hello")])
+    assert len(attempts) == 3
+    assert (limits.throttled, limits.in_flight) == (2, 0)
+
+
+def test_call_still_rate_limited_after_every_retry_raises():
+    limits = limiter(max_retries=2)
+
+    def invoke(messages):
+        raise RateLimitError("slow down")
+
+    with pytest.raises(RateLimited):
+        rate_limit._limited_invoke(limits, "gpt-4o", invoke)([])
+    assert (limits.throttled, limits.in_flight) == (2, 0)
+
+
+def test_other_errors_are_not_retried():
+    limits = limiter()
+
+    def invoke(messages):
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        rate_limit._limited_invoke(limits, "gpt-4o", invoke)([])
+    assert (limits.calls, limits.throttled, limits.in_flight) == (1, 0, 0)
+
+
+def test_stream_charges_the_tokens_it_used_before_releasing():
+    limits = limiter(tpm=100_000)
+    charged = []
+    release = limits.release
+
+    def record_release(ok=True, used_tokens=0):
+        charged.append(used_tokens)
+        release(ok=ok, used_tokens=used_tokens)
+
+    limits.release = record_release
+
+    def stream(messages):
+        for _ in range(3):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="x" * 400))])
+        yield SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=20, completion_tokens=300))
+
+    chunks = list(rate_limit._limited_invoke_stream(limits, "mixtral-8x7b-32768", stream)([SimpleNamespace(content="y" * 35)]))
+    assert len(chunks) == 4
+    # Reported usage (320) beyond the prompt estimate (10) is charged.
+    assert charged == [310]
+    assert limits.in_flight == 0
+
+
+def test_stream_stopped_early_charges_what_was_streamed():
+    limits = limiter()
+
+    def stream(messages):
+        while True:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="x" * 350))])
+
+    chunks = rate_limit._limited_invoke_stream(limits, "mixtral-8x7b-32768", stream)([])
+    next(chunks)
+    before = limits._tokens
+    chunks.close()
+    assert before - limits._tokens == pytest.approx(100, abs=1)
+    assert limits.in_flight == 0
+
+
+def test_quotas_can_be_set_per_model(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    monkeypatch.setenv("RATE_LIMIT_RPM_LLAMA_3_3_70B_VERSATILE", "7")
+    monkeypatch.setenv("RATE_LIMIT_TPM", "999")
+    monkeypatch.delenv("RATE_LIMIT_RPM", raising=False)
+    llama = rate_limit.get_limiter("groq", "llama-3.3-70b-versatile")
+    gpt = rate_limit.get_limiter("openai", "gpt-4o")
+    assert (llama.rpm, llama.tpm) == (7, 999)
+    assert (gpt.rpm, gpt.tpm) == (rate_limit.DEFAULT_LIMITS["openai", "gpt-4o"][0], 999)
@@ -0,0 +1,77 @@
+"""The research cache expires old entries, evicts the least recently used and opens any path."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared import research_cache  # noqa: E402
+from shared.research_cache import ResearchCache  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(research_cache, "time", clock)
+    return clock
+
+
+def store(cache: ResearchCache, topic: str) -> str:
+    key = cache.make_key("gpt-4o", "", topic)
+    cache.put(key, f"research on {topic}", "gpt-4o", topic)
+    return key
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResearchCache(":memory:", ttl=60)
+    key = store(cache, "ai in healthcare")
+    clock.now += 59
+    assert cache.get(key) == "research on ai in healthcare"
+    clock.now += 2
+    assert cache.get(key) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResearchCache(":memory:", max_entries=2)
+    first, second = store(cache, "first"), store(cache, "second")
+    clock.now += 1
+    # Reading the first entry makes the second the least recently used.
+    assert cache.get(first) is not None
+    clock.now += 1
+    third = store(cache, "third")
+    assert len(cache) == 2
+    assert cache.get(second) is None
+    assert cache.get(first) is not None and cache.get(third) is not None
+
+
+def test_get_or_run_runs_once_per_inputs(clock):
+    cache = ResearchCache(":memory:")
+    runs = []
+
+    def run() -> str:
+        runs.append(1)
+        return "research"
+
+    assert cache.get_or_run("gpt-4o", "", ("AI in healthcare", "doctors"), run) == ("research", False)
+    assert cache.get_or_run("gpt-4o", "", ("ai in  Healthcare", "Doctors"), run) == ("research", True)
+    assert len(runs) == 1
+
+
+def test_bare_file_name_opens_in_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = ResearchCache("research.sqlite3")
+    store(cache, "ai in healthcare")
+    assert (tmp_path / "research.sqlite3").exists()
+    assert len(ResearchCache("research.sqlite3")) == 1
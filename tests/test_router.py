@@ -0,0 +1,93 @@
+"""The router fails over, prefers the fastest healthy backend and hedges slow runs."""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "benchmarks"), str(ROOT)]
+
+from fake_providers import FakeAssistant  # noqa: E402
+from shared.router import LazyBackends, RoutedAssistant, Router  # noqa: E402
+
+
+def fake(name: str, latency: float = 0.001, error_rate: float = 0.0) -> FakeAssistant:
+    return FakeAssistant(name, latency=latency, spread=0.0, error_rate=error_rate)
+
+
+def test_failed_run_falls_over_to_the_next_backend():
+    backends = {"groq": fake("groq", error_rate=1.0), "openai": fake("openai")}
+    router = Router(min_samples=0)
+    stage = RoutedAssistant(router, "write", backends)
+    assert stage.run("hello").startswith("openai")
+    assert stage.last_backend == "openai"
+    assert router.stats("write", "groq").error_rate == 1.0
+
+
+def test_every_backend_failing_raises():
+    stage = RoutedAssistant(Router(), "write", {"groq": fake("groq", error_rate=1.0), "openai": fake("openai", error_rate=1.0)})
+    with pytest.raises(RuntimeError, match="every backend failed"):
+        stage.run("hello")
+
+
+def test_unmeasured_backends_are_tried_then_the_fastest_wins():
+    backends = {"slow": fake("slow", latency=0.02), "fast": fake("fast", latency=0.001)}
+    router = Router(min_samples=2)
+    stage = RoutedAssistant(router, "write", backends)
+    for _ in range(4):
+        stage.run("warm up")
+    assert backends["slow"].calls == backends["fast"].calls == 2
+    for _ in range(5):
+        stage.run("hello")
+    assert stage.last_backend == "fast"
+    assert backends["fast"].calls == 7
+
+
+def test_failing_backend_is_tried_last():
+    backends = {"groq": fake("groq", error_rate=1.0), "openai": fake("openai")}
+    router = Router(min_samples=0)
+    stage = RoutedAssistant(router, "write", backends)
+    for _ in range(3):
+        stage.run("hello")
+    assert (backends["groq"].calls, backends["openai"].calls) == (1, 3)
+    assert router.order("write", list(backends)) == ["openai", "groq"]
+
+
+def test_stream_fails_over_before_the_first_chunk():
+    backends = {"groq": fake("groq", error_rate=1.0), "openai": fake("openai")}
+    stage = RoutedAssistant(Router(min_samples=0), "write", backends)
+    assert "".join(stage.run("hello", stream=True)) == "openai answered "
+
+
+def test_slow_primary_is_hedged_on_the_next_backend():
+    backends = {"groq": fake("groq", latency=1.0), "openai": fake("openai", latency=0.01)}
+    router = Router(min_samples=0, hedge_after=0.05)
+    stage = RoutedAssistant(router, "write", backends, hedge=True)
+    started = time.perf_counter()
+    assert stage.run("hello").startswith("openai")
+    assert time.perf_counter() - started < 0.5
+    assert (router.hedges, router.hedge_wins) == (1, 1)
+
+
+def test_backends_are_built_when_the_router_tries_them():
+    built = []
+
+    def build(name: str, latency: float):
+        def make() -> FakeAssistant:
+            built.append(name)
+            return fake(name, latency=latency)
+
+        return make
+
+    router = Router(min_samples=0, hedge_after=0.05)
+    fast = RoutedAssistant(router, "fast", LazyBackends({"groq": build("groq", 0.001), "openai": build("openai", 0.001)}), hedge=True)
+    assert fast.run("hello").startswith("groq")
+    assert built == ["groq"]
+    assert fast.description == "Fake provider groq"
+
+    built.clear()
+    slow = RoutedAssistant(router, "slow", LazyBackends({"groq": build("groq", 0.5), "openai": build("openai", 0.001)}), hedge=True)
+    assert slow.run("hello").startswith("openai")
+    # The hedge backend is built only once the hedge fires.
+    assert built == ["groq", "openai"]
@@ -0,0 +1,66 @@
+"""Concurrent searches for the same query share one fetch."""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.search_cache import SearchCache  # noqa: E402
+
+
+def test_concurrent_fetches_of_one_key_are_coalesced():
+    cache = SearchCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch() -> str:
+        calls.append(1)
+        release.wait(5)
+        return "results"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get_or_fetch, "ai in healthcare", fetch) for _ in range(8)]
+        # Every caller but the one fetching waits on the fetch in flight.
+        while cache.misses + cache.coalesced < 8:
+            time.sleep(0.01)
+        release.set()
+        assert [future.result() for future in futures] == ["results"] * 8
+    assert len(calls) == 1
+    assert (cache.misses, cache.coalesced) == (1, 7)
+    assert cache.get_or_fetch("ai in healthcare", fetch) == "results"
+    assert cache.hits == 1
+
+
+def test_failed_fetch_is_shared_but_not_cached():
+    cache = SearchCache()
+    release = threading.Event()
+
+    def fail() -> str:
+        release.wait(5)
+        raise RuntimeError("search failed")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(cache.get_or_fetch, "query", fail) for _ in range(2)]
+        while cache.misses + cache.coalesced < 2:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+    assert cache.get_or_fetch("query", lambda: "results") == "results"
+    assert cache.misses == 2
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.get_or_fetch("first", lambda: "1")
+    cache.get_or_fetch("second", lambda: "2")
+    cache.get_or_fetch("first", lambda: "stale")
+    cache.get_or_fetch("third", lambda: "3")
+    assert cache.get_or_fetch("first", lambda: "refetched") == "1"
+    assert cache.get_or_fetch("second", lambda: "refetched") == "refetched"
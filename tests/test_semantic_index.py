@@ -0,0 +1,36 @@
+"""The semantic index matches reworded requests, but never another topic."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.semantic_index import SemanticIndex  # noqa: E402
+
+
+def test_reworded_request_matches():
+    index = SemanticIndex()
+    index.add(["ai in healthcare for doctors"])
+    match = index.lookup(["ai for healthcare professionals"])
+    assert match is not None
+    assert match.inputs == ("ai in healthcare for doctors",)
+
+
+def test_reworded_audience_matches_the_same_topic():
+    index = SemanticIndex()
+    index.add(["AI in healthcare", "doctors"])
+    match = index.lookup(["AI for healthcare", "healthcare professionals"])
+    assert match is not None
+    assert match.subject_score >= index.subject_threshold
+
+
+def test_other_topic_for_the_same_audience_does_not_match():
+    index = SemanticIndex()
+    index.add(["AI in finance", "doctors"])
+    assert index.lookup(["AI in healthcare", "doctors"]) is None
+
+
+def test_subject_threshold_is_configurable():
+    index = SemanticIndex(subject_threshold=0.3)
+    index.add(["AI in finance", "doctors"])
+    assert index.lookup(["AI in healthcare", "doctors"]) is not None
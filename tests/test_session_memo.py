@@ -0,0 +1,60 @@
+"""The session memo evicts its least recently used results by count and by size."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from shared.jobs import Job  # noqa: E402
+from shared.session_memo import SessionMemo, input_key, text_size  # noqa: E402
+from shared.telemetry import Trace, span  # noqa: E402
+
+
+def test_input_key_ignores_case_and_spacing():
+    assert input_key("gpt-4o", "AI  in Healthcare ", "Doctors") == input_key("gpt-4o", "ai in healthcare", "doctors")
+    assert input_key("gpt-4o", "ai") != input_key("llama-3.3-70b-versatile", "ai")
+
+
+def test_least_recently_used_entry_goes_past_max_entries():
+    memo = SessionMemo(max_entries=2)
+    memo.put("a", "1")
+    memo.put("b", "2")
+    assert memo.get("a") == "1"
+    memo.put("c", "3")
+    assert [key for key, _ in memo.items()] == ["c", "a"]
+    assert memo.get("b") is None
+    assert memo.evictions == 1
+
+
+def test_entries_go_past_max_chars_but_the_newest_stays():
+    memo = SessionMemo(max_chars=10)
+    memo.put("a", "x" * 6)
+    memo.put("b", "y" * 6)
+    assert [key for key, _ in memo.items()] == ["b"]
+    memo.put("c", "z" * 20)
+    assert [key for key, _ in memo.items()] == ["c"]
+
+
+def test_values_that_grow_after_put_are_evicted_on_access():
+    memo = SessionMemo(max_chars=10)
+    older, newer = Job("older"), Job("newer")
+    memo.put("older", older)
+    memo.put("newer", newer)
+    older.write("x" * 8)
+    newer.write("y" * 8)
+    assert memo.get("older") is None
+    assert memo.get("newer") is newer
+
+
+def test_text_size_counts_strings_containers_and_jobs():
+    assert text_size(["ab", ("c", {"key": "def"})]) == 6
+    assert text_size(42) == 0
+    job = Job("post")
+    job.write("hello")
+    job.result = "hello world"
+    with Trace("post") as trace:
+        with span("writer"):
+            pass
+    job.trace = trace
+    assert job.size() == 5 + 11 + trace.size()
+    assert trace.size() >= len("writer")
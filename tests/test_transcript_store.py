@@ -0,0 +1,53 @@
+"""Every common form of a YouTube link maps to one stored transcript."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "Youtube Video"), str(ROOT)]
+
+from transcript_store import TranscriptStore, canonical_video_id  # noqa: E402
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize("url", [
+    VIDEO_ID,
+    f"https://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&t=42s&list=PL123",
+    f"http://m.youtube.com/watch?feature=share&v={VIDEO_ID}",
+    f"https://music.youtube.com/watch?v={VIDEO_ID}",
+    f"youtube.com/watch?v={VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}?si=abc",
+    f"youtu.be/{VIDEO_ID}",
+    f"https://www.youtube.com/shorts/{VIDEO_ID}",
+    f"https://www.youtube.com/embed/{VIDEO_ID}?start=10",
+    f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}",
+    f"https://www.youtube.com/live/{VIDEO_ID}",
+    f"https://www.youtube.com/v/{VIDEO_ID}",
+    f"  https://www.youtube.com/watch?v={VIDEO_ID}  ",
+])
+def test_canonical_video_id(url):
+    assert canonical_video_id(url) == VIDEO_ID
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    None,
+    "https://example.com/watch?v=dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?v=tooshort",
+    "https://www.youtube.com/channel/UC1234567890",
+    "https://youtu.be/",
+])
+def test_canonical_video_id_rejects_other_links(url):
+    assert canonical_video_id(url) is None
+
+
+def test_store_keeps_transcripts_and_segments(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = TranscriptStore("transcripts.sqlite3")
+    store.put(VIDEO_ID, [{"text": "never  gonna", "start": 0, "duration": 2}, {"text": "give you up", "start": 2, "duration": 2}])
+    assert (tmp_path / "transcripts.sqlite3").exists()
+    assert store.get(VIDEO_ID).text == "never gonna give you up"
+    assert [segment.text for segment in store.segments(VIDEO_ID, start=2.5)] == ["give you up"]
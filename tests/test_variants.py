@@ -0,0 +1,37 @@
+"""A style preference is split into the variants written side by side."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "Linkedin Post Writer"), str(ROOT)]
+
+from variants import MAX_VARIANTS, parse_styles, write_variants  # noqa: E402
+
+
+def test_parse_styles_splits_on_commas_semicolons_lines_and_or():
+    assert parse_styles("casual, professional or inspiring") == ["casual", "professional", "inspiring"]
+    assert parse_styles("Storytelling; data-driven\nhumorous.") == ["Storytelling", "data-driven", "humorous"]
+
+
+def test_parse_styles_drops_repeats_and_blanks():
+    assert parse_styles("Casual, casual ,, or  CASUAL, formal") == ["Casual", "formal"]
+    assert parse_styles("  ") == []
+
+
+def test_parse_styles_keeps_words_that_contain_or():
+    assert parse_styles("motivational or authoritative") == ["motivational", "authoritative"]
+
+
+def test_parse_styles_stops_at_the_limit():
+    assert parse_styles("a, b, c, d, e, f") == ["a", "b", "c", "d"][:MAX_VARIANTS]
+    assert parse_styles("a, b, c", limit=2) == ["a", "b"]
+
+
+def test_write_variants_writes_one_post_per_style():
+    class Writer:
+        def run(self, message: str, stream: bool = False) -> str:
+            return message.upper()
+
+    variants = dict(write_variants(Writer, ["casual", "formal"], lambda style: f"post in a {style} style"))
+    assert [variants[index].post for index in sorted(variants)] == ["POST IN A CASUAL STYLE", "POST IN A FORMAL STYLE"]
+    assert variants[1].style == "formal"
@@ -0,0 +1,45 @@
+"""The YouTube Video assistants build for every backend the app offers."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "Youtube Video"), str(ROOT)]
+
+from phi.llm.base import LLM  # noqa: E402
+
+from assistants import BUILDERS, build_assistants, chunk_summarizer_factory, routed_chunk_summarizer_factory  # noqa: E402
+from shared.backends import CLIENT_FIELDS, sdk_client  # noqa: E402
+from shared.router import API_KEY_ENV  # noqa: E402
+
+
+@pytest.mark.parametrize("provider, model_id", sorted(BUILDERS))
+def test_chunk_summarizer(provider, model_id):
+    summarizer = chunk_summarizer_factory(provider, model_id, "test-key")()
+    assert isinstance(summarizer.llm, LLM)
+    assert summarizer.llm.model == model_id
+
+
+def test_routed_chunk_summarizer(monkeypatch):
+    for env in API_KEY_ENV.values():
+        monkeypatch.setenv(env, "test-key")
+    routed = routed_chunk_summarizer_factory()()
+    assert sorted(routed.assistants) == sorted(f"{provider}/{model_id}" for provider, model_id in BUILDERS)
+    assert all(isinstance(assistant.llm, LLM) for assistant in routed.assistants.values())
+
+
+@pytest.mark.parametrize("provider, model_id", sorted(BUILDERS))
+def test_assistants(provider, model_id):
+    for assistant in build_assistants(provider, model_id, "test-key"):
+        assert isinstance(assistant.llm, LLM)
+        assert assistant.llm.model == model_id
+
+
+@pytest.mark.parametrize("provider, model_id", [backend for backend in sorted(BUILDERS) if backend[0] in CLIENT_FIELDS])
+def test_requests_build_their_own_assistants_around_one_client(provider, model_id):
+    first, second = build_assistants(provider, model_id, "test-key"), build_assistants(provider, model_id, "test-key")
+    assert all(a is not b and a.llm is not b.llm for a, b in zip(first, second))
+    clients = {id(getattr(assistant.llm, CLIENT_FIELDS[provider])) for assistant in first + second}
+    clients.add(id(getattr(chunk_summarizer_factory(provider, model_id, "test-key")().llm, CLIENT_FIELDS[provider])))
+    assert clients == {id(sdk_client(provider, "test-key"))}